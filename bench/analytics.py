@@ -0,0 +1,75 @@
+"""
+Cross-session analytics throughput, incremental re-runs and memory.
+
+    python -m bench.analytics --sessions 5000 --jobs 1 4
+
+Writes bot sessions (bench.bots scripts) as timeline files, then times a
+full scan per job count, an incremental re-run after `--new` more
+sessions, a no-op re-run, and a re-run after one abandoned session's file
+is continued. Peak traced memory of the single-process scan stays small:
+only the index of covered files grows with their number.
+"""
+import argparse, os, random, tempfile, time, tracemalloc
+from datetime import datetime
+from bench.bots import make_script
+from engine import analytics
+from engine.replay import run_bot
+from main import build_rooms
+
+def write_sessions(directory, start, n, rng, rooms):
+    for i in range(start, start + n):
+        run_bot(make_script(rng), rooms).telemetry.export_csv(os.path.join(directory, f"session{i:06d}.csv"))
+
+def peak_kib(paths):
+    tracemalloc.start()
+    analytics.scan_files(paths, 1)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=5000)
+    ap.add_argument("--new", type=int, default=100, help="sessions added before the incremental re-run")
+    ap.add_argument("--jobs", type=int, nargs="+", default=[1, os.cpu_count()])
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+    rng = random.Random(args.seed)
+    rooms = build_rooms()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "sessions")
+        state = os.path.join(tmp, "state.json")
+        os.makedirs(src)
+        write_sessions(src, 0, args.sessions, rng, rooms)
+        abandoned = os.path.join(src, "abandoned.csv")     # a player who left in room 1
+        with open(os.path.join(src, "session000000.csv"), newline="", encoding="utf-8") as f:
+            head = [next(f) for _ in range(4)]
+        with open(abandoned, "w", newline="", encoding="utf-8") as f:
+            f.writelines(head)
+        paths = analytics.collect([src])
+        size = sum(os.path.getsize(p) for p in paths) / 2**20
+        print(f"{len(paths)} timelines, {size:.1f} MiB")
+        for jobs in args.jobs:
+            t0 = time.perf_counter()
+            agg, _ = analytics.update(paths, None, jobs, settle=None)
+            elapsed = time.perf_counter() - t0
+            print(f"full scan, {jobs:>2} jobs: {elapsed:6.2f}s ({len(paths) / elapsed:.0f} files/s)")
+        analytics.save_state(agg, state)
+
+        write_sessions(src, args.sessions, args.new, rng, rooms)
+        for label in (f"+{args.new} new", "nothing new", "1 abandoned continued"):
+            if label.startswith("1 "):
+                with open(abandoned, "a", newline="", encoding="utf-8") as f:
+                    f.write(f"{datetime.now().isoformat(timespec='milliseconds')},meta,game_start,,,,,,,,,\r\n")
+            t0 = time.perf_counter()
+            agg, read = analytics.update(analytics.collect([src]), analytics.load_state(state), max(args.jobs),
+                                         settle=None)
+            analytics.save_state(agg, state)
+            print(f"incremental, {label}: {time.perf_counter() - t0:6.2f}s (read {read} files)")
+
+        for n in (len(paths) // 10, len(paths)):
+            print(f"peak memory scanning {n:>6} files: {peak_kib(paths[:n]):8.0f} KiB")
+
+if __name__ == "__main__":
+    main()
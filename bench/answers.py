@@ -0,0 +1,56 @@
+"""
+Answer matching per attempt vs the number of accepted answers.
+
+    python -m bench.answers --sizes 10 1000 5000 20000
+
+Builds an AnswerMatcher over random accepted answers (and as many known
+wrong ones), then times exact hits, far misses and typos, and compares
+the near-miss lookup with scanning every answer. Reports index build time
+and microseconds per attempt; the budget is under 1000 us at every size.
+"""
+import argparse, random, string, time
+from engine.answers import AnswerMatcher, edit_distance, max_distance_for
+
+def word(rng):
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randrange(4, 13)))
+
+def typo(rng, w):
+    i = rng.randrange(len(w))
+    return w[:i] + rng.choice(string.ascii_lowercase) + w[i + 1:]
+
+def per_attempt(fn, texts):
+    t0 = time.perf_counter()
+    for t in texts:
+        fn(t)
+    return (time.perf_counter() - t0) / len(texts) * 1e6
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 5000, 20000])
+    ap.add_argument("--attempts", type=int, default=2000)
+    args = ap.parse_args(argv)
+    rng = random.Random(1)
+
+    print(f"{'answers':>8} {'build ms':>9} {'exact us':>9} {'miss us':>8} {'typo us':>8} {'scan typo us':>13}")
+    for n in args.sizes:
+        accepted = {word(rng) for _ in range(n)}
+        wrong = {word(rng): None for _ in range(n)}
+        t0 = time.perf_counter()
+        m = AnswerMatcher(accepted, ("strip", "lower"), wrong)
+        build = (time.perf_counter() - t0) * 1e3
+        pool = sorted(accepted)
+        exact = [rng.choice(pool) for _ in range(args.attempts)]
+        miss = [word(rng) + "q" for _ in range(args.attempts)]
+        typos = [typo(rng, rng.choice(pool)) for _ in range(args.attempts)]
+        terms = pool + sorted(wrong)
+
+        def scan(t):
+            limit = max_distance_for(len(t))
+            return min((edit_distance(t, w, limit), w) for w in terms)
+
+        scan_us = per_attempt(scan, typos[:max(1, args.attempts * 10 // n)])
+        print(f"{n:>8} {build:>9.1f} {per_attempt(m.match, exact):>9.2f} {per_attempt(m.match, miss):>8.2f} "
+              f"{per_attempt(m.match, typos):>8.2f} {scan_us:>13.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Batch vs scalar mood scoring.
+
+    python -m bench.batch_mood --sizes 1 100 1000 10000 --ticks 20
+
+Each tick every session makes one observation and reads its mood state and
+hint policy. The scalar path is one MoodEngine per session; the batch path
+one BatchMoodEngine.observe() call per tick. Checks that scores, states
+and hint policies are identical and reports observations per second.
+
+Answers are drawn from a handful of common texts by default, so after the
+first tick lexicon scores come from the memo; --unique-texts makes every
+answer new, so each tick scores all its texts.
+"""
+import argparse, random, time
+import numpy as np
+from engine.batch_mood import BatchMoodEngine, STATES, STRENGTHS
+from mood import MoodEngine
+
+TEXTS = ("echo", "hint", "idk", "no idea!!", "ok got it", "5348", "HELP ME", "portal", "a shadow?",
+         "this is hard", "perfect", "1234", "shadow", "I'M STUCK!!!")
+
+def make_ticks(n, ticks, rng, unique=False):
+    out = []
+    for k in range(ticks):
+        texts = [f"guess {k}-{i}" if unique else rng.choice(TEXTS) for i in range(n)]
+        out.append((texts, [rng.uniform(0, 50) for _ in range(n)],
+                    [rng.random() < 0.3 for _ in range(n)], [rng.randrange(5) for _ in range(n)]))
+    return out
+
+def run_scalar(n, ticks, history):
+    engines = [MoodEngine(history) for _ in range(n)]
+    results = []
+    t0 = time.perf_counter()
+    for texts, seconds, correct, wrong in ticks:
+        tick = []
+        for i, me in enumerate(engines):
+            s = me.observe(text=texts[i], seconds=seconds[i], correct=correct[i], wrong_attempts=wrong[i])
+            tick.append((s, me.mood_state(), me.hint_policy()))
+        results.append(tick)
+    return time.perf_counter() - t0, results
+
+def run_batch(n, ticks, history):
+    engine = BatchMoodEngine(n, history)
+    ids = np.arange(n)
+    results = []
+    t0 = time.perf_counter()
+    for texts, seconds, correct, wrong in ticks:
+        results.append(engine.observe(ids, texts, seconds, correct, wrong))
+    return time.perf_counter() - t0, results
+
+def same(scalar, batch):
+    for tick, res in zip(scalar, batch):
+        for i, (s, state, (give, strength)) in enumerate(tick):
+            if (s != res.scores[i] or state != STATES[res.states[i]] or give != bool(res.give_hint[i])
+                    or strength != STRENGTHS[res.strength[i]]):
+                return False
+    return True
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 1000, 10000])
+    ap.add_argument("--ticks", type=int, default=20)
+    ap.add_argument("--history", type=int, default=6)
+    ap.add_argument("--unique-texts", action="store_true", help="every answer distinct (no lexicon memo hits)")
+    args = ap.parse_args(argv)
+    rng = random.Random(1)
+
+    run_batch(16, make_ticks(16, 2, rng), args.history)      # warm NumPy up before the first timed size
+    print("texts: " + ("every answer distinct, no memo hits" if args.unique_texts
+                       else f"drawn from {len(TEXTS)} common answers, memo hits after the first tick"))
+    print(f"{'sessions':>8} {'scalar obs/s':>13} {'batch obs/s':>12} {'speedup':>8}  identical")
+    for n in args.sizes:
+        ticks = make_ticks(n, args.ticks, rng, args.unique_texts)
+        ts, rs = run_scalar(n, ticks, args.history)
+        tb, rb = run_batch(n, ticks, args.history)
+        obs = n * args.ticks
+        print(f"{n:>8} {obs / ts:>13.0f} {obs / tb:>12.0f} {ts / tb:>7.1f}x  {same(rs, rb)}")
+
+if __name__ == "__main__":
+    main()
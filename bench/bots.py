@@ -0,0 +1,52 @@
+"""
+In-process capacity test: scripted bot sessions through the whole maze.
+
+    python -m bench.bots --sessions 20000
+
+Each bot gets a slightly different script (wrong answers, hints, think
+times) and runs on a SimClock, so the number is pure game-logic throughput.
+"""
+import argparse, random, time
+from engine.replay import run_bot
+from main import build_rooms
+
+ANSWERS = {
+    "room1": (["hgut", "voice", "a shadow"], "echo"),
+    "room2": (["7465", "5748", "5 3 7 8"], "5 3 4 8"),
+    "room3": (["papaya", "portl", "BANANA!"], "portal"),
+    "riddle_shadow": (["light", "sun"], "shadow"),
+}
+
+def make_script(rng):
+    script = {}
+    for room, (wrong, right) in ANSWERS.items():
+        steps = []
+        for _ in range(rng.randint(0, 3)):
+            steps.append((rng.choice(wrong), rng.uniform(2.0, 40.0)))
+            if rng.random() < 0.3:
+                steps.append(("hint", rng.uniform(1.0, 5.0)))
+        steps.append((right, rng.uniform(2.0, 40.0)))
+        script[room] = steps
+    return script
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=20000)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    rooms = build_rooms()
+    scripts = [make_script(rng) for _ in range(min(args.sessions, 1000))]
+
+    t0 = time.perf_counter()
+    outcomes = {}
+    for i in range(args.sessions):
+        res = run_bot(scripts[i % len(scripts)], rooms)
+        outcomes[res.outcome] = outcomes.get(res.outcome, 0) + 1
+    elapsed = time.perf_counter() - t0
+    print(f"sessions:   {args.sessions} {outcomes}")
+    print(f"throughput: {args.sessions / elapsed:.0f} sessions/s ({elapsed:.2f}s)")
+
+if __name__ == "__main__":
+    main()
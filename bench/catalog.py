@@ -0,0 +1,54 @@
+"""
+Room catalog startup vs catalog size.
+
+    python -m bench.catalog --sizes 10 1000 10000
+
+For generated catalogs of each size: cold start (validate + compile +
+write the cache), warm start from the cache, and the old path (json.load
+plus a ConfigRoom per entry). Warm start should not grow with the size.
+"""
+import argparse, json, os, tempfile, time
+from engine.catalog import load_catalog
+from engine.config_room import ConfigRoom
+
+def make_catalog(path, n):
+    rooms = [{
+        "id": f"riddle_{i}",
+        "title": f"Room {i + 4} (Config)",
+        "intro": f"Riddle number {i}: what has keys but can't open locks?",
+        "prompt": "Type your answer (or 'hint'): ",
+        "answers": ["piano", "a piano", f"piano{i}"],
+        "hints": {"soft": "It makes music.", "normal": "Black and white keys.", "strong": "A big instrument."},
+        "success_text": "The door opens.",
+        "fail_text": "Nothing happens.",
+    } for i in range(n)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"rooms": rooms}, f)
+
+def old_path(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [ConfigRoom(r) for r in json.load(f)["rooms"]]
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, (time.perf_counter() - t0) * 1e3
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    args = ap.parse_args(argv)
+
+    print(f"{'rooms':>7} {'cold ms':>9} {'warm ms':>9} {'first room ms':>14} {'json.load ms':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            src = os.path.join(tmp, f"rooms_{n}.json")
+            make_catalog(src, n)
+            _, cold = timed(lambda: load_catalog(src))
+            cat, warm = timed(lambda: load_catalog(src))
+            _, first = timed(lambda: cat[0])
+            _, old = timed(lambda: old_path(src))
+            print(f"{n:>7} {cold:>9.2f} {warm:>9.3f} {first:>14.3f} {old:>13.2f}")
+
+if __name__ == "__main__":
+    main()
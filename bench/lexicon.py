@@ -0,0 +1,59 @@
+"""
+Lexicon scoring vs lexicon size: per-term substring checks vs the compiled matcher.
+
+    python -m bench.lexicon --sizes 30 1000 10000 50000
+
+Generates random weighted lexicons (words and two-word phrases) and scores
+a fixed set of game-like answers with both. Reports compile time and
+microseconds per answer; the compiled matcher should stay flat. Lexicons
+of up to engine.lexicon.SCAN_LIMIT terms are scanned term by term by
+Lexicon itself, so both columns match there.
+"""
+import argparse, random, string, time
+from engine.lexicon import Lexicon
+from mood import MoodEngine
+
+ANSWERS = ["echo", "idk", "no idea!!", "this is so hard, I'm stuck", "OK GOT IT", "5348",
+           "perfect, that was easy and fun", "portal", "I HATE THIS ROOM!!!", "a shadow?"]
+
+def make_lexicon(n, rng):
+    base = sorted(MoodEngine.POSITIVE_WORDS | MoodEngine.NEGATIVE_WORDS)
+    weights = {w: rng.choice((-1.0, 1.0)) for w in base[:n]}
+    while len(weights) < n:
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randrange(3, 10)))
+        if rng.random() < 0.2:
+            word += " " + "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randrange(3, 8)))
+        weights[word] = round(rng.uniform(-2.0, 2.0), 2)
+    return weights
+
+def naive_score(weights, t):
+    return sum(w for term, w in weights.items() if term in t)
+
+def per_answer(fn, texts, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for t in texts:
+            fn(t)
+    return (time.perf_counter() - t0) / (repeat * len(texts)) * 1e6
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[30, 1000, 10000, 50000])
+    ap.add_argument("--answers", type=int, default=2000, help="answers scored per size")
+    args = ap.parse_args(argv)
+    rng = random.Random(1)
+    texts = [rng.choice(ANSWERS).lower() for _ in range(args.answers)]
+
+    print(f"{'terms':>7} {'compile ms':>11} {'naive us/answer':>16} {'compiled us/answer':>19}")
+    for n in args.sizes:
+        weights = make_lexicon(n, rng)
+        t0 = time.perf_counter()
+        lex = Lexicon(weights)
+        compile_ms = (time.perf_counter() - t0) * 1e3
+        assert all(abs(lex.score(t) - naive_score(weights, t)) < 1e-9 for t in set(texts))
+        naive = per_answer(lambda t: naive_score(weights, t), texts, 5 if n <= 1000 else 1)
+        compiled = per_answer(lex.score, texts, 5)
+        print(f"{n:>7} {compile_ms:>11.1f} {naive:>16.2f} {compiled:>19.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Load test for server.py: many concurrent scripted players on one core.
+
+    python -m bench.load_server --sessions 500 --concurrency 200
+
+Starts the server in a subprocess pinned to one CPU (where the OS allows it),
+plays every session through all rooms and reports sessions per second plus
+the latency from sending an answer to the first line of the reply.
+"""
+import argparse, asyncio, os, subprocess, sys, time
+
+# wrong answer, hint, right answer for every room
+SCRIPT = ["a shadow?", "hint", "echo", "1234", "hint", "5348", "portl", "portal", "tree", "shadow"]
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, int(round(q / 100.0 * (len(values) - 1)))))
+    return values[k]
+
+async def play_one(host, port, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    answers = iter(SCRIPT)
+    sent_at = None
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return True
+            if sent_at is not None:
+                latencies.append(time.perf_counter() - sent_at)
+                sent_at = None
+            if line.startswith(b"? "):
+                writer.write((next(answers, "shadow") + "\n").encode())
+                await writer.drain()
+                sent_at = time.perf_counter()
+    finally:
+        writer.close()
+
+async def run_load(host, port, sessions, concurrency):
+    latencies = []
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            return await play_one(host, port, latencies)
+
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(one() for _ in range(sessions)), return_exceptions=True)
+    elapsed = time.perf_counter() - t0
+    failed = sum(1 for r in results if r is not True)
+    return elapsed, failed, latencies
+
+async def wait_for_port(host, port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, w = await asyncio.open_connection(host, port)
+            w.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=500)
+    ap.add_argument("--concurrency", type=int, default=200)
+    ap.add_argument("--port", type=int, default=7791)
+    ap.add_argument("--pace", type=float, default=0.0, help="server intro pacing (0 = no pauses)")
+    args = ap.parse_args(argv)
+
+    host = "127.0.0.1"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.Popen(
+        [sys.executable, "server.py", "--port", str(args.port), "--pace", str(args.pace)],
+        cwd=root, stdout=subprocess.DEVNULL,
+    )
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(proc.pid, {sorted(os.sched_getaffinity(0))[0]})
+            except OSError:
+                pass
+        asyncio.run(wait_for_port(host, args.port))
+        elapsed, failed, lat = asyncio.run(run_load(host, args.port, args.sessions, args.concurrency))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    done = args.sessions - failed
+    print(f"sessions:     {done} ok, {failed} failed, concurrency {args.concurrency}")
+    print(f"throughput:   {done / elapsed:.1f} sessions/s ({elapsed:.2f}s total)")
+    print(f"responses:    {len(lat)}")
+    print(f"latency p50:  {percentile(lat, 50) * 1000:.2f} ms")
+    print(f"latency p99:  {percentile(lat, 99) * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Overhead of the built-in metrics.
+
+    python -m bench.metrics --sessions 3000 --repeat 5
+
+Runs the same scripted bot sessions (bench.bots) with METRICS disabled and
+enabled, alternating, and reports the best time per session of each plus
+the overhead, then prints the collected snapshot as the exit dump would.
+"""
+import argparse, random, time
+from bench.bots import make_script
+from engine.metrics import METRICS
+from engine.replay import run_bot
+from main import build_rooms
+
+def run(scripts, rooms):
+    t0 = time.perf_counter()
+    for s in scripts:
+        run_bot(s, rooms)
+    return time.perf_counter() - t0
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=3000)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+    rng = random.Random(args.seed)
+    rooms = build_rooms()
+    scripts = [make_script(rng) for _ in range(args.sessions)]
+    run(scripts[:100], rooms)       # warm up (config room load, caches)
+
+    best = {False: float("inf"), True: float("inf")}
+    for _ in range(args.repeat):
+        for enabled in (False, True):
+            METRICS.reset()
+            METRICS.enabled = enabled
+            best[enabled] = min(best[enabled], run(scripts, rooms))
+    per = {k: v / args.sessions * 1e6 for k, v in best.items()}
+    print(f"disabled: {per[False]:8.1f} us/session")
+    print(f"enabled:  {per[True]:8.1f} us/session  (+{(per[True] / per[False] - 1) * 100:.1f}%)")
+    print()
+    print(METRICS.dump())
+    METRICS.disable()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+MoodEngine turn cost: observe() plus the mood_state()/hint_policy() calls a room makes.
+
+    python -m bench.mood_engine --turns 200000
+
+One turn = observe, mood_state (telemetry), hint_policy, mood_state
+(guidance). Compares recomputing the window mean on every call (the old
+mood_state) with the cached running aggregators.
+"""
+import argparse, random, time
+from mood import MoodEngine, WindowAggregator, EwmaAggregator, DecayAggregator
+
+class Recompute(MoodEngine):
+    """The old mood_state: average the whole window on every call."""
+    def mood_state(self) -> str:
+        if not self.scores:
+            return "neutral"
+        avg = sum(self.scores) / len(self.scores)
+        if avg <= -1.2:
+            return "stressed"
+        if avg <= -0.2:
+            return "focused"
+        if avg >= 1.2:
+            return "excited"
+        if avg >= 0.2:
+            return "calm"
+        return "neutral"
+
+def make_turns(n, seed=1):
+    rng = random.Random(seed)
+    texts = ("echo", "idk", "no idea!!", "ok got it", "5348", "HELP ME", "portal")
+    return [(rng.choice(texts), rng.uniform(0, 40), rng.random() < 0.3, rng.randrange(4)) for _ in range(n)]
+
+def run(engine, turns):
+    """(seconds for all turns, ns per turn spent in the three state calls)."""
+    clock = time.perf_counter_ns
+    in_states = overhead = 0
+    t0 = time.perf_counter()
+    for text, seconds, correct, wrong in turns:
+        engine.observe(text=text, seconds=seconds, correct=correct, wrong_attempts=wrong)
+        a = clock()
+        engine.mood_state()
+        engine.hint_policy()
+        engine.mood_state()
+        b = clock()
+        c = clock()
+        in_states += b - a
+        overhead += c - b
+    elapsed = time.perf_counter() - t0
+    return elapsed, (in_states - overhead) / len(turns)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--turns", type=int, default=200000)
+    ap.add_argument("--history", type=int, default=6)
+    args = ap.parse_args(argv)
+    turns = make_turns(args.turns)
+
+    engines = [
+        ("recompute", lambda: Recompute(args.history)),
+        ("window", lambda: MoodEngine(args.history, aggregator=WindowAggregator())),
+        ("ewma", lambda: MoodEngine(args.history, aggregator=EwmaAggregator())),
+        ("decay", lambda: MoodEngine(args.history, aggregator=DecayAggregator())),
+    ]
+    print(f"{'aggregator':<10} {'turns/s':>10} {'state calls ns/turn':>20}")
+    for name, make in engines:
+        elapsed, states_ns = run(make(), turns)
+        print(f"{name:<10} {len(turns) / elapsed:>10.0f} {states_ns:>20.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Aggregate mood views at scale: synthesize N session timelines and time the
+NumPy aggregation + rendering (and LTTB on one very long series).
+
+    python -m bench.mood_views --sessions 10000
+"""
+import argparse, glob, os, random, tempfile, time
+import numpy as np
+from bench.bots import make_script
+from engine.mood_views import lttb, render_aggregate
+from engine.replay import run_bot
+from main import build_rooms
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=10000)
+    ap.add_argument("--jobs", type=int, default=os.cpu_count())
+    args = ap.parse_args(argv)
+
+    rng = random.Random(7)
+    rooms = build_rooms()
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "sessions")
+        t0 = time.perf_counter()
+        for i in range(args.sessions):
+            run_bot(make_script(rng), rooms).telemetry.export_csv(os.path.join(src, f"session_{i}.csv"))
+        print(f"synthesized {args.sessions} timelines in {time.perf_counter() - t0:.2f}s")
+
+        t0 = time.perf_counter()
+        table, written = render_aggregate(sorted(glob.glob(os.path.join(src, "*.csv"))), os.path.join(tmp, "out"), args.jobs)
+        print(f"aggregate views: {table.n_sessions} sessions, {len(table.score)} ticks, "
+              f"{len(written)} PNGs in {time.perf_counter() - t0:.2f}s")
+
+    x = np.arange(1_000_000, dtype=float)
+    y = np.cumsum(np.random.default_rng(1).normal(size=x.size))
+    t0 = time.perf_counter()
+    lx, _ = lttb(x, y, 1000)
+    print(f"lttb: 1,000,000 -> {len(lx)} points in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
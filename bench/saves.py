@@ -0,0 +1,65 @@
+"""
+Autosave throughput: one JSON file per slot vs the SQLite save store.
+
+    python -m bench.saves --saves 20000 --players 500 --threads 4
+
+Every save is an autosave-sized state for a random player. Reports saves/s
+for the JSON writer, SQLite with one transaction per save, and SQLite
+behind the AutosaveBatcher (coalesced, one transaction per batch), plus a
+multi-threaded run through the shared connection pool.
+"""
+import argparse, os, random, tempfile, threading, time
+from engine.persistence import JsonSaveStore, SqliteSaveStore, AutosaveBatcher
+
+ITEMS = ("paper (echo sketch)", "code5196", "lantern", "mirror shard")
+
+def make_saves(n, players, seed=1):
+    rng = random.Random(seed)
+    return [(f"player{rng.randrange(players)}", "slot1",
+             {"next_room": rng.randrange(1, 6), "inventory": sorted(rng.sample(ITEMS, rng.randrange(len(ITEMS))))})
+            for _ in range(n)]
+
+def run(store, saves, threads=1):
+    def worker(part):
+        for player, slot, state in part:
+            store.save(player, slot, state)
+    parts = [saves[i::threads] for i in range(threads)]
+    t0 = time.perf_counter()
+    if threads == 1:
+        worker(saves)
+    else:
+        ts = [threading.Thread(target=worker, args=(p,)) for p in parts]
+        for t in ts:
+            t.start()
+        for t in ts:
+            t.join()
+    store.close()       # the batcher's final flush counts
+    return len(saves) / (time.perf_counter() - t0)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--saves", type=int, default=20000)
+    ap.add_argument("--players", type=int, default=500)
+    ap.add_argument("--threads", type=int, default=4)
+    args = ap.parse_args(argv)
+    saves = make_saves(args.saves, args.players)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = lambda name: os.path.join(tmp, name)
+        rows = [
+            ("json files", run(JsonSaveStore(os.path.join(tmp, "json", "{player}_{slot}.json")), saves)),
+            ("sqlite", run(SqliteSaveStore(db("a.db")), saves)),
+            ("sqlite batched", run(AutosaveBatcher(SqliteSaveStore(db("b.db"))), saves)),
+            (f"sqlite x{args.threads} threads", run(SqliteSaveStore(db("c.db"), pool_size=args.threads), saves, args.threads)),
+        ]
+        check = SqliteSaveStore(db("b.db"))
+        last = {(p, s): st for p, s, st in saves}
+        assert all(check.load(p, s) == st for (p, s), st in last.items())
+        check.close()
+
+    print(f"{'backend':<22} {'saves/s':>10}")
+    for name, rate in rows:
+        print(f"{name:<22} {rate:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Resident memory per idle session: live object graph vs a parked SessionRecord.
+
+    python -m bench.sessions --sessions 100000
+
+Plays each session into room 2 with a few wrong answers (a full mood
+window, an item, wrong attempts), the way an idle player would sit on a
+server, and measures with tracemalloc how many bytes the sessions hold:
+first as live GameStates, then parked (engine.session.park) with the live
+states dropped. Rooms, the lexicon and the clock are shared by all
+sessions and are not counted. Telemetry is counted with the live graph
+only: a parked session leaves it with the caller (on a server it streams
+to disk).
+
+--saves checkpoints every answer into a store that drops the saves:
+"journal" keeps telemetry in memory, so Game keeps a journal for the
+snapshots; "stream" stands in for a CsvStreamSink, so the record keeps
+the stream's path and offset.
+"""
+import argparse, gc, os, time, tracemalloc
+from engine.clock import SimClock
+from engine.game import Game
+from engine.inventory import Inventory
+from engine.session import park
+from engine.telemetry import Telemetry
+from main import build_rooms
+from mood import MoodEngine
+
+class NullSink:
+    """What a streaming sink keeps in memory between writes: nothing."""
+    def write(self, ts, fields): pass
+    def rows(self): return iter(())
+    def flush(self): pass
+    def close(self): pass
+
+class StreamStub(NullSink):
+    """A CsvStreamSink without the file: a path and how far it got."""
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+    def write(self, ts, fields): self.offset += 64
+    def position(self): return self.path, self.offset
+    def resume(self, path, offset): return True
+
+class NullStore:
+    def load(self, player, slot): return {}
+    def save(self, player, slot, state): pass
+
+def make_telemetry(saves, i):
+    if saves == "journal":
+        return Telemetry()
+    if saves == "stream":
+        return Telemetry(sink=StreamStub(os.path.abspath(f"reports/sessions/session_20261018-120000_{i}.csv")))
+    return Telemetry(sink=NullSink())
+
+def idle_session(game, clock, answers, telemetry):
+    state = game.new_state(MoodEngine(), Inventory(), telemetry, 1.0, clock)
+    state.saved = {}
+    state, out = game.start(state)
+    for text in ["echo"] + ["1234"] * answers:
+        clock.advance(5.0)
+        state, out, done = game.step(state, text)
+    return state
+
+def measure(make, n):
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    held = [make(i) for i in range(n)]
+    gc.collect()
+    return held, (tracemalloc.get_traced_memory()[0] - before) / n
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=100000)
+    ap.add_argument("--answers", type=int, default=8, help="wrong answers each session gives in room 2")
+    ap.add_argument("--saves", choices=("off", "journal", "stream"), default="off")
+    args = ap.parse_args(argv)
+
+    rooms = build_rooms()
+    game = Game(rooms, save_path=None, csv_path=None, plot_path=None,
+                saves=NullStore() if args.saves != "off" else None)
+    clock = SimClock()
+    idle_session(game, clock, args.answers, make_telemetry(args.saves, 0))     # load rooms, lexicon, item registry
+    tracemalloc.start()
+    live, live_bytes = measure(
+        lambda i: idle_session(game, clock, args.answers, make_telemetry(args.saves, i)), args.sessions)
+    t1 = time.perf_counter()
+    parked, parked_bytes = measure(lambda i: park(live[i]), args.sessions)
+    t2 = time.perf_counter()
+    del live
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{args.sessions} idle sessions in room {parked[0].room + 1}, {parked[0].count} mood scores, "
+          f"{parked[0].wrong} wrong attempts, saves {args.saves}")
+    print(f"live GameState graph   {live_bytes:8.0f} bytes/session  ({live_bytes * args.sessions / 2**20:.1f} MiB)")
+    print(f"SessionRecord          {parked_bytes:8.0f} bytes/session  ({parked_bytes * args.sessions / 2**20:.1f} MiB)")
+    print(f"parking {(t2 - t1) / args.sessions * 1e6:.2f} us/session; "
+          f"{after / 2**20:.1f} MiB traced once the live states are dropped")
+
+if __name__ == "__main__":
+    main()
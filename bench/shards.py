@@ -0,0 +1,66 @@
+"""
+Throughput of the sharded server from 1 to N worker processes.
+
+    python -m bench.shards --max-workers 4 --sessions 2000 --concurrency 400
+
+For each worker count, starts `server.py --workers k` (1 = the plain
+single-process server), plays the same scripted sessions as
+bench.load_server from several client processes, and reports sessions
+per second, speedup over one worker and the reply latency. Both the
+server and the clients need cores: with C cores, counts above about C/2
+measure the machine, not the server.
+"""
+import argparse, asyncio, os, subprocess, sys, time
+from multiprocessing import Pool
+from bench.load_server import percentile, run_load, wait_for_port
+
+def _client(job):
+    host, port, sessions, concurrency = job
+    elapsed, failed, latencies = asyncio.run(run_load(host, port, sessions, concurrency))
+    return elapsed, failed, latencies
+
+def measure(workers, args, root):
+    host, port = "127.0.0.1", args.port + workers
+    proc = subprocess.Popen(
+        [sys.executable, "server.py", "--port", str(port), "--pace", "0", "--clock", "instant",
+         "--workers", str(workers)],
+        cwd=root, stdout=subprocess.DEVNULL,
+    )
+    try:
+        asyncio.run(wait_for_port(host, port))
+        per = args.sessions // args.clients
+        jobs = [(host, port, per, max(1, args.concurrency // args.clients))] * args.clients
+        t0 = time.perf_counter()
+        with Pool(args.clients) as pool:
+            results = pool.map(_client, jobs)
+        elapsed = time.perf_counter() - t0
+    finally:
+        proc.terminate()
+        proc.wait()
+    failed = sum(r[1] for r in results)
+    latencies = [x for r in results for x in r[2]]
+    return (per * args.clients - failed) / elapsed, failed, latencies
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--sessions", type=int, default=2000)
+    ap.add_argument("--concurrency", type=int, default=400)
+    ap.add_argument("--clients", type=int, default=max(1, (os.cpu_count() or 1) // 2),
+                    help="load-generating processes")
+    ap.add_argument("--port", type=int, default=7800)
+    args = ap.parse_args(argv)
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    print(f"{cores} cores, {args.clients} client processes, {args.sessions} sessions, concurrency {args.concurrency}")
+    print(f"{'workers':>7} {'sessions/s':>11} {'speedup':>8} {'failed':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    base = None
+    for workers in range(1, args.max_workers + 1):
+        rate, failed, lat = measure(workers, args, root)
+        base = base or rate
+        print(f"{workers:>7} {rate:>11.1f} {rate / base:>7.2f}x {failed:>7} "
+              f"{percentile(lat, 50) * 1000:>8.2f} {percentile(lat, 99) * 1000:>8.2f}", flush=True)
+
+if __name__ == "__main__":
+    main()
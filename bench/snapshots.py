@@ -0,0 +1,72 @@
+"""
+Session snapshot cost: taking one after an answer and restoring it.
+
+    python -m bench.snapshots --answers 20 --repeat 20000
+
+Plays `answers` wrong answers into room 2 on a SimClock, then times
+snapshot.take(), the JSON round trip a save store does, and a full resume
+(fresh GameState, snapshot.restore + resume_room). Prints microseconds per
+call and the snapshot size, for both telemetry setups: in memory with a
+journal (the snapshot carries every event) and streamed to a CSV file
+(the snapshot carries the file's path and offset). The streamed resume is
+timed without the file: continuing it costs one copy of the file per resume.
+"""
+import argparse, json, os, tempfile, time
+from engine import snapshot
+from engine.clock import SimClock
+from engine.game import Game
+from engine.inventory import Inventory
+from engine.telemetry import Telemetry, CsvStreamSink
+from main import build_rooms
+from mood import MoodEngine
+
+def played_state(game, answers, telemetry):
+    clock = SimClock()
+    state = game.new_state(MoodEngine(), Inventory(), telemetry, 1.0, clock)
+    if not telemetry.streaming:
+        state.telemetry.journal = []
+    state.saved = {}
+    state, out = game.start(state)
+    for text in ["echo"] + ["1234"] * answers:
+        clock.advance(5.0)
+        state, out, done = game.step(state, text)
+    return state
+
+def per_call(fn, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1e6
+
+def report(label, game, rooms, state, repeat):
+    snap = snapshot.take(state)
+    encoded = json.dumps(snap, separators=(",", ":"))
+
+    def resume():
+        fresh = game.new_state(MoodEngine(), Inventory(), Telemetry(), 1.0, SimClock())
+        snapshot.restore(fresh, snap)
+        snapshot.resume_room(rooms[snap["room"]], fresh, snap)
+
+    kept = f"{len(snap['events'])} journal events" if "events" in snap else "stream path + offset"
+    print(f"{label}: {kept}, snapshot {len(encoded)} bytes as JSON")
+    print(f"  take         {per_call(lambda: snapshot.take(state), repeat):8.2f} us")
+    print(f"  json encode  {per_call(lambda: json.dumps(snap, separators=(',', ':')), repeat):8.2f} us")
+    print(f"  json decode  {per_call(lambda: json.loads(encoded), repeat):8.2f} us")
+    print(f"  restore      {per_call(resume, repeat):8.2f} us")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--answers", type=int, default=20)
+    ap.add_argument("--repeat", type=int, default=20000)
+    args = ap.parse_args(argv)
+
+    rooms = build_rooms()
+    game = Game(rooms, save_path=None, csv_path=None, plot_path=None)
+    report("in memory", game, rooms, played_state(game, args.answers, Telemetry()), args.repeat)
+    with tempfile.TemporaryDirectory() as tmp:
+        telemetry = Telemetry(sink=CsvStreamSink(os.path.join(tmp, "session.csv")))
+        report("streamed", game, rooms, played_state(game, args.answers, telemetry), args.repeat)
+        telemetry.close()
+
+if __name__ == "__main__":
+    main()
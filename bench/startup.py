@@ -0,0 +1,71 @@
+"""
+Cold-start budget for the terminal game.
+
+    python -m bench.startup --runs 10 --budget-ms 100
+
+Starts `main.py --clock instant` in a fresh directory (no save, no cache)
+and measures the wall time until the first room's prompt is on stdout.
+Also runs `python -X importtime -c "import main"` and lists the slowest
+imports. Exits with status 1 when the median time-to-first-prompt is over
+the budget, so it can gate CI.
+"""
+import argparse, os, shutil, statistics, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIRST_PROMPT = b"Enter your answer (or type 'hint'): "
+
+def time_to_first_prompt(cwd) -> float:
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "main.py"), "--clock", "instant"], cwd=cwd,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    seen = b""
+    try:
+        while FIRST_PROMPT not in seen:
+            chunk = os.read(proc.stdout.fileno(), 4096)
+            if not chunk:
+                raise RuntimeError("main.py exited before its first prompt")
+            seen += chunk
+        return time.perf_counter() - t0
+    finally:
+        proc.kill()
+        proc.wait()
+
+def slowest_imports(n=10):
+    """(cumulative us, module) of the slowest top-level imports of `import main`."""
+    res = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=ROOT,
+                         capture_output=True, text=True)
+    rows = []
+    for line in res.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].rstrip()))
+    total = next((us for us, name in rows if name.strip() == "main"), 0)
+    return total, sorted(rows, reverse=True)[1:n + 1]
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--runs", type=int, default=10)
+    ap.add_argument("--budget-ms", type=float, default=100.0, help="fail above this median time-to-first-prompt")
+    args = ap.parse_args(argv)
+
+    total, slowest = slowest_imports()
+    print(f"import main: {total / 1000:.1f} ms cumulative; slowest imports:")
+    for us, name in slowest:
+        print(f"  {us / 1000:7.1f} ms  {name}")
+
+    times = []
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory() as tmp:
+            shutil.copytree(os.path.join(ROOT, "data"), os.path.join(tmp, "data"),
+                            ignore=shutil.ignore_patterns(".cache"))
+            times.append(time_to_first_prompt(tmp) * 1e3)
+    median = statistics.median(times)
+    print(f"time to first prompt: median {median:.1f} ms, min {min(times):.1f} ms, max {max(times):.1f} ms "
+          f"(budget {args.budget_ms:.0f} ms)")
+    if median > args.budget_ms:
+        print("OVER BUDGET")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+"""
+Mood parameter sweep throughput on a synthetic corpus of bot sessions.
+
+    python -m bench.sweep --sessions 5000 --settings 400 --jobs 1 4
+
+Runs scripted bots (bench.bots) on a SimClock, exports each timeline to a
+temporary directory, loads it as a sweep corpus and times a random grid
+of settings per job count. Also checks that the default setting reproduces
+the recorded mood states.
+"""
+import argparse, os, random, tempfile, time
+from bench.bots import make_script
+from engine import sweep
+from engine.replay import run_bot
+from main import build_rooms
+
+def write_corpus(directory, n, rng):
+    rooms = build_rooms()
+    scripts = [make_script(rng) for _ in range(min(n, 1000))]
+    for i in range(n):
+        res = run_bot(scripts[i % len(scripts)], rooms)
+        res.telemetry.export_csv(os.path.join(directory, f"session{i:06d}.csv"))
+
+def random_settings(n, rng):
+    out = []
+    for _ in range(n):
+        s = rng.uniform(-1.6, -0.8)
+        f = rng.uniform(-0.5, -0.1)
+        out.append({
+            "history_size": rng.randint(3, 10),
+            "wrong_weight": round(rng.uniform(-1.2, -0.4), 2),
+            "time_weight": round(rng.uniform(-2.0, -1.0), 2),
+            "thresholds": (round(s, 2), round(f, 2), round(-f, 2), round(-s, 2)),
+        })
+    return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=5000)
+    ap.add_argument("--settings", type=int, default=400)
+    ap.add_argument("--jobs", type=int, nargs="+", default=[1, os.cpu_count()])
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        write_corpus(tmp, args.sessions, rng)
+        paths = sorted(os.path.join(tmp, p) for p in os.listdir(tmp))
+        t1 = time.perf_counter()
+        corpus = sweep.load_corpus(paths, max(args.jobs))
+        t2 = time.perf_counter()
+    known = corpus.recorded >= 0
+    agree = (sweep.rescore(corpus, sweep.DEFAULTS)[known] == corpus.recorded[known]).mean() * 100
+    print(f"corpus: {corpus.n_sessions} sessions, {len(corpus.lex)} answers "
+          f"(bots {t1 - t0:.1f}s, load {t2 - t1:.1f}s); defaults reproduce {agree:.2f}% of recorded states")
+
+    settings = random_settings(args.settings, rng)
+    print(f"{'jobs':>5} {'seconds':>8} {'settings/s':>11} {'session-settings/s':>19}")
+    for jobs in args.jobs:
+        t0 = time.perf_counter()
+        sweep.sweep(corpus, settings, jobs)
+        elapsed = time.perf_counter() - t0
+        print(f"{jobs:>5} {elapsed:>8.2f} {len(settings) / elapsed:>11.0f} "
+              f"{len(settings) * corpus.n_sessions / elapsed:>19.0f}")
+
+if __name__ == "__main__":
+    main()
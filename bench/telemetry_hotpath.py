@@ -0,0 +1,55 @@
+"""
+Cost of one Telemetry.log call on the room hot path.
+
+    python -m bench.telemetry_hotpath --calls 300000
+
+Compares the old per-call datetime.isoformat() stamp with monotonic ns
+stamps, sampled mood_ticks, and disabled telemetry behind the rooms'
+`if telemetry:` guard.
+"""
+import argparse, time
+from datetime import datetime
+from engine.telemetry import Telemetry
+
+class IsoTelemetry:
+    """The previous log(): a fresh dict with an ISO timestamp per event."""
+    def __init__(self):
+        self.events = []
+
+    def log(self, **kwargs):
+        rec = {"ts": datetime.now().isoformat(timespec="seconds")}
+        rec.update(kwargs)
+        self.events.append(rec)
+
+def room_turn(telemetry, n):
+    """What a room logs per answer: mood_tick + answer, each behind the guard."""
+    for i in range(n // 2):
+        if telemetry:
+            telemetry.log(room="room1", event="mood_tick", mood_score=-0.4, mood_state="focused")
+        if telemetry:
+            telemetry.log(room="room1", event="answer", input="echo", correct=False)
+
+def timed(telemetry, n):
+    t0 = time.perf_counter()
+    room_turn(telemetry, n)
+    return (time.perf_counter() - t0) / n * 1e9
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--calls", type=int, default=300000)
+    args = ap.parse_args(argv)
+    n = args.calls
+    cases = [
+        ("iso timestamp (old)", IsoTelemetry()),
+        ("monotonic ns", Telemetry()),
+        ("mood_tick 1 in 10", Telemetry(sample={"mood_tick": 10})),
+        ("mood_tick dropped", Telemetry(sample={"mood_tick": 0})),
+        ("disabled", Telemetry(enabled=False)),
+    ]
+    print(f"{'mode':<22} {'ns/call':>9} {'kept':>8}")
+    for name, t in cases:
+        ns = timed(t, n)
+        print(f"{name:<22} {ns:>9.0f} {len(t.events):>8}")
+
+if __name__ == "__main__":
+    main()
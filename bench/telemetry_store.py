@@ -0,0 +1,69 @@
+"""
+Telemetry memory and speed: in-memory dict list vs the columnar store.
+
+    python -m bench.telemetry_store --events 200000
+
+Reports resident bytes per event (tracemalloc), log calls per second and
+on-disk bytes per event (CSV export vs the binary store file).
+"""
+import argparse, os, random, tempfile, time, tracemalloc
+from engine.event_store import ColumnarStore
+from engine.telemetry import Telemetry
+
+ROOMS = ("room1", "room2", "room3", "riddle_shadow")
+STATES = ("stressed", "focused", "neutral", "calm", "excited")
+INPUTS = ("echo", "hgut", "5348", "7465", "portal", "papaya", "shadow", "idk", "no idea!!")
+
+def make_calls(n, seed=1):
+    """A game-like mix: every answer brings a mood_tick, some hints and items."""
+    rng = random.Random(seed)
+    calls = []
+    while len(calls) < n:
+        room = rng.choice(ROOMS)
+        calls.append(dict(room=room, event="mood_tick", mood_score=rng.uniform(-2.5, 2.5), mood_state=rng.choice(STATES)))
+        calls.append(dict(room=room, event="answer", input=rng.choice(INPUTS), correct=rng.random() < 0.3))
+        r = rng.random()
+        if r < 0.3:
+            calls.append(dict(room=room, event="hint"))
+        elif r < 0.35:
+            calls.append(dict(room=room, event="item_gain", item="code5196"))
+    return calls[:n]
+
+def measure(make_telemetry, calls):
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    t = make_telemetry()
+    t0 = time.perf_counter()
+    for c in calls:
+        t.log(**c)
+    elapsed = time.perf_counter() - t0
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return t, used / len(calls), len(calls) / elapsed
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--events", type=int, default=200000)
+    args = ap.parse_args(argv)
+    calls = make_calls(args.events)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = []
+        for name, factory in (("dict list", Telemetry), ("columnar", lambda: Telemetry(sink=ColumnarStore()))):
+            t, per_event, rate = measure(factory, [dict(c) for c in calls])
+            csv_path = os.path.join(tmp, f"{name}.csv".replace(" ", "_"))
+            t.export_csv(csv_path)
+            disk = os.path.getsize(csv_path)
+            if t.sink is not None:
+                bin_path = os.path.join(tmp, "events.mmev")
+                t.sink.save(bin_path)
+                disk = os.path.getsize(bin_path)
+                assert len(ColumnarStore.load(bin_path)) == len(calls)
+            rows.append((name, per_event, rate, disk / len(calls)))
+
+    print(f"{'store':<10} {'bytes/event':>12} {'log calls/s':>12} {'disk bytes/event':>17}")
+    for name, per_event, rate, disk in rows:
+        print(f"{name:<10} {per_event:>12.1f} {rate:>12.0f} {disk:>17.1f}")
+
+if __name__ == "__main__":
+    main()
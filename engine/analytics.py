@@ -0,0 +1,442 @@
+"""
+Cross-session analytics over session timeline CSVs.
+
+Streams every timeline row by row (one file or session in memory at a
+time, aggregates of fixed size) and reports, across all players:
+
+    per room    sessions entering, solve-time percentiles (room entry to the
+                correct answer), wrong answers before success, drop-outs
+    per mood    answers and hint requests while in each mood_state
+    sessions    escaped / game over / abandoned
+
+Files are scanned in parallel chunks. The merged aggregate is saved with
+the size and mtime of every file it covers, so a re-run only reads new
+files. A file whose last session was abandoned may still be continued (a
+resume appends to it, or moves it into a new file), so its aggregate is
+kept apart and only that file is re-read when it changes or goes away;
+a changed or deleted finished file triggers a full rebuild. Files written
+to in the last `--settle` seconds without a final outcome are sessions
+still being played: they are left out until they settle. "-" reads a
+telemetry stream on stdin instead: concatenated timelines, each with its
+own header row; stream results are reported but not saved.
+
+    python -m engine.analytics reports/sessions --jobs 8
+    cat reports/sessions/*.csv | python -m engine.analytics -
+
+A session that is resumed later shows up twice: as a drop-out where it
+stopped, and as "resumed" in that room in the file that continues it.
+"""
+import argparse, csv, glob, json, os, sys, time
+from datetime import datetime
+from engine.histogram import Histogram
+
+STATE_PATH = os.path.join("reports", "analytics", "state.json")
+STATE_VERSION = 2
+SETTLE = 900.0          # seconds without a write before an unfinished file counts as abandoned
+OUTCOMES = ("escaped", "game_over", "abandoned")
+START = "(start)"       # drop-out before the first room
+
+def _hist():
+    return Histogram(unit=0.01, highest=36000.0)
+
+def _add(mine, theirs):
+    for k, v in theirs.items():
+        mine[k] = mine.get(k, 0) + v
+
+class RoomAgg:
+    def __init__(self):
+        self.entered = 0
+        self.solved = 0
+        self.dropped = 0
+        self.resumed = 0
+        self.solve_time = _hist()
+        self.wrong_before = {}          # wrong answers before success -> sessions
+
+    def merge(self, other):
+        self.entered += other.entered
+        self.solved += other.solved
+        self.dropped += other.dropped
+        self.resumed += other.resumed
+        if other.solve_time.count:
+            self.solve_time.merge(other.solve_time)
+        _add(self.wrong_before, other.wrong_before)
+
+    def to_dict(self):
+        return {"entered": self.entered, "solved": self.solved, "dropped": self.dropped, "resumed": self.resumed,
+                "solve_time": self.solve_time.to_dict(),
+                "wrong_before": {str(k): v for k, v in self.wrong_before.items()}}
+
+    @classmethod
+    def from_dict(cls, d):
+        r = cls()
+        r.entered, r.solved, r.dropped, r.resumed = d["entered"], d["solved"], d["dropped"], d["resumed"]
+        r.solve_time = Histogram.from_dict(d["solve_time"])
+        r.wrong_before = {int(k): v for k, v in d["wrong_before"].items()}
+        return r
+
+class Analytics:
+    def __init__(self):
+        self.sessions = 0
+        self.outcomes = {}
+        self.rooms = {}                 # room id -> RoomAgg, in the order first seen
+        self.mood_answers = {}          # mood_state -> answers scored into it
+        self.mood_hints = {}            # mood_state -> hint requests made in it
+        self.dropped_after = {}         # last room solved (or START) -> sessions abandoned before the next
+        self.files = {}                 # path -> [mtime_ns, size] of every finished file covered
+        self.parts = {}                 # path -> Analytics of a file whose last session was abandoned
+
+    def room(self, room_id) -> RoomAgg:
+        r = self.rooms.get(room_id)
+        if r is None:
+            r = self.rooms[room_id] = RoomAgg()
+        return r
+
+    def merge(self, other):
+        self.sessions += other.sessions
+        _add(self.outcomes, other.outcomes)
+        for room_id, r in other.rooms.items():
+            self.room(room_id).merge(r)
+        _add(self.mood_answers, other.mood_answers)
+        _add(self.mood_hints, other.mood_hints)
+        _add(self.dropped_after, other.dropped_after)
+        self.files.update(other.files)
+        self.parts.update(other.parts)
+        return self
+
+    def total(self):
+        """Everything covered, the files kept apart included."""
+        t = Analytics().merge(self)
+        for part in t.parts.values():
+            t.merge(part)
+        t.parts = {}
+        return t
+
+    def to_dict(self):
+        return {"v": STATE_VERSION, "sessions": self.sessions, "outcomes": self.outcomes,
+                "rooms": {k: r.to_dict() for k, r in self.rooms.items()},
+                "mood_answers": self.mood_answers, "mood_hints": self.mood_hints,
+                "dropped_after": self.dropped_after, "files": self.files,
+                "parts": {p: a.to_dict() for p, a in self.parts.items()}}
+
+    @classmethod
+    def from_dict(cls, d):
+        a = cls()
+        a.sessions, a.outcomes = d["sessions"], d["outcomes"]
+        a.rooms = {k: RoomAgg.from_dict(r) for k, r in d["rooms"].items()}
+        a.mood_answers, a.mood_hints, a.files = d["mood_answers"], d["mood_hints"], d["files"]
+        a.dropped_after = d["dropped_after"]
+        a.parts = {p: cls.from_dict(part) for p, part in d.get("parts", {}).items()}
+        return a
+
+# ---- one session at a time ---------------------------------------------------------
+
+class _Session:
+    """What is open while one session's rows stream past."""
+    def __init__(self, agg, start):
+        self.agg = agg
+        self.start = start          # game_start stamp; older rows are a restored journal
+        self.room = None
+        self.entered = start
+        self.last_ts = start
+        self.wrong = 0
+        self.solved = False
+        self.timed = True           # False in a room resumed mid-way (entered in another file)
+        self.mood = "neutral"
+        self.outcome = "abandoned"
+        self.journal_room = None    # room the restored journal stopped in, unsolved
+        self.journal_wrong = 0
+        self.journal_mood = None
+        self.resume = None          # None | "entry" | "mid": how the next room was resumed
+        agg.sessions += 1
+
+    def follows(self, prev):
+        """
+        `prev` ended in this file right before our game_start: a stream
+        resumed in place, if a restore follows, picks up where it stopped.
+        """
+        if prev.room is not None and not prev.solved:
+            self.journal_room, self.journal_wrong = prev.room, prev.wrong
+        self.journal_mood = prev.mood
+
+    def _journal(self, row):
+        room, ev = row.get("room"), row.get("event")
+        if room == "meta":
+            return
+        if ev == "mood_tick":
+            self.mood = row.get("mood_state") or self.mood
+        if room != self.journal_room:
+            self.journal_room, self.journal_wrong = room, 0
+        if ev == "answer":
+            if row.get("correct") == "True":
+                self.journal_room = None
+            else:
+                self.journal_wrong += 1
+
+    def row(self, ts, row):
+        if ts < self.start:
+            self._journal(row)
+            return
+        room, ev = row.get("room"), row.get("event")
+        if room == "meta":
+            if ev in ("escaped", "game_over"):
+                self.outcome = ev
+            elif ev in ("load", "restore"):
+                self.resume = "mid" if self.journal_room is not None else "entry"
+                if self.journal_mood is not None:
+                    self.mood = self.journal_mood
+            self.last_ts = ts
+            return
+        if room != self.room:
+            self._enter(room)
+        self.last_ts = ts
+        agg = self.agg
+        if ev == "mood_tick":
+            self.mood = row.get("mood_state") or self.mood
+            agg.mood_answers[self.mood] = agg.mood_answers.get(self.mood, 0) + 1
+        elif ev == "hint":
+            agg.mood_hints[self.mood] = agg.mood_hints.get(self.mood, 0) + 1
+        elif ev == "answer":
+            if row.get("correct") == "True":
+                r = agg.room(room)
+                r.solved += 1
+                if self.timed:
+                    r.solve_time.record(ts - self.entered)
+                r.wrong_before[self.wrong] = r.wrong_before.get(self.wrong, 0) + 1
+                self.solved = True
+            else:
+                self.wrong += 1
+
+    def _enter(self, room):
+        r = self.agg.room(room)
+        self.room, self.entered = room, self.last_ts
+        self.wrong, self.solved, self.timed = 0, False, True
+        if self.resume is not None:
+            r.resumed += 1
+            if self.resume == "mid" and room == self.journal_room:
+                self.wrong, self.timed = self.journal_wrong, False
+                self.resume = None
+                return
+            self.resume = None
+        r.entered += 1
+
+    def close(self):
+        agg = self.agg
+        agg.outcomes[self.outcome] = agg.outcomes.get(self.outcome, 0) + 1
+        if self.outcome != "abandoned":
+            return
+        if self.room is None or self.solved:
+            # stopped between rooms (or at the start): attribute it to the last room finished
+            key = START if self.room is None else self.room
+            agg.dropped_after[key] = agg.dropped_after.get(key, 0) + 1
+        else:
+            agg.room(self.room).dropped += 1
+
+def _parse_ts(text):
+    return datetime.fromisoformat(text).timestamp() if text else 0.0
+
+def scan_rows(rows, agg):
+    """Fold an iterable of timeline row dicts (one or more sessions) into `agg`."""
+    _fold(rows, agg)
+    return agg
+
+def _fold(rows, agg):
+    # returns the outcome of the last session (None: no session at all)
+    session = None
+    for row in rows:
+        ts = _parse_ts(row.get("ts"))
+        if row.get("room") == "meta" and row.get("event") == "game_start":
+            if session is not None and ts < session.start:
+                continue                    # the restored session's own game_start
+            prev = session
+            if prev is not None:
+                prev.close()
+            session = _Session(agg, ts)
+            if prev is not None:
+                session.follows(prev)
+            continue
+        if session is None:
+            session = _Session(agg, ts)
+        session.row(ts, row)
+    if session is None:
+        return None
+    session.close()
+    return session.outcome
+
+# ---- files, streams, state ----------------------------------------------------------
+
+def fingerprint(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+def scan_file(path, agg):
+    _scan_file(path, agg)
+    return agg
+
+def _scan_file(path, agg):
+    fp = fingerprint(path)              # before reading: rows appended meanwhile change it
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        last = _fold(csv.DictReader(f), agg)
+    agg.files[path] = fp
+    return last
+
+def _scan_chunk(paths, settled_before=None):
+    """
+    Finished files fold into one aggregate, abandoned ones go to its parts.
+    Unfinished files written to at or after `settled_before` (ns) are skipped.
+    """
+    agg = Analytics()
+    for p in paths:
+        part = Analytics()
+        last = _scan_file(p, part)
+        if last in ("escaped", "game_over"):
+            agg.merge(part)
+        elif settled_before is None or part.files[p][0] < settled_before:
+            agg.parts[p] = part
+    return agg
+
+def scan_stream(f, agg):
+    """Concatenated timelines (each starting with its header row), e.g. `cat sessions/*.csv`."""
+    def rows():
+        header = None
+        for values in csv.reader(f):
+            if values and values[0] == "ts":
+                header = values
+                continue
+            if header is not None:
+                yield dict(zip(header, values))
+    return scan_rows(rows(), agg)
+
+def scan_files(paths, jobs=None, chunk=64, settle=None):
+    """
+    Analytics of `paths`, scanned in chunks across `jobs` processes and
+    merged as they finish. With `settle` (seconds), unfinished files written
+    to more recently than that are left out.
+    """
+    agg = Analytics()
+    chunks = [paths[i:i + chunk] for i in range(0, len(paths), chunk)]
+    settled_before = time.time_ns() - int(settle * 1e9) if settle is not None else None
+    if (jobs or 1) > 1 and len(chunks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(jobs) as pool:
+            for part in pool.map(_scan_chunk, chunks, [settled_before] * len(chunks)):
+                agg.merge(part)
+    else:
+        for c in chunks:
+            agg.merge(_scan_chunk(c, settled_before))
+    return agg
+
+def load_state(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            d = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return Analytics.from_dict(d) if d.get("v") == STATE_VERSION else None
+
+def save_state(agg, path):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(agg.to_dict(), f)
+    os.replace(tmp, path)
+
+def update(paths, state=None, jobs=None, settle=SETTLE):
+    """
+    `state` brought up to date with `paths`: only new files, changed
+    abandoned ones and those still being played are read; the aggregate of
+    an abandoned file that changed or disappeared is dropped first. If a
+    finished file changed or disappeared the whole set is rescanned.
+    Returns (analytics, files read); report on analytics.total().
+    """
+    paths = sorted(os.path.abspath(p) for p in paths)
+    if state is not None:
+        current = set(paths)
+        for p, part in list(state.parts.items()):
+            if p not in current or fingerprint(p) != part.files[p]:
+                del state.parts[p]
+        if any(p not in current or fingerprint(p) != fp for p, fp in state.files.items()):
+            state = None
+    if state is None:
+        return scan_files(paths, jobs, settle=settle), len(paths)
+    todo = [p for p in paths if p not in state.files and p not in state.parts]
+    return state.merge(scan_files(todo, jobs, settle=settle)), len(todo)
+
+def collect(sources):
+    paths = []
+    for src in sources:
+        if os.path.isdir(src):
+            paths.extend(glob.glob(os.path.join(src, "**", "*.csv"), recursive=True))
+        else:
+            paths.extend(glob.glob(src))
+    return paths
+
+# ---- report --------------------------------------------------------------------------
+
+def report(agg) -> str:
+    n = agg.sessions or 1
+    lines = [f"sessions {agg.sessions}: " + ", ".join(
+        f"{o.replace('_', ' ')} {100.0 * agg.outcomes.get(o, 0) / n:.1f}%" for o in OUTCOMES)]
+    lines.append(f"{'room':<16} {'entered':>8} {'solved':>8} {'p50 s':>8} {'p90 s':>8} {'p99 s':>8} "
+                 f"{'wrong':>6} {'dropped':>8} {'resumed':>8} {'quit after':>11}")
+    for room_id, r in agg.rooms.items():
+        st = r.solve_time
+        solved = sum(r.wrong_before.values()) or 1
+        wrong = sum(k * v for k, v in r.wrong_before.items()) / solved
+        lines.append(f"{room_id:<16} {r.entered:>8} {r.solved:>8} {st.percentile(50):>8.1f} {st.percentile(90):>8.1f} "
+                     f"{st.percentile(99):>8.1f} {wrong:>6.2f} {r.dropped:>8} {r.resumed:>8} "
+                     f"{agg.dropped_after.get(room_id, 0):>11}")
+    if agg.dropped_after.get(START):
+        lines.append(f"quit before the first answer: {agg.dropped_after[START]}")
+    worst = max(agg.rooms.items(), key=lambda kv: kv[1].dropped + agg.dropped_after.get(kv[0], 0), default=None)
+    if worst is not None and worst[1].dropped + agg.dropped_after.get(worst[0], 0):
+        lines.append(f"most drop-outs: {worst[0]}")
+    lines.append(f"{'mood_state':<16} {'answers':>8} {'hints':>8} {'hints/answer':>13}")
+    for mood in sorted(set(agg.mood_answers) | set(agg.mood_hints)):
+        a, h = agg.mood_answers.get(mood, 0), agg.mood_hints.get(mood, 0)
+        lines.append(f"{mood:<16} {a:>8} {h:>8} {h / a if a else float('nan'):>13.2f}")
+    return "\n".join(lines)
+
+def to_json(agg) -> dict:
+    d = agg.to_dict()
+    del d["files"], d["parts"]
+    for room_id, r in agg.rooms.items():
+        d["rooms"][room_id]["solve_time"] = r.solve_time.summary((50, 90, 95, 99))
+    return d
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Aggregate session timelines across players.")
+    ap.add_argument("sources", nargs="*", default=[os.path.join("reports", "sessions")],
+                    help="timeline directories / files / globs, or - for a stream on stdin (default: reports/sessions)")
+    ap.add_argument("--jobs", type=int, default=None, help="processes (default: all cores)")
+    ap.add_argument("--state", default=STATE_PATH, help="incremental state file")
+    ap.add_argument("--full", action="store_true", help="ignore the saved state and rescan everything")
+    ap.add_argument("--settle", type=float, default=SETTLE,
+                    help="seconds since the last write before an unfinished session counts as abandoned")
+    ap.add_argument("--json", help="also write the results here")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    files = [s for s in args.sources if s != "-"]
+    agg, read = Analytics(), 0
+    if files:
+        state = None if args.full else load_state(args.state)
+        agg, read = update(collect(files), state, args.jobs or os.cpu_count(), args.settle)
+        save_state(agg, args.state)
+    covered = len(agg.files) + len(agg.parts)
+    agg = agg.total()
+    if "-" in args.sources:
+        stream = Analytics()
+        scan_stream(sys.stdin, stream)
+        agg.merge(stream)
+    elapsed = time.perf_counter() - t0
+    print(report(agg))
+    print(f"read {read} of {covered} files in {elapsed:.2f}s")
+    if args.json:
+        if os.path.dirname(args.json):
+            os.makedirs(os.path.dirname(args.json), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(to_json(agg), f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Answer matching shared by all rooms.
+
+A room builds one AnswerMatcher up front: its normalization pipeline is
+composed once, the accepted answers are normalized into a set, and the
+accepted plus known wrong answers go into a near-miss index. Each attempt
+is then one normalization, one set lookup and, for wrong answers, one
+index probe:
+
+    matcher = AnswerMatcher({"portal"}, steps=("strip", "lower"))
+    m = matcher.match("  Portl ")
+    m.normalized, m.correct, m.near     # "portl", False, "portal"
+
+Near misses are answers within a small edit distance (Damerau/OSA: insert,
+delete, substitute, swap two neighbours) of an accepted answer, 1 edit up
+to 7 characters and 2 beyond. Answers shorter than `min_length` are never
+near misses; in a 4-digit code every guess is one edit from something.
+Rooms with a short word answer lower it (Room 1's "echo" uses 4).
+
+The index is a symmetric-delete index: every string reachable by deleting
+up to `max_distance` characters maps back to the answers it came from,
+so a probe generates the input's own deletes and looks them up. Cost
+depends on the input's length, not on how many answers there are. Rooms
+with only a few answers (up to SCAN_LIMIT) skip the index and compare
+against each answer of a fitting length, which is cheaper at that size.
+"""
+
+NORMALIZERS = {
+    "strip": str.strip,
+    "lower": str.lower,
+    "casefold": str.casefold,
+    "unquote": lambda s: s.strip("'\""),
+    "nospace": lambda s: s.replace(" ", ""),
+    "collapse": lambda s: " ".join(s.split()),
+}
+
+DEFAULT_STEPS = ("strip", "lower", "unquote")
+SCAN_LIMIT = 8
+
+def compile_pipeline(steps):
+    """One function applying the named NORMALIZERS in order."""
+    try:
+        fns = tuple(NORMALIZERS[s] for s in steps)
+    except KeyError as e:
+        raise ValueError(f"unknown normalization step: {e.args[0]!r}") from None
+    if len(fns) == 1:
+        return fns[0]
+
+    def normalize(text):
+        for fn in fns:
+            text = fn(text)
+        return text
+    return normalize
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal-string-alignment distance, or limit + 1 once it must exceed `limit`."""
+    la, lb = len(a), len(b)
+    if abs(la - lb) > limit:
+        return limit + 1
+    big = limit + 1
+    prev2 = None
+    prev = [j if j <= limit else big for j in range(lb + 1)]
+    for i in range(1, la + 1):
+        # only the band |i - j| <= limit can stay within the limit
+        cur = [big] * (lb + 1)
+        if i <= limit:
+            cur[0] = i
+        ca = a[i - 1]
+        best = cur[0]
+        for j in range(max(1, i - limit), min(lb, i + limit) + 1):
+            cb = b[j - 1]
+            d = prev[j - 1] + (ca != cb)
+            if prev[j] + 1 < d:
+                d = prev[j] + 1
+            if cur[j - 1] + 1 < d:
+                d = cur[j - 1] + 1
+            if prev2 is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb and prev2[j - 2] + 1 < d:
+                d = prev2[j - 2] + 1
+            cur[j] = d
+            if d < best:
+                best = d
+        if best > limit:
+            return big
+        prev2, prev = prev, cur
+    return prev[lb] if prev[lb] <= limit else big
+
+def _deletes(word: str, depth: int) -> set:
+    out = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        out |= frontier
+    return out
+
+def max_distance_for(length: int) -> int:
+    return 1 if length <= 7 else 2
+
+class Match:
+    __slots__ = ("normalized", "correct", "near", "known", "distance")
+
+    def __init__(self, normalized, correct=False, near=None, known=None, distance=0):
+        self.normalized = normalized
+        self.correct = correct
+        self.near = near            # closest accepted answer, for a near miss
+        self.known = known          # known wrong answer it is (or is close to)
+        self.distance = distance
+
+class AnswerMatcher:
+    def __init__(self, accepted, steps=DEFAULT_STEPS, wrong=None, min_length: int = 5, near: bool = True):
+        """
+        accepted  answers that solve the room (normalized like the input)
+        steps     names from NORMALIZERS, applied in order
+        wrong     known wrong answers -> guidance line (or None)
+        """
+        self.steps = tuple(steps)
+        self.normalize = compile_pipeline(self.steps)
+        self.accepted = frozenset(self.normalize(a) for a in accepted)
+        self.wrong = {self.normalize(k): v for k, v in (wrong or {}).items()}
+        self.min_length = min_length
+        self.terms = []
+        self.index = None
+        if near:
+            self.terms = sorted(t for t in self.accepted | set(self.wrong) if len(t) >= min_length)
+        if len(self.terms) > SCAN_LIMIT:
+            self.index = {}
+            for term in self.terms:
+                for d in _deletes(term, max_distance_for(len(term))):
+                    self.index.setdefault(d, []).append(term)
+
+    def match(self, text: str) -> Match:
+        s = self.normalize(text)
+        if s in self.accepted:
+            return Match(s, True)
+        if s in self.wrong:
+            return Match(s, known=s)
+        if len(s) < self.min_length or not self.terms:
+            return Match(s)
+        limit = max_distance_for(len(s))
+        if self.index is None:
+            candidates = [t for t in self.terms if abs(len(t) - len(s)) <= limit]
+        else:
+            index = self.index
+            candidates = {t for d in _deletes(s, limit) for t in index.get(d, ())}
+        best = None
+        for term in candidates:
+            dist = edit_distance(s, term, min(limit, max_distance_for(len(term))))
+            if dist > limit or dist > max_distance_for(len(term)):
+                continue
+            # closest first, then accepted before known wrong, then alphabetical: stable results
+            key = (dist, term not in self.accepted, term)
+            if best is None or key < best:
+                best = key
+        if best is None:
+            return Match(s)
+        dist, wrong, term = best
+        if wrong:
+            return Match(s, known=term, distance=dist)
+        return Match(s, near=term, distance=dist)
@@ -0,0 +1,154 @@
+"""
+MoodEngine for many sessions at once.
+
+Each session's score window is a row of a NumPy ring buffer. observe()
+takes one observation for each of a batch of sessions and returns their
+raw scores, mood states and hint policies as arrays, matching what one
+scalar MoodEngine per session would return:
+
+    engine = BatchMoodEngine(n_sessions=10000)
+    res = engine.observe(ids, texts, seconds, correct, wrong_attempts)
+    res.states      # codes into STATES
+    res.give_hint   # bool per observation
+    res.strength    # codes into STRENGTHS
+
+The arithmetic runs in the same order as MoodEngine.observe, so raw
+scores are bit-identical. Window means are summed column by column in
+chronological order; rows whose mean lands within 1e-9 of a threshold are
+re-checked with the scalar engine's own sum, so the states match on every
+Python version. Lexicon scores are memoized per distinct text; the texts
+a tick has not seen before are scored together (text_scores): one lexicon
+scan over all of them, and the "!" and capitals counts as array sums over
+their code points.
+"""
+import numpy as np
+from mood import MoodEngine
+
+STATES = ("stressed", "focused", "neutral", "calm", "excited")
+STRENGTHS = ("soft", "normal", "strong")
+STRESSED, FOCUSED, NEUTRAL, CALM, EXCITED = range(len(STATES))
+# hint strength per state code (MoodEngine.hint_policy)
+_STRENGTH_OF = np.array([2, 1, 1, 0, 0], dtype=np.int8)
+
+def text_scores(me, texts) -> np.ndarray:
+    """MoodEngine._lexicon_score of every text, as one batch (same floats)."""
+    joined = "\0".join(texts) + "\0"
+    lowered = joined.lower()
+    try:
+        cp = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32)
+    except UnicodeEncodeError:
+        cp = None                               # lone surrogates
+    if cp is None or len(lowered) != len(joined):
+        # lowercasing changed some text's length: offsets would not line up
+        return np.array([me._lexicon_score(t) for t in texts], dtype=float)
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)) + 1
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    base = np.array(me.lexicon.score_many(lowered, starts.tolist()), dtype=float)
+    # every segment ends in its "\0", so none is empty for reduceat
+    upper = (cp >= 65) & (cp <= 90)
+    letters = np.add.reduceat((upper | ((cp >= 97) & (cp <= 122))).astype(np.int64), starts)
+    caps = np.add.reduceat(upper.astype(np.int64), starts)
+    exclaims = np.add.reduceat((cp == 33).astype(np.int64), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = caps / letters
+    ratio = np.where((letters >= me.CAPS_MIN_LETTERS) & (ratio > me.CAPS_MIN_RATIO), ratio, 0.0)
+    return (base + me.EXCLAIM_WEIGHT * np.minimum(exclaims, me.EXCLAIM_CAP)) + me.CAPS_WEIGHT * ratio
+
+def classify(avg, thresholds):
+    """State codes for an array of window means (MoodEngine.mood_state's rules)."""
+    stressed, focused, calm, excited = thresholds
+    states = np.full(len(avg), NEUTRAL, dtype=np.int8)
+    states[avg >= calm] = CALM
+    states[avg >= excited] = EXCITED
+    states[avg <= focused] = FOCUSED
+    states[avg <= stressed] = STRESSED
+    return states
+
+class BatchResult:
+    def __init__(self, scores, states, give_hint, strength):
+        self.scores = scores
+        self.states = states
+        self.give_hint = give_hint
+        self.strength = strength
+
+    def state_names(self):
+        return [STATES[c] for c in self.states]
+
+class BatchMoodEngine:
+    def __init__(self, n_sessions: int, history_size: int = 6, lexicon=None, cache_size: int = 100000, params=None):
+        self.history_size = history_size
+        self.window = np.zeros((n_sessions, history_size))
+        self.head = np.zeros(n_sessions, dtype=np.int64)     # next slot to write per session
+        self.count = np.zeros(n_sessions, dtype=np.int64)
+        self._scalar = MoodEngine(history_size, lexicon=lexicon, params=params)
+        self._lex = {}
+        self.cache_size = cache_size
+
+    def lexicon_scores(self, texts):
+        cache = self._lex
+        if len(cache) > self.cache_size:
+            cache.clear()
+        get = cache.get
+        values = [get(t) for t in texts]
+        if None in values:
+            new = list(dict.fromkeys(t for t, v in zip(texts, values) if v is None))
+            cache.update(zip(new, text_scores(self._scalar, new).tolist()))
+            values = [cache[t] for t in texts]
+        return np.array(values)
+
+    def observe(self, ids, texts, seconds, correct, wrong_attempts, near_miss=None) -> BatchResult:
+        """One observation each for the (distinct) sessions in `ids` (near_miss: optional bools)."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(np.unique(ids)) != len(ids):
+            raise ValueError("observe() takes at most one observation per session; split the batch")
+        me = self._scalar
+        t = np.clip(np.asarray(seconds, dtype=float), 0.0, me.TIME_CAP)
+        time_penalty = me.TIME_WEIGHT * (t / 30.0)
+        wa = np.clip(np.asarray(wrong_attempts, dtype=np.int64), 0, me.WRONG_CAP)
+        wrong_penalty = me.WRONG_WEIGHT * wa
+        correct = np.asarray(correct, dtype=bool)
+        correct_bonus = np.where(correct, me.CORRECT_BONUS, 0.0)
+        near = np.zeros(len(ids), dtype=bool) if near_miss is None else np.asarray(near_miss, dtype=bool) & ~correct
+        near_bonus = np.where(near, me.NEAR_MISS_BONUS, 0.0)
+        raw = time_penalty + wrong_penalty + correct_bonus + near_bonus + self.lexicon_scores(texts)
+        raw = np.clip(raw, -me.SCORE_CAP, me.SCORE_CAP)
+
+        h = self.history_size
+        self.window[ids, self.head[ids]] = raw
+        self.head[ids] = (self.head[ids] + 1) % h
+        count = self.count[ids] = np.minimum(self.count[ids] + 1, h)
+        avg = self._window_mean(ids, count)
+
+        states = classify(avg, me.THRESHOLDS)
+        near = np.zeros(len(ids), dtype=bool)
+        for th in me.THRESHOLDS:
+            near |= np.abs(avg - th) < 1e-9
+        for i in np.flatnonzero(near):
+            states[i] = STATES.index(self._exact_state(ids[i]))
+        return BatchResult(raw, states, states == STRESSED, _STRENGTH_OF[states])
+
+    def _window_mean(self, ids, count):
+        # oldest -> newest, one column at a time: the same additions sum(deque) does
+        h = self.history_size
+        oldest = (self.head[ids] - count) % h
+        total = np.zeros(len(ids))
+        for k in range(h):
+            col = self.window[ids, (oldest + k) % h]
+            np.add(total, col, out=total, where=k < count)
+        return total / count
+
+    def scores(self, session) -> list:
+        """Session's window, oldest first (what MoodEngine.scores would hold)."""
+        h, n = self.history_size, int(self.count[session])
+        start = int(self.head[session]) - n
+        return [float(self.window[session, (start + k) % h]) for k in range(n)]
+
+    def _exact_state(self, session) -> str:
+        me = self._scalar
+        me.restore_scores(self.scores(session), self.history_size)
+        return me.mood_state()
+
+    def reset(self, ids):
+        """Start sessions over (a new player in the slot)."""
+        self.head[ids] = 0
+        self.count[ids] = 0
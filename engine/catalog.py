@@ -0,0 +1,282 @@
+"""
+Compiled room catalog for data/rooms.json.
+
+The JSON catalog is validated and every room compiled (compile_room) once;
+the result is cached next to it in .cache/, keyed by the catalog's mtime
+and size. The cache is an offset index followed by one JSON record per
+room (plain data: loading a cache never runs code), so opening it reads
+only the header, and a session decodes a room the first time it reaches
+it:
+
+    catalog = load_catalog("data/rooms.json")
+    len(catalog)        # no room loaded yet
+    catalog[0]          # ConfigRoom, loaded from the cache on first use
+
+A changed catalog is recompiled on the next load; an invalid one raises
+CatalogError and leaves the old cache alone. A damaged cache is rebuilt
+from the JSON, also when a damaged record only shows up on first use. If
+the cache cannot be written (read-only data/), the compiled rooms are
+served from memory and the write error goes to on_error.
+
+CatalogWatcher polls the catalog's mtime for long-running hosts: each new
+session takes current(), in-flight sessions keep the RoomList they started
+with (a replaced cache file stays mapped until they drop it).
+"""
+import importlib, json, mmap, os, struct, time
+from collections.abc import Sequence
+from engine.config_room import ConfigRoom, compile_room, validate_room
+
+MAGIC = b"MMRC"
+VERSION = 3
+HEADER = struct.Struct("<4sHIqq")     # magic, version, rooms, source mtime_ns, source size
+OFFSET = struct.Struct("<Q")
+
+class CatalogError(ValueError):
+    """rooms.json is not a valid room catalog."""
+
+def cache_path(source):
+    head, name = os.path.split(source)
+    return os.path.join(head, ".cache", name + ".rooms")
+
+def compile_catalog(source) -> list:
+    """Read, validate and compile a JSON catalog. Returns the compiled rooms in order."""
+    with open(source, "r", encoding="utf-8") as f:
+        try:
+            cfg = json.load(f)
+        except json.JSONDecodeError as e:
+            raise CatalogError(f"{source}: {e}") from None
+    rooms = cfg.get("rooms", []) if isinstance(cfg, dict) else None
+    if not isinstance(rooms, list):
+        raise CatalogError(f"{source}: 'rooms' must be a list")
+    problems, ids = [], set()
+    for i, rcfg in enumerate(rooms):
+        for p in validate_room(rcfg):
+            problems.append(f"room {i}: {p}")
+        rid = rcfg.get("id", "config") if isinstance(rcfg, dict) else None
+        if rid in ids:
+            problems.append(f"room {i}: duplicate id {rid!r}")
+        ids.add(rid)
+    if problems:
+        raise CatalogError(f"{source}: " + "; ".join(problems[:5]) + (" ..." if len(problems) > 5 else ""))
+    return [compile_room(r) for r in rooms]
+
+def encode_room(compiled) -> bytes:
+    """A compiled room as a JSON record (tuples and frozensets become lists)."""
+    d = dict(compiled, normalize=list(compiled["normalize"]), answers=sorted(compiled["answers"]))
+    return json.dumps(d, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def decode_room(record) -> dict:
+    """The compiled room encode_room() wrote."""
+    d = json.loads(record)
+    if not isinstance(d, dict):
+        raise ValueError("not a room record")
+    d["normalize"] = tuple(d["normalize"])
+    d["answers"] = frozenset(d["answers"])
+    return d
+
+def write_cache(compiled, path, mtime_ns, size):
+    records = [encode_room(c) for c in compiled]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(records), mtime_ns, size))
+        pos = HEADER.size + OFFSET.size * (len(records) + 1)
+        for r in records:
+            f.write(OFFSET.pack(pos))
+            pos += len(r)
+        f.write(OFFSET.pack(pos))
+        for r in records:
+            f.write(r)
+    os.replace(tmp, path)
+
+class Catalog(Sequence):
+    """
+    Read-only, lazily loaded compiled rooms backed by a cache file. With the
+    JSON `source`, a record that turns out damaged is recompiled from it.
+    """
+    def __init__(self, path, mtime_ns=None, size=None, source=None):
+        self.path = path
+        self.source = source
+        with open(path, "rb") as f:
+            head = f.read(HEADER.size)
+            if len(head) < HEADER.size:
+                raise CatalogError(f"{path}: truncated cache")
+            magic, version, self.n, self.mtime_ns, self.size = HEADER.unpack(head)
+            if magic != MAGIC or version != VERSION:
+                raise CatalogError(f"{path}: not a room cache (version {version})")
+            if mtime_ns is not None and (mtime_ns, size) != (self.mtime_ns, self.size):
+                raise CatalogError(f"{path}: stale")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.n else b""
+        end = HEADER.size + OFFSET.size * self.n
+        if self.n and (len(self._map) < end + OFFSET.size or OFFSET.unpack_from(self._map, end)[0] != len(self._map)):
+            raise CatalogError(f"{path}: truncated cache")
+        self._rooms = {}
+        self._fresh = None              # recompiled rooms, once a damaged record was found
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.n))]
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError("room index out of range")
+        room = self._rooms.get(i)
+        if room is None:
+            at = HEADER.size + OFFSET.size * i
+            start, = OFFSET.unpack_from(self._map, at)
+            end, = OFFSET.unpack_from(self._map, at + OFFSET.size)
+            try:
+                compiled = decode_room(self._map[start:end])
+            except (ValueError, KeyError, TypeError):
+                compiled = self._recompile()[i]
+            room = self._rooms[i] = ConfigRoom.from_compiled(compiled)
+        return room
+
+    def _recompile(self) -> list:
+        # the cache is damaged: compile the JSON it was made from and write a fresh one
+        if self._fresh is not None:
+            return self._fresh
+        if self.source is None:
+            raise CatalogError(f"{self.path}: damaged cache")
+        st = os.stat(self.source)
+        if (st.st_mtime_ns, st.st_size) != (self.mtime_ns, self.size):
+            raise CatalogError(f"{self.path}: damaged cache, and {self.source} has changed since")
+        self._fresh = compile_catalog(self.source)
+        try:
+            write_cache(self._fresh, self.path, self.mtime_ns, self.size)
+        except OSError:
+            pass                # the recompiled rooms serve this catalog; the next load tries again
+        return self._fresh
+
+    @property
+    def loaded(self) -> int:
+        return len(self._rooms)
+
+class CompiledCatalog(Sequence):
+    """Compiled rooms held in memory, for when the cache file cannot be written."""
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self._rooms = {}
+
+    def __len__(self):
+        return len(self.compiled)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("room index out of range")
+        room = self._rooms.get(i)
+        if room is None:
+            room = self._rooms[i] = ConfigRoom.from_compiled(self.compiled[i])
+        return room
+
+    @property
+    def loaded(self) -> int:
+        return len(self._rooms)
+
+def load_catalog(source=os.path.join("data", "rooms.json"), on_error=print):
+    """
+    The compiled catalog for `source`, recompiling its cache if the JSON
+    changed. A Catalog, or a CompiledCatalog if the cache cannot be written.
+    """
+    st = os.stat(source)
+    path = cache_path(source)
+    try:
+        return Catalog(path, st.st_mtime_ns, st.st_size, source)
+    except (OSError, CatalogError):
+        pass                    # missing, stale or damaged
+    compiled = compile_catalog(source)
+    try:
+        write_cache(compiled, path, st.st_mtime_ns, st.st_size)
+    except OSError as e:
+        on_error(f"(Room cache not written, config rooms kept in memory: {e})")
+        return CompiledCatalog(compiled)
+    return Catalog(path, st.st_mtime_ns, st.st_size, source)
+
+def resolve_room(entry):
+    """A room, or the ROOM of the module named by `entry` (imported on first use)."""
+    return importlib.import_module(entry).ROOM if isinstance(entry, str) else entry
+
+class RoomList(Sequence):
+    """
+    Fixed rooms followed by a catalog, without loading the catalog's rooms.
+    Fixed rooms may be given as module names ("room1"); each module is
+    imported when a session first reaches its room.
+    """
+    def __init__(self, head, catalog=()):
+        self.head = list(head)
+        self.catalog = catalog
+
+    def __len__(self):
+        return len(self.head) + len(self.catalog)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        n = len(self.head)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < n:
+            return self.catalog[i - n]
+        room = self.head[i]
+        if isinstance(room, str):
+            room = self.head[i] = resolve_room(room)
+        return room
+
+class CatalogWatcher:
+    """
+    Hot reload by mtime polling. current() stats the catalog at most every
+    `interval` seconds and recompiles it when it changed. A broken catalog
+    is reported once and the previous version stays in use.
+    """
+    def __init__(self, source, head=(), interval: float = 1.0, on_error=print, on_reload=print):
+        self.source = source
+        self.head = list(head)
+        self.interval = interval
+        self.on_error = on_error
+        self.on_reload = on_reload
+        self.version = 0
+        self.reload_ms = 0.0
+        self._rooms = RoomList(self.head)
+        self._key = None
+        self._bad = None
+        self._next_check = 0.0
+        self.poll(force=True)
+
+    def current(self) -> RoomList:
+        if time.monotonic() >= self._next_check:
+            self.poll()
+        return self._rooms
+
+    def poll(self, force: bool = False) -> bool:
+        """Reload if the catalog changed. Returns True if a new version is in use."""
+        self._next_check = time.monotonic() + self.interval
+        try:
+            st = os.stat(self.source)
+            key = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            key = None
+        if not force and key == self._key:
+            return False
+        if key is not None and key == self._bad:
+            return False
+        t0 = time.perf_counter()
+        try:
+            catalog = load_catalog(self.source, self.on_error) if key is not None else ()
+        except Exception as e:
+            self._bad = key
+            self.on_error(f"(Room catalog not reloaded, keeping version {self.version}: {e})")
+            return False
+        self._key, self._bad = key, None
+        self._rooms = RoomList(self.head, catalog)
+        self.version += 1
+        self.reload_ms = (time.perf_counter() - t0) * 1e3
+        if not force:
+            self.on_reload(f"(Room catalog v{self.version}: {len(catalog)} config rooms in {self.reload_ms:.1f} ms)")
+        return True
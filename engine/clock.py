@@ -0,0 +1,82 @@
+"""
+Clocks and the output scheduler.
+
+Rooms read time only through a clock and never sleep themselves; the
+scheduler shows their outputs and waits out each pause on the same clock.
+
+- Clock:        real time, pauses really wait (the terminal game)
+- InstantClock: real time for answers, pauses are skipped
+- SimClock:     virtual time; pauses and player think time just move a counter
+"""
+import time
+
+class Clock:
+    mode = "real"
+
+    def now(self) -> float:
+        return time.time()
+
+    def after(self, seconds: float) -> float:
+        """When a pause of `seconds` started now will be over."""
+        return self.now() + seconds
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+    async def wait(self, seconds: float):
+        import asyncio      # only servers wait asynchronously; keeps the terminal game's startup light
+        await asyncio.sleep(seconds)
+
+class InstantClock(Clock):
+    mode = "instant"
+
+    def after(self, seconds: float) -> float:
+        return self.now()
+
+    def sleep(self, seconds: float):
+        pass
+
+    async def wait(self, seconds: float):
+        pass
+
+class SimClock(Clock):
+    mode = "sim"
+
+    def __init__(self, start: float = 0.0):
+        self.t = start
+
+    def now(self) -> float:
+        return self.t
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            self.t += seconds
+
+    # a simulated player "thinking" is just time passing
+    advance = sleep
+
+    async def wait(self, seconds: float):
+        self.sleep(seconds)
+
+REAL = Clock()
+
+def make_clock(mode: str = "real") -> Clock:
+    if mode == "real":
+        return REAL
+    if mode == "instant":
+        return InstantClock()
+    if mode == "sim":
+        return SimClock()
+    raise ValueError(f"unknown clock mode: {mode!r}")
+
+class Scheduler:
+    """Shows (text, pause) outputs on a console and waits each pause on the clock."""
+    def __init__(self, console, clock: Clock = REAL):
+        self.console = console
+        self.clock = clock
+
+    def deliver(self, outputs):
+        for text, pause in outputs:
+            self.console.say(text)
+            if pause:
+                self.clock.sleep(pause)
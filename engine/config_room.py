@@ -1,73 +1,128 @@
 # engine/config_room.py
-import time
+from engine.answers import AnswerMatcher, DEFAULT_STEPS, NORMALIZERS
+from engine.room_base import Room, Output
 
-def run_config_room(room_cfg, mood_engine=None, telemetry=None, inventory=None):
-    print(f"\n[ {room_cfg.get('title', 'Room (Config)')} ]")
-    print(room_cfg.get("intro", ""))
+TEXT_FIELDS = ("id", "title", "intro", "prompt", "success_text", "fail_text")
+HINT_PREFIX = {"strong": "HINT (strong): ", "soft": "HINT (soft): ", "normal": "HINT: "}
+HINT_DEFAULT = {
+    "strong": "Look closely at the riddle.",
+    "soft": "Focus on a daylight companion.",
+    "normal": "Think about light and the sun.",
+}
 
-    correct_set = {a.strip().lower() for a in room_cfg.get("answers", [])}
-    wrong_attempts = 0
-    started = time.time()
+def validate_room(room_cfg) -> list:
+    """Problems with one rooms.json entry (empty list = fine)."""
+    if not isinstance(room_cfg, dict):
+        return ["not an object"]
+    problems = []
+    for key in TEXT_FIELDS:
+        if key in room_cfg and not isinstance(room_cfg[key], str):
+            problems.append(f"'{key}' must be a string")
+    answers = room_cfg.get("answers")
+    if not isinstance(answers, list) or not answers or not all(isinstance(a, str) for a in answers):
+        problems.append("'answers' must be a non-empty list of strings")
+    hints = room_cfg.get("hints", {})
+    if not isinstance(hints, dict) or not all(isinstance(h, str) for h in hints.values()):
+        problems.append("'hints' must map strengths to strings")
+    wrong = room_cfg.get("wrong_answers", {})
+    if not isinstance(wrong, dict) or not all(isinstance(v, str) for v in wrong.values()):
+        problems.append("'wrong_answers' must map answers to guidance strings")
+    steps = room_cfg.get("normalize", list(DEFAULT_STEPS))
+    if not isinstance(steps, list) or not all(s in NORMALIZERS for s in steps):
+        problems.append(f"'normalize' must be a list of steps from: {', '.join(NORMALIZERS)}")
+    return problems
 
-    def give_hint(strength: str):
-        h = room_cfg.get("hints", {})
-        if strength == "strong":
-            print("HINT (strong): " + h.get("strong", "Look closely at the riddle."))
-        elif strength == "soft":
-            print("HINT (soft): " + h.get("soft", "Focus on a daylight companion."))
-        else:
-            print("HINT: " + h.get("normal", "Think about light and the sun."))
+def compile_room(room_cfg) -> dict:
+    """
+    Everything a ConfigRoom needs, resolved once: display strings with their
+    defaults, the normalized answer sets and the full hint line per strength.
+    Plain data, so compiled rooms can be cached on disk.
+    """
+    h = room_cfg.get("hints", {})
+    steps = tuple(room_cfg.get("normalize", DEFAULT_STEPS))
+    normalize = AnswerMatcher((), steps, near=False).normalize
+    return {
+        "id": room_cfg.get("id", "config"),
+        "title": f"\n[ {room_cfg.get('title', 'Room (Config)')} ]",
+        "intro": room_cfg.get("intro", ""),
+        "prompt": "\n" + room_cfg.get("prompt", "Your answer: "),
+        "normalize": steps,
+        "answers": frozenset(normalize(a) for a in room_cfg.get("answers", [])),
+        "wrong_answers": {normalize(a): line for a, line in room_cfg.get("wrong_answers", {}).items()},
+        "hints": {s: HINT_PREFIX[s] + h.get(s, HINT_DEFAULT[s]) for s in HINT_PREFIX},
+        "success_text": room_cfg.get("success_text", "You solved it!"),
+        "fail_text": room_cfg.get("fail_text", "Not it."),
+    }
+
+class ConfigRoom(Room):
+    """A room defined by one entry of data/rooms.json."""
+    def __init__(self, room_cfg=None, compiled=None):
+        c = compiled if compiled is not None else compile_room(room_cfg)
+        self.cfg = room_cfg
+        self.compiled = c
+        self.id = c["id"]
+        self.matcher = AnswerMatcher(c["answers"], c["normalize"], c["wrong_answers"])
+        self.hints = c["hints"]
+
+    @classmethod
+    def from_compiled(cls, compiled):
+        return cls(compiled=compiled)
+
+    def start(self, state):
+        out = Output()
+        out.say(self.compiled["title"])
+        out.say(self.compiled["intro"])
+        state.prompt = self.compiled["prompt"]
+        state.started = state.clock.now()
+        return state, out
 
-    while True:
-        raw = input("\n" + room_cfg.get("prompt", "Your answer: "))
-        user_input = raw.strip().lower().strip("'\"")
+    def give_hint(self, out, strength: str):
+        out.say(self.hints.get(strength, self.hints["normal"]))
+
+    def step(self, state, text):
+        out = Output()
+        m = self.matcher.match(text)
+        user_input = m.normalized
 
         if user_input == "hint":
-            if telemetry:
-                telemetry.log(room=room_cfg.get("id", "config"), event="hint")
-            if mood_engine:
-                _, strength = mood_engine.hint_policy()
-                give_hint(strength)
+            self.log(state, "hint")
+            if state.mood_engine:
+                _, strength = state.mood_engine.hint_policy()
+                self.give_hint(out, strength)
             else:
-                give_hint("normal")
-            continue
-
-        is_correct = user_input in correct_set
+                self.give_hint(out, "normal")
+            return state, out, False
 
-        # mood observe
-        if mood_engine:
-            elapsed = time.time() - started
-            score = mood_engine.observe(
-                text=user_input,
-                seconds=elapsed,
-                correct=is_correct,
-                wrong_attempts=wrong_attempts
-            )
-            if telemetry:
-                telemetry.log(room=room_cfg.get("id", "config"), event="mood_tick",
-                              mood_score=score, mood_state=mood_engine.mood_state())
+        is_correct = m.correct
 
-        # answer log
-        if telemetry:
-            telemetry.log(room=room_cfg.get("id", "config"),
-                          event="answer", input=user_input, correct=is_correct)
+        # mood observe, then answer log
+        self.observe(state, user_input, is_correct, m.near is not None)
+        self.log_answer(state, m)
 
         if is_correct:
-            print(room_cfg.get("success_text", "You solved it!"))
-            return True
+            out.say(self.compiled["success_text"])
+            state.escaped = True
+            return state, out, True
 
-        wrong_attempts += 1
-        print(room_cfg.get("fail_text", "Not it."))
+        state.wrong_attempts += 1
+        out.say(self.compiled["fail_text"])
+        if self.guide_miss(out, m, self.compiled["wrong_answers"]):
+            return state, out, False
 
         # mood-based guidance
-        if mood_engine:
-            state = mood_engine.mood_state()
-            if state == "stressed":
-                print("Breathe. Type 'hint' for a stronger clue.")
-            elif state == "focused":
-                print("Stay methodical. You can type 'hint'.")
-            elif state in ("calm", "excited"):
-                print("You're close—think daylight companion.")
+        if state.mood_engine:
+            mood = state.mood_engine.mood_state()
+            if mood == "stressed":
+                out.say("Breathe. Type 'hint' for a stronger clue.")
+            elif mood == "focused":
+                out.say("Stay methodical. You can type 'hint'.")
+            elif mood in ("calm", "excited"):
+                out.say("You're close—think daylight companion.")
         else:
-            if wrong_attempts == 1:
-                print("Tip: Type 'hint' for help.")
+            if state.wrong_attempts == 1:
+                out.say("Tip: Type 'hint' for help.")
+        return state, out, False
+
+def run_config_room(room_cfg, mood_engine=None, telemetry=None, inventory=None, console=None):
+    room = ConfigRoom(room_cfg)
+    return room.enter(room.new_state(mood_engine, telemetry, inventory), console)
@@ -0,0 +1,8 @@
+"""Terminal I/O used by the room drivers. Swap it out to play somewhere other than a local terminal."""
+
+class Console:
+    def say(self, text: str = ""):
+        print(text)
+
+    def ask(self, prompt: str) -> str:
+        return input(prompt)
@@ -0,0 +1,129 @@
+"""
+Columnar event store for Telemetry (opt-in):
+
+    telemetry = Telemetry(sink=ColumnarStore())
+
+Timestamps (monotonic ns) sit in an int64 array, mood scores in a float64
+array (NaN when absent) and `correct` in an int8 array (-1 when absent).
+room, event, mood_state and input are stored as integer codes into
+per-store string tables, so "room1" or "mood_tick" exist once no matter how
+often they are logged. Rare fields (item, next_room, items, at, ...) go to a side table
+keyed by row number. save()/load() use a compact binary file.
+"""
+import json, struct, sys
+from array import array
+from engine.telemetry import EPOCH_OFFSET_NS, format_ts
+
+MAGIC = b"MMEV"
+VERSION = 2     # 2: ts are monotonic ns + stored wall-clock offset
+NAN = float("nan")
+
+# dictionary-encoded columns and the array type holding their codes
+DICT_COLUMNS = (("room", "H"), ("event", "H"), ("mood_state", "H"), ("input", "I"))
+
+class Interner:
+    """String table: value <-> small integer code. Code 0 means 'absent'."""
+    __slots__ = ("values", "codes")
+
+    def __init__(self, values=()):
+        self.values = [None]
+        self.values.extend(values)
+        self.codes = {v: i for i, v in enumerate(self.values) if i}
+
+    def code(self, value) -> int:
+        if value is None:
+            return 0
+        c = self.codes.get(value)
+        if c is None:
+            c = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return c
+
+class ColumnarStore:
+    def __init__(self):
+        self.ts = array("q")
+        self.mood_score = array("d")
+        self.correct = array("b")
+        self.codes = {name: array(tc) for name, tc in DICT_COLUMNS}
+        self.tables = {name: Interner() for name, _ in DICT_COLUMNS}
+        self.side = {}
+        self.offset_ns = EPOCH_OFFSET_NS    # monotonic -> wall clock for these stamps
+
+    def __len__(self):
+        return len(self.ts)
+
+    def write(self, ts: int, fields: dict):
+        n = len(self.ts)
+        self.ts.append(ts)
+        for name, _ in DICT_COLUMNS:
+            self.codes[name].append(self.tables[name].code(fields.pop(name, None)))
+        score = fields.pop("mood_score", None)
+        self.mood_score.append(NAN if score is None else score)
+        correct = fields.pop("correct", None)
+        self.correct.append(-1 if correct is None else int(bool(correct)))
+        if fields:
+            self.side[n] = fields
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def rows(self):
+        """Yield events as dicts, like Telemetry.events."""
+        cols = [(name, self.codes[name], self.tables[name].values) for name, _ in DICT_COLUMNS]
+        for i, ts in enumerate(self.ts):
+            rec = {"ts": format_ts(ts, self.offset_ns)}
+            for name, codes, values in cols:
+                c = codes[i]
+                if c:
+                    rec[name] = values[c]
+            score = self.mood_score[i]
+            if score == score:
+                rec["mood_score"] = score
+            if self.correct[i] >= 0:
+                rec["correct"] = bool(self.correct[i])
+            extra = self.side.get(i)
+            if extra:
+                rec.update(extra)
+            yield rec
+
+    # ---- binary file: header, JSON string tables + side table, raw little-endian arrays
+
+    def _arrays(self):
+        return [self.ts, self.mood_score, self.correct] + [self.codes[name] for name, _ in DICT_COLUMNS]
+
+    def save(self, path):
+        meta = json.dumps({
+            "tables": {name: self.tables[name].values[1:] for name, _ in DICT_COLUMNS},
+            "side": {str(i): f for i, f in self.side.items()},
+            "offset_ns": self.offset_ns,
+        }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(struct.pack("<4sHII", MAGIC, VERSION, len(self.ts), len(meta)))
+            f.write(meta)
+            for arr in self._arrays():
+                if sys.byteorder == "big":
+                    arr = array(arr.typecode, arr)
+                    arr.byteswap()
+                f.write(arr.tobytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            magic, version, n, meta_len = struct.unpack("<4sHII", f.read(struct.calcsize("<4sHII")))
+            if magic != MAGIC:
+                raise ValueError(f"{path}: not a MindMaze event store")
+            if version != VERSION:
+                raise ValueError(f"{path}: unsupported event store version {version}")
+            meta = json.loads(f.read(meta_len).decode("utf-8"))
+            store = cls()
+            for arr in store._arrays():
+                arr.frombytes(f.read(n * arr.itemsize))
+                if sys.byteorder == "big":
+                    arr.byteswap()
+        store.tables = {name: Interner(meta["tables"][name]) for name, _ in DICT_COLUMNS}
+        store.side = {int(i): fields for i, fields in meta["side"].items()}
+        store.offset_ns = meta["offset_ns"]
+        return store
@@ -0,0 +1,265 @@
+"""
+The whole maze as one resumable state machine: resume prompt, rooms in
+order, autosave after each room and the exports at the end. Same
+start/step shape as a Room, so the same drivers run it.
+
+With a save store every answer also checkpoints a full session snapshot
+(engine.snapshot), so a resume continues mid-room with the same mood
+history, wrong attempts, answer clock and timeline.
+"""
+from time import perf_counter_ns
+from engine import snapshot
+from engine.metrics import METRICS, timed
+from engine.trace import TRACER
+from engine import trace
+from engine.persistence import JsonSaveStore
+from engine.clock import REAL
+from engine.room_base import Output
+
+class GameState:
+    def __init__(self, mood_engine, inventory, telemetry, pace: float = 1.0, clock=None):
+        self.mood_engine = mood_engine
+        self.inventory = inventory
+        self.telemetry = telemetry
+        self.pace = pace
+        self.clock = clock or REAL
+        self.phase = "start"        # "resume" -> "room" -> "done"
+        self.room_idx = 0
+        self.room_state = None
+        self.prompt = ""
+        self.escaped = False
+        self.saved = None           # a save to offer; None = read it from the save store
+        self.player = "local"       # save store key: (player, slot)
+        self.slot = "slot1"
+        self.prompted_at = None     # clock time the prompt was shown (metrics: think time)
+        self.track = -1             # trace track; -1 = not traced
+        self.trace_session = -1     # open span slots
+        self.trace_room = -1
+        self.trace_prompt = 0       # perf_counter_ns the current prompt wait began
+
+class Game:
+    def __init__(self, rooms, save_path="saves/slot1.json",
+                 csv_path="reports/session_timeline.csv",
+                 plot_path="reports/mood_timeline.png", plots=None, saves=None):
+        """
+        Pass save_path/csv_path/plot_path=None to skip resuming/autosaving or
+        that export. `saves` (a save store, see engine.persistence) replaces
+        the single JSON file at save_path. With a PlotQueue in `plots` the
+        mood plot is rendered in the background from the exported CSV instead
+        of on the exit path.
+        """
+        self.rooms = rooms
+        self.save_path = save_path
+        self.saves = saves if saves is not None else (JsonSaveStore(save_path) if save_path else None)
+        self.csv_path = csv_path
+        self.plot_path = plot_path
+        self.plots = plots
+
+    def new_state(self, mood_engine, inventory, telemetry, pace: float = 1.0, clock=None) -> GameState:
+        if METRICS.enabled:
+            # timed per instance, so sessions without metrics run the plain methods
+            if mood_engine is not None:
+                mood_engine.observe = METRICS.wrap("mood.observe", mood_engine.observe)
+            telemetry.log = METRICS.wrap("telemetry.log", telemetry.log)
+        state = GameState(mood_engine, inventory, telemetry, pace, clock)
+        if mood_engine is not None:
+            mood_engine.use_clock(state.clock)
+        if TRACER.enabled:
+            state.track = TRACER.new_track(f"session {len(TRACER.tracks) + 1}")
+            if mood_engine is not None:
+                mood_engine.observe = TRACER.wrap(state.track, trace.MOOD_OBSERVE, mood_engine.observe)
+        return state
+
+    def start(self, state):
+        out = Output()
+        if state.track >= 0:
+            state.trace_session = TRACER.begin(state.track, trace.SESSION)
+        if self.saves is not None and state.telemetry.journal is None and not state.telemetry.streaming:
+            state.telemetry.journal = []
+        state.telemetry.log(room="meta", event="game_start")
+        if state.saved is None:
+            state.saved = self.saves.load(state.player, state.slot) if self.saves is not None else {}
+        if state.saved.get("next_room") is not None:
+            state.phase = "resume"
+            state.prompt = "Found a save. Continue? (y/n): "
+            if METRICS.enabled:
+                state.prompted_at = state.clock.now()
+            state.trace_prompt = perf_counter_ns()
+            state.telemetry.flush()
+            return state, out
+        self._enter(state, 0, out)
+        if METRICS.enabled:
+            state.prompted_at = state.clock.now() + out.pending()
+        state.trace_prompt = perf_counter_ns()
+        state.telemetry.flush()
+        return state, out
+
+    def step(self, state, text: str):
+        if state.track >= 0:
+            # the wait ends as the answer arrives; the answer span itself is recorded in _step
+            TRACER.span(state.track, trace.PROMPT, state.trace_prompt)
+        elif not METRICS.enabled:
+            return self._step(state, text)
+        if not METRICS.enabled:
+            state, out, done = self._step(state, text)
+            state.trace_prompt = perf_counter_ns()
+            return state, out, done
+        # per room: think time since the prompt appeared, and the time spent handling the answer
+        room_id = self.rooms[state.room_idx].id if state.phase == "room" else None
+        think = state.clock.now() - state.prompted_at if state.prompted_at is not None else None
+        t0 = perf_counter_ns()
+        state, out, done = self._step(state, text)
+        if room_id is not None:
+            METRICS.room_step(room_id, think, perf_counter_ns() - t0)
+        state.prompted_at = state.clock.now() + out.pending()
+        state.trace_prompt = perf_counter_ns()
+        return state, out, done
+
+    def _step(self, state, text: str):
+        out = Output()
+        if state.phase == "resume":
+            self._resume(state, text, out)
+            state.telemetry.flush()
+            return state, out, state.phase == "done"
+
+        room = self.rooms[state.room_idx]
+        t0 = perf_counter_ns()
+        state.room_state, outputs, room_done = room.step(state.room_state, text)
+        if state.track >= 0:
+            TRACER.span(state.track, trace.ANSWER, t0)
+            if room_done:
+                TRACER.end_span(state.trace_room)
+        out.extend(outputs)
+        state.prompt = state.room_state.prompt
+        if room_done:
+            if not state.room_state.escaped:
+                state.telemetry.log(room="meta", event="game_over", at=f"room{state.room_idx+1}")
+                self._export(state, out)
+                out.say("Game Over.")
+                state.phase = "done"
+                TRACER.end_span(state.trace_session)
+            else:
+                self._autosave(state, state.room_idx + 1)
+                self._enter(state, state.room_idx + 1, out)
+        else:
+            self._checkpoint(state)
+        # the player may think for minutes now: nothing of this answer waits in a buffer
+        state.telemetry.flush()
+        return state, out, state.phase == "done"
+
+    def _resume(self, state, text, out):
+        start_idx = 0
+        t0 = perf_counter_ns()
+        snap = state.saved.get("snapshot")
+        if text.strip().lower().startswith("y") and snapshot.usable(snap) and snap["room"] < len(self.rooms):
+            self._restore(state, snap, out, t0)
+            return
+        if text.strip().lower().startswith("y"):
+            try:
+                start_idx = int(state.saved.get("next_room", 0))
+            except Exception:
+                start_idx = 0
+            inventory = state.inventory
+            for item in state.saved.get("inventory", []):
+                inventory.add(item)
+            out.say(f"Loaded save. Resuming at Room {start_idx+1} with items: {', '.join(inventory.list()) or 'none'}")
+            state.telemetry.log(room="meta", event="load", next_room=start_idx+1, items=";".join(inventory.list()))
+        if state.track >= 0:
+            TRACER.span(state.track, trace.RESUME, t0)
+        self._enter(state, start_idx, out)
+
+    def _restore(self, state, snap, out, t0):
+        snapshot.restore(state, snap)
+        idx = snap["room"]
+        items = ", ".join(state.inventory.list()) or "none"
+        state.telemetry.log(room="meta", event="restore", next_room=idx+1, items=";".join(state.inventory.list()))
+        if state.track >= 0:
+            TRACER.span(state.track, trace.RESUME, t0)
+        if snap["entry"]:
+            out.say(f"Loaded save. Resuming at Room {idx+1} with items: {items}")
+            self._enter(state, idx, out)
+            return
+        out.say(f"Loaded save. Resuming in Room {idx+1} where you left off, with items: {items}")
+        state.room_idx = idx
+        if state.track >= 0:
+            state.trace_room = TRACER.begin(state.track, TRACER.name(self.rooms[idx].id))
+        state.room_state = snapshot.resume_room(self.rooms[idx], state, snap)
+        state.prompt = state.room_state.prompt
+        state.phase = "room"
+
+    def _enter(self, state, idx, out):
+        state.room_idx = idx
+        if idx >= len(self.rooms):
+            # escaped!
+            state.telemetry.log(room="meta", event="escaped")
+            self._export(state, out)
+            out.say("Congratulations! You've escaped MindMaze!")
+            state.escaped = True
+            state.phase = "done"
+            TRACER.end_span(state.trace_session)
+            return
+        room = self.rooms[idx]
+        if state.track >= 0:
+            state.trace_room = TRACER.begin(state.track, TRACER.name(room.id))
+        rs = room.new_state(state.mood_engine, state.telemetry, state.inventory, state.pace, state.clock)
+        state.room_state, outputs = room.start(rs)
+        out.extend(outputs)
+        state.prompt = rs.prompt
+        state.phase = "room"
+
+    def _autosave(self, state, next_room):
+        # autosave progress to next room
+        if self.saves is None:
+            return
+        if METRICS.enabled:
+            METRICS.count("autosave")
+        t0 = perf_counter_ns()
+        inventory = state.inventory
+        state.telemetry.log(room="meta", event="autosave", next_room=next_room, items=";".join(inventory.list()))
+        self.saves.save(state.player, state.slot, {
+            "next_room": next_room, "inventory": inventory.list(),
+            "snapshot": snapshot.take(state, entry=True, room_idx=next_room),
+        })
+        if state.track >= 0:
+            TRACER.span(state.track, trace.AUTOSAVE, t0)
+
+    def _checkpoint(self, state):
+        # mid-room: "next_room" is the current room, for readers that ignore the snapshot
+        if self.saves is None:
+            return
+        if METRICS.enabled:
+            METRICS.count("checkpoint")
+        t0 = perf_counter_ns()
+        snap = snapshot.take(state)
+        self.saves.save(state.player, state.slot, {"next_room": state.room_idx, "inventory": snap["items"], "snapshot": snap})
+        if state.track >= 0:
+            TRACER.span(state.track, trace.CHECKPOINT, t0)
+
+    def _export(self, state, out):
+        traced = state.track >= 0
+        t0 = perf_counter_ns()
+        if self.csv_path:
+            t1 = perf_counter_ns()
+            self._export_csv(state)
+            if traced:
+                TRACER.span(state.track, trace.EXPORT_CSV, t1)
+            out.say(f"Saved: {self.csv_path}")
+        if self.plot_path:
+            t1 = perf_counter_ns()
+            out.say(self._export_plot(state))
+            if traced:
+                TRACER.span(state.track, trace.EXPORT_PLOT, t1)
+        if traced:
+            TRACER.span(state.track, trace.EXPORT, t0)
+
+    @timed("export.csv")
+    def _export_csv(self, state):
+        state.telemetry.export_csv(self.csv_path)
+
+    @timed("export.plot")
+    def _export_plot(self, state) -> str:
+        if self.plots is not None and self.csv_path:
+            self.plots.submit(self.csv_path, self.plot_path)
+            return f"Rendering in background: {self.plot_path}"
+        state.telemetry.export_mood_plot(self.plot_path)
+        return f"Saved: {self.plot_path}"
@@ -0,0 +1,122 @@
+"""
+Fixed-memory latency histograms (HDR-style log-linear buckets).
+
+Values are counted in integer `unit`s. The first 2**sub_bits units get one
+bucket each; above that every power of two is split into 2**(sub_bits-1)
+buckets, so any recorded value is reported within 1 / 2**(sub_bits-1) of
+itself (under 2% with the default 7 bits) while the whole range up to
+`highest` costs a few hundred counters. Histograms with the same layout
+merge by adding counts, which is how worker processes and incremental
+runs combine theirs.
+
+    h = Histogram(unit=0.001, highest=3600.0)   # 1 ms .. 1 h
+    h.record(12.5)
+    h.percentile(95), h.summary()
+"""
+from array import array
+import math
+
+class Histogram:
+    __slots__ = ("unit", "highest", "sub_bits", "counts", "count", "total", "min", "max", "_sub", "_last")
+
+    def __init__(self, unit: float = 0.001, highest: float = 3600.0, sub_bits: int = 7):
+        self.unit = unit
+        self.highest = highest
+        self.sub_bits = sub_bits
+        self.counts = array("Q", bytes(8 * (self._index(int(highest / unit)) + 1)))
+        self._sub = 1 << sub_bits
+        self._last = len(self.counts) - 1
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _index(self, n: int) -> int:
+        sub = 1 << self.sub_bits
+        if n < sub:
+            return n
+        shift = n.bit_length() - self.sub_bits
+        return sub + (shift - 1) * (sub >> 1) + (n >> shift) - (sub >> 1)
+
+    def _bounds(self, idx: int):
+        """[low, high) of bucket `idx`, in units."""
+        sub = 1 << self.sub_bits
+        if idx < sub:
+            return idx, idx + 1
+        k = idx - sub
+        shift = k // (sub >> 1) + 1
+        low = (k % (sub >> 1) + (sub >> 1)) << shift
+        return low, low + (1 << shift)
+
+    def record(self, value: float):
+        """Count one value (negative values count as 0, values over `highest` in the last bucket)."""
+        if value < 0.0:
+            value = 0.0
+        # _index() inlined: this runs on instrumented hot paths
+        n = int(value / self.unit)
+        sub = self._sub
+        if n >= sub:
+            shift = n.bit_length() - self.sub_bits
+            n = sub + (shift - 1) * (sub >> 1) + (n >> shift) - (sub >> 1)
+            if n > self._last:
+                n = self._last
+        self.counts[n] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram"):
+        if (other.unit, other.highest, other.sub_bits) != (self.unit, self.highest, self.sub_bits):
+            raise ValueError("histograms with different layouts cannot be merged")
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, p: float) -> float:
+        """Value at percentile `p` (0-100): the middle of its bucket, clamped to the recorded range."""
+        if not self.count:
+            return math.nan
+        rank = max(1, math.ceil(p / 100.0 * self.count))
+        seen = 0
+        for idx, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                low, high = self._bounds(idx)
+                return min(self.max, max(self.min, (low + high) / 2.0 * self.unit))
+        return self.max
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else math.nan
+
+    def summary(self, percentiles=(50, 95, 99)) -> dict:
+        out = {"count": self.count, "mean": self.mean(),
+               "min": self.min if self.count else math.nan, "max": self.max if self.count else math.nan}
+        for p in percentiles:
+            out[f"p{p:g}"] = self.percentile(p)
+        return out
+
+    def to_dict(self) -> dict:
+        """JSON-ready form; only non-empty buckets are stored."""
+        return {"unit": self.unit, "highest": self.highest, "sub_bits": self.sub_bits,
+                "count": self.count, "total": self.total,
+                "min": self.min if self.count else None, "max": self.max if self.count else None,
+                "buckets": {str(i): c for i, c in enumerate(self.counts) if c}}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Histogram":
+        h = cls(d["unit"], d["highest"], d["sub_bits"])
+        for i, c in d["buckets"].items():
+            h.counts[int(i)] = c
+        h.count, h.total = d["count"], d["total"]
+        if h.count:
+            h.min, h.max = d["min"], d["max"]
+        return h
@@ -1,8 +1,50 @@
-"""Minimal inventory helper."""
+"""
+Minimal inventory helper.
+
+Item names are interned once in a registry shared by every session (ITEMS)
+and an inventory is a bitmask over it, so a session's items cost one int.
+list() is cached per mask: a set of items is sorted once per process, not
+on every autosave or telemetry line.
+"""
+class ItemRegistry:
+    def __init__(self):
+        self.bits = {}          # item -> bit
+        self.names = []         # bit -> item
+        self._sorted = {0: ()}  # mask -> items in sorted order
+
+    def bit(self, item: str) -> int:
+        b = self.bits.get(item)
+        if b is None:
+            b = self.bits[item] = len(self.names)
+            self.names.append(item)
+        return b
+
+    def mask(self, items) -> int:
+        m = 0
+        for item in items:
+            m |= 1 << self.bit(item)
+        return m
+
+    def sorted(self, mask: int) -> tuple:
+        items = self._sorted.get(mask)
+        if items is None:
+            items = self._sorted[mask] = tuple(sorted(
+                name for b, name in enumerate(self.names) if mask >> b & 1))
+        return items
+
+ITEMS = ItemRegistry()
+
 class Inventory:
+    __slots__ = ("mask",)
+
     def __init__(self):
-        self._items = set()
-    def add(self, item: str): self._items.add(item)
-    def has(self, item: str) -> bool: return item in self._items
-    def remove(self, item: str): self._items.discard(item)
-    def list(self): return sorted(self._items)
+        self.mask = 0
+    def add(self, item: str): self.mask |= 1 << ITEMS.bit(item)
+    def has(self, item: str) -> bool:
+        b = ITEMS.bits.get(item)
+        return b is not None and self.mask >> b & 1 == 1
+    def remove(self, item: str):
+        b = ITEMS.bits.get(item)
+        if b is not None:
+            self.mask &= ~(1 << b)
+    def list(self): return list(ITEMS.sorted(self.mask))
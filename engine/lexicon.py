@@ -0,0 +1,128 @@
+"""
+Compiled sentiment lexicons for MoodEngine.
+
+A Lexicon maps terms (words or phrases) to weights. Scoring keeps the
+original rule: every distinct term that occurs anywhere in the lowercased
+text counts once, as a substring ("okey" hits both "ok" and "okey").
+
+All terms are compiled into one regex shaped like their trie, scanned with
+a lookahead so every start position yields the longest term starting
+there; the shorter terms starting at the same position are exactly its
+term prefixes. One pass over the input, independent of lexicon size.
+Lexicons of up to SCAN_LIMIT terms (the built-in one has 30) skip the
+regex and check each term with `in`, which is cheaper at that size.
+
+Lexicon files in data/ are JSON ({"term": weight, ...}) or TSV
+(term<TAB>weight per line, # comments). Loaded lexicons are cached per
+file and mtime, so every engine shares one compiled matcher.
+"""
+import json, os, re
+from bisect import bisect_right
+
+SCAN_LIMIT = 64
+
+class Lexicon:
+    def __init__(self, weights: dict):
+        self.weights = {}
+        for term, w in weights.items():
+            term = term.lower()
+            if term:
+                self.weights[term] = self.weights.get(term, 0) + w
+        trie = {}
+        for term in self.weights:
+            node = trie
+            for ch in term:
+                node = node.setdefault(ch, {})
+            node[""] = True
+        # every term -> the terms that are its prefixes (itself included)
+        self.prefixes = {t: tuple(t[:i] for i in range(1, len(t) + 1) if t[:i] in self.weights) for t in self.weights}
+        self._scan = re.compile("(?=(" + _trie_pattern(trie) + "))", re.DOTALL).finditer if trie else None
+        self._small = tuple(self.weights.items()) if len(self.weights) <= SCAN_LIMIT else None
+
+    @classmethod
+    def from_words(cls, positive, negative):
+        weights = {}
+        for w in positive:
+            weights[w] = weights.get(w, 0) + 1
+        for w in negative:
+            weights[w] = weights.get(w, 0) - 1
+        return cls(weights)
+
+    def __len__(self):
+        return len(self.weights)
+
+    def matches(self, t: str) -> set:
+        """Distinct terms occurring in `t` (already lowercased)."""
+        if self._small is not None:
+            return {term for term, _ in self._small if term in t}
+        hits = set()
+        if self._scan is not None:
+            prefixes = self.prefixes
+            for m in self._scan(t):
+                hits.update(prefixes[m.group(1)])
+        return hits
+
+    def score(self, t: str):
+        """Sum of the weights of the distinct terms in `t` (already lowercased)."""
+        if self._small is not None:
+            return sum(w for term, w in self._small if term in t)
+        weights = self.weights
+        return sum(weights[h] for h in self.matches(t))
+
+    def score_many(self, joined: str, starts) -> list:
+        """
+        score() of many texts in one scan: `joined` is the lowercased texts
+        joined by "\0" (no term contains it), `starts` the ascending offsets
+        where each text begins. Hits are collected per text in the order
+        score() finds them, so the sums are the same floats.
+        """
+        if self._small is not None:
+            # a slice keeps its trailing "\0"; no term can match across it
+            ends = list(starts[1:]) + [len(joined)]
+            return [self.score(joined[a:b]) for a, b in zip(starts, ends)]
+        out = [0] * len(starts)
+        if self._scan is None:
+            return out
+        prefixes = self.prefixes
+        hits = {}
+        for m in self._scan(joined):
+            i = bisect_right(starts, m.start()) - 1
+            found = hits.get(i)
+            if found is None:
+                found = hits[i] = set()
+            found.update(prefixes[m.group(1)])
+        weights = self.weights
+        for i, found in hits.items():
+            out[i] = sum(weights[h] for h in found)
+        return out
+
+def _trie_pattern(node) -> str:
+    alts = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not alts:
+        return ""
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    # greedy: a longer term through this node wins over the one ending here
+    return "(?:" + body + ")?" if "" in node else body
+
+_loaded = {}
+
+def load_lexicon(path) -> Lexicon:
+    """A compiled Lexicon from a JSON or TSV file, shared while the file is unchanged."""
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    lex = _loaded.get(key)
+    if lex is None:
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith(".json"):
+                weights = {str(k): float(v) for k, v in json.load(f).items()}
+            else:
+                weights = {}
+                for n, line in enumerate(f, 1):
+                    line = line.rstrip("\n")
+                    if not line.strip() or line.lstrip().startswith("#"):
+                        continue
+                    term, tab, w = line.rpartition("\t")
+                    if not tab:
+                        raise ValueError(f"{path}:{n}: expected term<TAB>weight")
+                    weights[term] = float(w)
+        lex = _loaded[key] = Lexicon(weights)
+    return lex
@@ -0,0 +1,138 @@
+"""
+Built-in instrumentation: hot-path timers, per-room latency histograms and
+counters, all in fixed memory (engine.histogram), off by default.
+
+    from engine.metrics import METRICS
+    METRICS.enable()
+    ...play...
+    METRICS.snapshot()      # dict: timers (us), rooms (think s, process us), counters
+    print(METRICS.dump())   # the same as text, p50 / p95 / p99
+
+Timers use time.perf_counter_ns(). What is measured:
+
+    mood.observe, telemetry.log   per call; Game binds timed versions onto each
+                                  session's MoodEngine / Telemetry, so a disabled
+                                  registry adds nothing to those calls
+    save_state, save.sqlite       each save written (also from the autosave thread)
+    export.csv, export.plot       the end-of-game exports
+    room think                    per room: seconds from a prompt being shown to the answer
+    room process                  per room: Game.step time for one line of input
+    counters                      room events (answer, hint, ...), wrong_answer, autosave, checkpoint
+"""
+import threading
+from functools import wraps
+from time import perf_counter_ns
+from engine.histogram import Histogram
+
+def _ns_hist():
+    return Histogram(unit=100, highest=60e9)        # 0.1 us .. 60 s, in ns
+
+def _s_hist():
+    return Histogram(unit=0.01, highest=3600.0)     # 10 ms .. 1 h, in seconds
+
+class Metrics:
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.timers = {}        # name -> Histogram (ns)
+            self.think = {}         # room id -> Histogram (s)
+            self.process = {}       # room id -> Histogram (ns)
+            self.counters = {}
+
+    def record(self, name, ns):
+        with self._lock:
+            h = self.timers.get(name)
+            if h is None:
+                h = self.timers[name] = _ns_hist()
+            h.record(ns)
+
+    # count() and room_step() are called from the game loop's thread only, so
+    # they skip the lock; record() is also used by the autosave thread
+
+    def count(self, name, n=1):
+        counters = self.counters
+        counters[name] = counters.get(name, 0) + n
+
+    def room_step(self, room_id, think_s, process_ns):
+        h = self.think.get(room_id)
+        if h is None:
+            with self._lock:
+                h = self.think[room_id] = _s_hist()
+                self.process[room_id] = _ns_hist()
+        if think_s is not None:
+            h.record(think_s)
+        self.process[room_id].record(process_ns)
+
+    def timer(self, name) -> Histogram:
+        with self._lock:
+            h = self.timers.get(name)
+            if h is None:
+                h = self.timers[name] = _ns_hist()
+            return h
+
+    def wrap(self, name, fn):
+        """
+        fn timed into `name` on every call (bind onto an instance for hot
+        paths). Records without the lock: use it for calls made on the game
+        loop's thread only.
+        """
+        record = self.timer(name).record
+
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            t0 = perf_counter_ns()
+            result = fn(*args, **kwargs)
+            record(perf_counter_ns() - t0)
+            return result
+        return timed
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            us = lambda h: {k: (v / 1e3 if k != "count" else v) for k, v in h.summary().items()}
+            return {
+                "timers_us": {name: us(h) for name, h in sorted(self.timers.items())},
+                "rooms": {room: {"think_s": self.think[room].summary(), "process_us": us(self.process[room])}
+                          for room in self.think},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def dump(self) -> str:
+        snap = self.snapshot()
+        lines = [f"{'timer':<22} {'count':>8} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10} {'max us':>10}"]
+        for name, s in snap["timers_us"].items():
+            lines.append(f"{name:<22} {s['count']:>8} {s['p50']:>10.1f} {s['p95']:>10.1f} {s['p99']:>10.1f} {s['max']:>10.1f}")
+        lines.append(f"{'room':<22} {'answers':>8} {'think p50 s':>12} {'p95 s':>8} {'p99 s':>8} "
+                     f"{'process p50 us':>15} {'p95 us':>8} {'p99 us':>8}")
+        for room, r in snap["rooms"].items():
+            t, p = r["think_s"], r["process_us"]
+            lines.append(f"{room:<22} {p['count']:>8} {t['p50']:>12.1f} {t['p95']:>8.1f} {t['p99']:>8.1f} "
+                         f"{p['p50']:>15.1f} {p['p95']:>8.1f} {p['p99']:>8.1f}")
+        lines.append("counters: " + (", ".join(f"{k} {v}" for k, v in snap["counters"].items()) or "none"))
+        return "\n".join(lines)
+
+METRICS = Metrics()
+
+def timed(name):
+    """Decorator timing every call into `name` while METRICS is enabled."""
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return fn(*args, **kwargs)
+            t0 = perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                METRICS.record(name, perf_counter_ns() - t0)
+        return wrapper
+    return deco
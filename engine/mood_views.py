@@ -0,0 +1,192 @@
+"""
+Aggregate mood views over many session timelines.
+
+- bands:   percentile bands (p10/p25/p50/p75/p90) of mood_score per room,
+           by mood tick within the room, across all sessions
+- heatmap: how often each mood_state occurs at each event index
+- lttb():  shape-preserving downsampling for long single-session series
+
+All aggregation is NumPy; matplotlib is imported only when rendering.
+
+    python -m engine.mood_views reports/sessions --out reports/aggregate
+"""
+import argparse, csv, glob, os, time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+STATES = ("stressed", "focused", "neutral", "calm", "excited")
+STATE_CODE = {s: i for i, s in enumerate(STATES)}
+PERCENTILES = (10, 25, 50, 75, 90)
+
+def lttb(x, y, n_out: int):
+    """Largest-Triangle-Three-Buckets: pick n_out points of (x, y) that keep its visual shape."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # average of the next bucket (or the last point) is the third triangle corner
+        nlo, nhi = hi, (edges[i + 2] if i + 2 < len(edges) else n)
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return x[keep], y[keep]
+
+# ---- loading -----------------------------------------------------------------
+
+def read_ticks(path):
+    """mood_tick rows of one timeline: (rooms, event_index, scores, state_codes)."""
+    rooms, idx, scores, states = [], [], [], []
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        for i, e in enumerate(csv.DictReader(f)):
+            if e.get("event") == "mood_tick" and e.get("mood_score"):
+                rooms.append(e["room"])
+                idx.append(i)
+                scores.append(float(e["mood_score"]))
+                states.append(STATE_CODE.get(e.get("mood_state"), STATE_CODE["neutral"]))
+    return rooms, idx, scores, states
+
+def _read_chunk(paths):
+    return [read_ticks(p) for p in paths]
+
+class TickTable:
+    """Every mood tick of a corpus as flat NumPy columns."""
+    def __init__(self, sessions):
+        codes = {}          # room name -> code, in order of first appearance
+        room, sid, idx, tick, scores, states = [], [], [], [], [], []
+        for s, (r, i, sc, st) in enumerate(sessions):
+            seen = {}
+            for name in r:
+                room.append(codes.setdefault(name, len(codes)))
+                tick.append(seen.get(name, 0))
+                seen[name] = seen.get(name, 0) + 1
+            sid.extend([s] * len(r))
+            idx.extend(i)
+            scores.extend(sc)
+            states.extend(st)
+        self.n_sessions = len(sessions)
+        self.room_names = list(codes)
+        self.room = np.asarray(room, dtype=np.int64)
+        self.session = np.asarray(sid, dtype=np.int64)
+        self.event_index = np.asarray(idx, dtype=np.int64)
+        self.tick = np.asarray(tick, dtype=np.int64)      # n-th mood tick within its room
+        self.score = np.asarray(scores, dtype=float)
+        self.state = np.asarray(states, dtype=np.int64)
+
+def load_corpus(paths, jobs=None, chunk=256):
+    chunks = [paths[i:i + chunk] for i in range(0, len(paths), chunk)]
+    if (jobs or 1) > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(jobs) as pool:
+            sessions = [s for part in pool.map(_read_chunk, chunks) for s in part]
+    else:
+        sessions = [s for c in chunks for s in _read_chunk(c)]
+    return TickTable(sessions)
+
+# ---- aggregation ---------------------------------------------------------------
+
+def room_bands(table, max_ticks: int = 30):
+    """{room: (tick numbers, percentiles[len(PERCENTILES), ticks])} across sessions."""
+    out = {}
+    for r, name in enumerate(table.room_names):
+        m = (table.room == r) & (table.tick < max_ticks)
+        if not m.any():
+            continue
+        width = int(table.tick[m].max()) + 1
+        grid = np.full((table.n_sessions, width), np.nan)
+        grid[table.session[m], table.tick[m]] = table.score[m]
+        grid = grid[~np.isnan(grid).all(axis=1)]
+        with np.errstate(all="ignore"):
+            pct = np.nanpercentile(grid, PERCENTILES, axis=0)
+        out[name] = (np.arange(1, width + 1), pct)
+    return out
+
+def state_heatmap(table, columns: int = 100):
+    """(counts[len(STATES), bins], bin width): mood ticks per mood_state per event-index bin."""
+    if not len(table.event_index):
+        return np.zeros((len(STATES), 0), dtype=np.int64), 1
+    top = int(table.event_index.max()) + 1
+    width = max(1, -(-top // columns))
+    bins = table.event_index // width
+    nbins = int(bins.max()) + 1
+    counts = np.bincount(table.state * nbins + bins, minlength=len(STATES) * nbins)
+    return counts.reshape(len(STATES), nbins), width
+
+# ---- rendering -------------------------------------------------------------------
+
+def _pyplot():
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+def render_bands(bands, png_path, n_sessions):
+    plt = _pyplot()
+    rooms = list(bands)
+    fig, axes = plt.subplots(len(rooms), 1, figsize=(8, 2.6 * max(1, len(rooms))), sharey=True, squeeze=False,
+                             constrained_layout=True)
+    for ax, room in zip(axes[:, 0], rooms):
+        x, p = bands[room]
+        ax.fill_between(x, p[0], p[4], alpha=0.2, label="p10-p90")
+        ax.fill_between(x, p[1], p[3], alpha=0.4, label="p25-p75")
+        ax.plot(x, p[2], marker="o", label="median")
+        ax.set_title(room)
+        ax.set_ylabel("Mood score")
+        ax.grid(True, alpha=0.3)
+    axes[-1, 0].set_xlabel("Mood tick in room")
+    axes[0, 0].legend(loc="upper right", fontsize="small")
+    fig.suptitle(f"Mood per room across {n_sessions} sessions")
+    fig.savefig(png_path, bbox_inches="tight")
+    plt.close(fig)
+    return png_path
+
+def render_heatmap(counts, width, png_path, n_sessions):
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(10, 3.5))
+    im = ax.imshow(counts, aspect="auto", origin="lower", interpolation="nearest",
+                   extent=(0, counts.shape[1] * width, -0.5, len(STATES) - 0.5))
+    ax.set_yticks(range(len(STATES)))
+    ax.set_yticklabels(STATES)
+    ax.set_xlabel("Event #")
+    ax.set_title(f"Mood state by event index ({n_sessions} sessions)")
+    fig.colorbar(im, ax=ax, label="mood ticks")
+    fig.savefig(png_path, bbox_inches="tight")
+    plt.close(fig)
+    return png_path
+
+def render_aggregate(paths, out_dir, jobs=None, max_ticks=30, columns=100):
+    """(corpus table, PNGs rendered by this call); a view with no data is not rendered."""
+    os.makedirs(out_dir, exist_ok=True)
+    table = load_corpus(paths, jobs)
+    written = []
+    bands = room_bands(table, max_ticks)
+    if bands:
+        written.append(render_bands(bands, os.path.join(out_dir, "mood_bands.png"), table.n_sessions))
+    counts, width = state_heatmap(table, columns)
+    if counts.size:
+        written.append(render_heatmap(counts, width, os.path.join(out_dir, "mood_state_heatmap.png"),
+                                      table.n_sessions))
+    return table, written
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render aggregate mood views for a directory of session timelines.")
+    ap.add_argument("source", help="directory of *.csv timelines")
+    ap.add_argument("--out", default=os.path.join("reports", "aggregate"))
+    ap.add_argument("--jobs", type=int, default=None, help="processes for reading timelines (default: all cores)")
+    ap.add_argument("--max-ticks", type=int, default=30, help="mood ticks per room shown in the bands")
+    args = ap.parse_args(argv)
+
+    paths = sorted(glob.glob(os.path.join(args.source, "*.csv")))
+    t0 = time.perf_counter()
+    table, written = render_aggregate(paths, args.out, args.jobs or os.cpu_count(), args.max_ticks)
+    print(f"{table.n_sessions} sessions, {len(table.score)} mood ticks -> {', '.join(written) or 'nothing'} "
+          f"in {time.perf_counter() - t0:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,28 @@
-"""Simple JSON save/load helpers."""
-import json, os
+"""
+Save/load helpers.
 
+save_state/load_state write one JSON file per slot. For many players use a
+save store instead: anything with load(player, slot) -> dict,
+save(player, slot, state) and close().
+
+- JsonSaveStore:   the JSON files, path chosen per player/slot
+- SqliteSaveStore: one row per (player, slot) in a WAL-mode SQLite file,
+                   atomic upserts through a shared ConnectionPool
+- AutosaveBatcher: wraps a store, keeps only the latest state per
+                   (player, slot) and writes them in one batch
+"""
+import json, os, threading, time
+from contextlib import contextmanager
+from engine.metrics import timed
+
+@timed("save_state")
 def save_state(state: dict, path="saves/slot1.json"):
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
+    # write next to the target and swap it in, so a crash never leaves half a save
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
         json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
 
 def load_state(path="saves/slot1.json") -> dict:
     try:
@@ -12,3 +30,170 @@ def load_state(path="saves/slot1.json") -> dict:
             return json.load(f)
     except FileNotFoundError:
         return {}
+
+class JsonSaveStore:
+    def __init__(self, path_template="saves/{slot}.json"):
+        # "{player}" in the template gives every player their own files
+        self.path_template = path_template
+
+    def path(self, player, slot):
+        return self.path_template.format(player=player, slot=slot)
+
+    def load(self, player, slot) -> dict:
+        return load_state(self.path(player, slot))
+
+    def save(self, player, slot, state: dict):
+        save_state(state, self.path(player, slot))
+
+    def close(self):
+        pass
+
+class ConnectionPool:
+    """A fixed number of SQLite connections shared by every session and thread."""
+    def __init__(self, path, size: int = 4):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        import queue, sqlite3     # only hosts with a SQLite store pay for these
+        self.path = path
+        self._idle = queue.Queue()
+        self._all = []
+        for _ in range(size):
+            conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._all.append(conn)
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        for conn in self._all:
+            conn.close()
+        self._all = []
+
+class SqliteSaveStore:
+    def __init__(self, path="saves/saves.db", pool=None, pool_size: int = 4):
+        self.pool = pool or ConnectionPool(path, pool_size)
+        self._own_pool = pool is None
+        with self.pool.connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS saves ("
+                " player TEXT NOT NULL, slot TEXT NOT NULL, state TEXT NOT NULL, updated REAL NOT NULL,"
+                " PRIMARY KEY (player, slot))"
+            )
+
+    def load(self, player, slot) -> dict:
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT state FROM saves WHERE player = ? AND slot = ?", (player, slot)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def save(self, player, slot, state: dict):
+        self.save_many([(player, slot, state)])
+
+    @timed("save.sqlite")
+    def save_many(self, items):
+        """Upsert many (player, slot, state) in one transaction."""
+        now = time.time()
+        rows = [(p, s, json.dumps(st, ensure_ascii=False, separators=(",", ":")), now) for p, s, st in items]
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "INSERT INTO saves (player, slot, state, updated) VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (player, slot) DO UPDATE SET state = excluded.state, updated = excluded.updated",
+                    rows,
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        if self._own_pool:
+            self.pool.close()
+
+class AutosaveBatcher:
+    """
+    Coalesces autosaves: save() only records the latest state per
+    (player, slot); a background thread writes everything pending every
+    `interval` seconds in one batch. load() sees pending saves first,
+    including the batch being written until the store has committed it.
+
+    A batch that fails to write stays pending (newer saves of the same slot
+    win) and is retried on the next tick; on_error gets a message each time.
+    close() raises if the final write fails, so no lost save goes unnoticed.
+    """
+    def __init__(self, store, interval: float = 0.5, on_error=print):
+        self.store = store
+        self.interval = interval
+        self.on_error = on_error
+        self._pending = {}
+        self._inflight = {}         # the batch flush() is writing right now
+        self._write = threading.Lock()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.batches = 0
+        self.coalesced = 0
+        self.failures = 0
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def load(self, player, slot) -> dict:
+        with self._lock:
+            state = self._pending.get((player, slot))
+            if state is None:
+                state = self._inflight.get((player, slot))
+        return state if state is not None else self.store.load(player, slot)
+
+    def save(self, player, slot, state: dict):
+        with self._lock:
+            if (player, slot) in self._pending:
+                self.coalesced += 1
+            self._pending[(player, slot)] = state
+
+    def flush(self):
+        with self._write:           # one batch in flight at a time
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._inflight = pending
+            if not pending:
+                return
+            items = [(p, s, st) for (p, s), st in pending.items()]
+            save_many = getattr(self.store, "save_many", None)
+            try:
+                if save_many is not None:
+                    save_many(items)
+                else:
+                    for p, s, st in items:
+                        self.store.save(p, s, st)
+            except BaseException:
+                with self._lock:
+                    for key, st in pending.items():
+                        self._pending.setdefault(key, st)
+                    self._inflight = {}
+                self.failures += 1
+                raise
+            with self._lock:
+                self._inflight = {}
+            self.batches += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception as e:
+                self.on_error(f"(Autosave failed, retrying: {e})")
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        try:
+            self.flush()
+        finally:
+            self.store.close()
@@ -0,0 +1,132 @@
+"""
+Mood plots, rendered away from the game.
+
+matplotlib is only imported inside the render functions, which run in a
+worker process: the game hands finished timelines to a PlotQueue and moves
+on. Render a whole directory of timelines in parallel with
+
+    python -m engine.plots reports/sessions --jobs 4
+"""
+import csv, os
+
+# longer series are downsampled (LTTB) before plotting
+MAX_POINTS = 1000
+
+def read_mood_series(csv_path):
+    """(event index, mood_score) of every event in a timeline that has a score."""
+    xs, ys = [], []
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        for i, e in enumerate(csv.DictReader(f)):
+            if e.get("mood_score"):
+                xs.append(i)
+                ys.append(float(e["mood_score"]))
+    return xs, ys
+
+def render_series(xs, ys, png_path):
+    """Save a simple line plot of mood_score over event index."""
+    if not ys:
+        return None  # nichts zu plotten
+    if len(ys) > MAX_POINTS:
+        from engine.mood_views import lttb
+        xs, ys = lttb(xs, ys, MAX_POINTS)
+    if os.path.dirname(png_path):
+        os.makedirs(os.path.dirname(png_path), exist_ok=True)
+
+    # Headless-Backend und Plot
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.figure()
+    plt.plot(xs, ys, marker="o" if len(ys) <= 200 else None)
+    plt.title("Mood score over time")
+    plt.xlabel("Event #")
+    plt.ylabel("Mood score")
+    plt.grid(True, alpha=0.3)
+    plt.savefig(png_path, bbox_inches="tight")
+    plt.close()
+    return png_path
+
+def render_mood_plot(csv_path, png_path):
+    xs, ys = read_mood_series(csv_path)
+    return render_series(xs, ys, png_path)
+
+class PlotQueue:
+    """
+    Background worker processes that render mood plots for finished sessions.
+    A render that raises is passed to on_error as it fails and kept in `failed`.
+    """
+    def __init__(self, workers: int = 1, on_error=print):
+        self.workers = workers
+        self.on_error = on_error
+        self._pool = None
+        self.pending = []
+        self.failed = []            # (png_path, exception)
+
+    def submit(self, csv_path, png_path):
+        if self._pool is None:
+            # imported here: a game that never finishes never pays for the process pool
+            from concurrent.futures import ProcessPoolExecutor
+            import multiprocessing
+            # spawn: the workers never inherit the game's state, and the game never imports matplotlib
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        fut = self._pool.submit(render_mood_plot, csv_path, png_path)
+        fut.add_done_callback(lambda f: self._done(png_path, f))
+        self.pending.append(fut)
+        self.pending = [f for f in self.pending if not f.done()]
+        return fut
+
+    def _done(self, png_path, fut):
+        if fut.cancelled() or fut.exception() is None:
+            return
+        self.failed.append((png_path, fut.exception()))
+        self.on_error(f"(Mood plot {png_path} not rendered: {fut.exception()})")
+
+    def close(self, wait: bool = True):
+        """Stop the workers (wait=True: after the queued renders). Returns the renders that failed so far."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+        return self.failed
+
+def render_many(pairs, jobs=None):
+    """
+    Render (csv_path, png_path) pairs across `jobs` processes. Returns the
+    PNGs written and the renders that failed, as (csv_path, exception).
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    done, failed = [], []
+    with ProcessPoolExecutor(jobs or os.cpu_count() or 1) as pool:
+        futures = {pool.submit(render_mood_plot, c, p): c for c, p in pairs}
+        for fut in as_completed(futures):
+            if fut.exception() is not None:
+                failed.append((futures[fut], fut.exception()))
+            elif fut.result():
+                done.append(fut.result())
+    return done, failed
+
+def main(argv=None):
+    import argparse, glob, time
+
+    ap = argparse.ArgumentParser(description="Render mood plots for a directory of session timelines.")
+    ap.add_argument("source", help="directory of *.csv timelines (or a single CSV)")
+    ap.add_argument("--out", default=None, help="where to write PNGs (default: next to each CSV)")
+    ap.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    args = ap.parse_args(argv)
+
+    paths = [args.source] if os.path.isfile(args.source) else sorted(glob.glob(os.path.join(args.source, "*.csv")))
+    pairs = []
+    for c in paths:
+        name = os.path.splitext(os.path.basename(c))[0] + ".png"
+        pairs.append((c, os.path.join(args.out or os.path.dirname(c), name)))
+    t0 = time.perf_counter()
+    done, failed = render_many(pairs, args.jobs)
+    elapsed = time.perf_counter() - t0
+    print(f"rendered {len(done)} of {len(pairs)} timelines in {elapsed:.2f}s"
+          + (f", {len(failed)} failed:" if failed else ""))
+    for path, e in sorted(failed, key=lambda f: f[0]):
+        print(f"  {path}: {e}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,250 @@
+"""
+Headless bots and replays of recorded sessions.
+
+A bot script is a list of (text, think_seconds) steps per room id:
+
+    {"room1": [("hint", 4.0), ("echo", 6.5)], "room2": [("5348", 20.0)], ...}
+
+Bots run on a SimClock, so think times and intro pauses cost no wall time.
+`replay()` turns a recorded session_timeline.csv back into such a script and
+checks that the current code reaches the same outcome, inventory and
+mood-state sequence.
+
+    python -m engine.replay reports/session_timeline.csv --repeat 1000
+"""
+import argparse, csv, json, time
+from datetime import datetime
+from engine.clock import SimClock
+from engine.game import Game
+from engine.inventory import Inventory
+from engine.telemetry import Telemetry
+from mood import MoodEngine
+
+RESUME = "meta"     # script key for the answer to "Found a save. Continue?"
+
+class ScriptExhausted(Exception):
+    """The script ran out of input before the game finished."""
+
+class ScriptedConsole:
+    """
+    Console fed from a flat list of (text, think_seconds) steps, so
+    start_game/play/enter_roomN run without a terminal. Think time is
+    added to the clock when it is a SimClock.
+    """
+    def __init__(self, steps, clock=None):
+        self.steps = iter(steps)
+        self.clock = clock
+        self.lines = []
+
+    def say(self, text: str = ""):
+        self.lines.append(text)
+
+    def ask(self, prompt: str) -> str:
+        self.lines.append(prompt)
+        try:
+            text, think = next(self.steps)
+        except StopIteration:
+            raise ScriptExhausted(prompt) from None
+        advance = getattr(self.clock, "advance", None)
+        if advance is not None:
+            advance(think)
+        return text
+
+class BotResult:
+    def __init__(self, outcome, inventory, states, telemetry):
+        self.outcome = outcome      # "escaped" | "game_over" | "abandoned"
+        self.inventory = inventory
+        self.states = states        # mood_state of every mood_tick, in order
+        self.telemetry = telemetry
+
+def mood_states(telemetry):
+    return [e["mood_state"] for e in telemetry.iter_events() if e.get("event") == "mood_tick"]
+
+def run_bot(script, rooms, saved=None, clock=None, telemetry=None, mood_engine=None):
+    """Play one session from a per-room script by stepping the Game directly."""
+    clock = clock or SimClock()
+    telemetry = telemetry if telemetry is not None else Telemetry()
+    game = Game(rooms, save_path=None, csv_path=None, plot_path=None)
+    state = game.new_state(mood_engine or MoodEngine(), Inventory(), telemetry, 1.0, clock)
+    state.saved = saved or {}
+    steps = {key: iter(s) for key, s in script.items()}
+
+    state, outputs = game.start(state)
+    clock.sleep(outputs.pending())
+    outcome = "abandoned"
+    while True:
+        key = RESUME if state.phase == "resume" else game.rooms[state.room_idx].id
+        step = next(steps.get(key, iter(())), None)
+        if step is None:
+            break
+        text, think = step
+        clock.advance(think)
+        state, outputs, done = game.step(state, text)
+        clock.sleep(outputs.pending())
+        if done:
+            outcome = "escaped" if state.escaped else "game_over"
+            break
+    return BotResult(outcome, state.inventory.list(), mood_states(telemetry), telemetry)
+
+# ---- recordings -------------------------------------------------------------
+
+class Recording:
+    def __init__(self, path):
+        self.path = path
+        self.script = {}
+        self.saved = {}
+        self.outcome = "abandoned"
+        self.inventory = []
+        self.states = []
+        # what the mood engine saw, in order: ("hint",) or
+        # ("answer", text, seconds, correct, wrong_attempts, near_miss)
+        self.turns = []
+
+def intro_pause(room) -> float:
+    """Seconds between entering a room and its answer clock starting."""
+    clock = SimClock()
+    state, _ = room.start(room.new_state(clock=clock))
+    return state.started - clock.now()
+
+def field(row, key):
+    """A logged field: its own column (in-memory export) or inside the streamed "extra" JSON."""
+    value = row.get(key)
+    if value:
+        return value
+    extra = row.get("extra")
+    return json.loads(extra).get(key) if extra else None
+
+def recover_seconds(text, score, wrong_attempts, correct, estimate, near_miss=False, mood_engine=None):
+    """
+    Elapsed seconds the mood engine must have seen to produce `score`,
+    inverting MoodEngine.observe() under that engine's settings (default:
+    MoodEngine's own). Falls back to the timestamp estimate where the score
+    is clamped and therefore only bounds the time.
+    """
+    if score is None:
+        return max(0.0, estimate)
+    me = mood_engine if mood_engine is not None else MoodEngine()
+    rest = (me.WRONG_WEIGHT * max(0, min(wrong_attempts, me.WRONG_CAP)) + (me.CORRECT_BONUS if correct else 0.0)
+            + (me.NEAR_MISS_BONUS if near_miss and not correct else 0.0) + me._lexicon_score(text))
+    per_second = me.TIME_WEIGHT / 30.0
+    if not per_second:
+        return max(0.0, estimate)          # time does not move the score
+    cap = me.SCORE_CAP
+    if score <= -cap:
+        need = (-cap - rest) / per_second
+        return max(estimate, need if need <= me.TIME_CAP else me.TIME_CAP, 0.0)
+    if score >= cap:
+        return max(0.0, min(estimate, (cap - rest) / per_second))
+    t = (score - rest) / per_second
+    if t >= me.TIME_CAP - 1e-9:
+        return max(estimate, me.TIME_CAP)
+    return max(0.0, t)
+
+def load_recording(path, rooms, mood_engine=None):
+    """
+    Rebuild a bot script (and what it should produce) from a session timeline
+    CSV. `mood_engine` carries the settings the session was scored with.
+    """
+    rec = Recording(path)
+    intros = {r.id: intro_pause(r) for r in rooms}
+    items = set()
+    room = None
+    meta_ts = None
+    tick = None
+    wrong = 0
+    last_at = 0.0
+
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            ts = datetime.fromisoformat(row["ts"]).timestamp() if row.get("ts") else 0.0
+            ev = row.get("event")
+            if row.get("room") == "meta":
+                meta_ts = ts
+                if ev == "load":
+                    loaded = [i for i in row.get("items", "").split(";") if i]
+                    rec.saved = {"next_room": int(row["next_room"]) - 1, "inventory": loaded}
+                    rec.script[RESUME] = [("y", 0.0)]
+                if ev in ("load", "autosave"):
+                    items = {i for i in row.get("items", "").split(";") if i}
+                elif ev == "escaped":
+                    rec.outcome = "escaped"
+                elif ev == "game_over":
+                    rec.outcome = "game_over"
+                continue
+
+            if row["room"] != room:
+                room = row["room"]
+                wrong, last_at = 0, 0.0
+                entered = (meta_ts if meta_ts is not None else ts) + intros.get(room, 0.0)
+            steps = rec.script.setdefault(room, [])
+            if ev == "hint":
+                steps.append(("hint", 0.0))
+                rec.turns.append(("hint",))
+            elif ev == "mood_tick":
+                tick = float(row["mood_score"]) if row.get("mood_score") else None
+                rec.states.append(row.get("mood_state", ""))
+            elif ev == "answer":
+                correct = row.get("correct") == "True"
+                near = bool(field(row, "near"))
+                at = recover_seconds(row.get("input", ""), tick, wrong, correct, ts - entered, near, mood_engine)
+                steps.append((row.get("input", ""), max(0.0, at - last_at)))
+                rec.turns.append(("answer", row.get("input", ""), at, correct, wrong, near))
+                last_at = max(last_at, at)
+                wrong += not correct
+                tick = None
+            elif ev == "item_gain":
+                items.add(row.get("item", ""))
+    rec.inventory = sorted(items)
+    return rec
+
+class ReplayResult:
+    def __init__(self, recording, result):
+        self.recording = recording
+        self.result = result
+        self.mismatches = []
+        if result.outcome != recording.outcome:
+            self.mismatches.append(f"outcome {result.outcome!r} != recorded {recording.outcome!r}")
+        if result.inventory != recording.inventory:
+            self.mismatches.append(f"inventory {result.inventory} != recorded {recording.inventory}")
+        if result.states != recording.states:
+            self.mismatches.append(f"mood states {result.states} != recorded {recording.states}")
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+def replay(recording, rooms) -> ReplayResult:
+    return ReplayResult(recording, run_bot(recording.script, rooms, saved=recording.saved))
+
+def main(argv=None):
+    from main import build_rooms
+
+    ap = argparse.ArgumentParser(description="Replay recorded session timelines against the current code.")
+    ap.add_argument("paths", nargs="+", help="session_timeline.csv files")
+    ap.add_argument("--repeat", type=int, default=1, help="replay each file this many times (throughput)")
+    args = ap.parse_args(argv)
+
+    rooms = build_rooms()
+    recordings = [load_recording(p, rooms) for p in args.paths]
+    failed = 0
+    for rec in recordings:
+        res = replay(rec, rooms)
+        if res.ok:
+            print(f"OK        {rec.path}")
+        else:
+            failed += 1
+            print(f"MISMATCH  {rec.path}")
+            for m in res.mismatches:
+                print(f"    {m}")
+
+    n = len(recordings) * args.repeat
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        for rec in recordings:
+            replay(rec, rooms)
+    elapsed = time.perf_counter() - t0
+    print(f"replayed {n} sessions in {elapsed:.3f}s ({n / elapsed:.0f} sessions/s)")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,8 +1,124 @@
-"""Room base class for MindMaze. All rooms implement `enter(ctx) -> bool`."""
+"""
+Room base class for MindMaze. Rooms are resumable state machines:
+
+    state, outputs = room.start(state)
+    state, outputs, done = room.step(state, text)
+
+`outputs` is a list of (text, pause) pairs: show the text, then wait `pause`
+seconds before the next one. A room never blocks and reads time only from
+`state.clock`, so one process can advance any number of sessions; `enter()`
+is the blocking terminal driver on top.
+"""
 from abc import ABC, abstractmethod
+from engine.clock import REAL, Scheduler
+from engine.console import Console
+from engine.metrics import METRICS
+
+class Output(list):
+    """List of (text, pause) pairs produced by one start/step call."""
+    def say(self, text: str = "", pause: float = 0.0):
+        self.append((text, pause))
+
+    def stagger(self, block: str, line_delay: float = 3.0):
+        """Reveal a block line by line (the old print_staggered)."""
+        for line in block.splitlines():
+            self.append((line, line_delay))
+
+    def pending(self) -> float:
+        return sum(p for _, p in self)
+
+class RoomState:
+    """Everything a room needs between two steps of one session."""
+    def __init__(self, mood_engine=None, telemetry=None, inventory=None, pace: float = 1.0, clock=None):
+        self.mood_engine = mood_engine
+        self.telemetry = telemetry
+        self.inventory = inventory
+        self.pace = pace            # scales intro pauses (0 = none)
+        self.clock = clock or REAL
+        self.prompt = ""
+        self.wrong_attempts = 0
+        self.started = 0.0
+        self.escaped = False
 
 class Room(ABC):
+    id = "room"
+
+    def new_state(self, mood_engine=None, telemetry=None, inventory=None, pace: float = 1.0, clock=None) -> RoomState:
+        return RoomState(mood_engine, telemetry, inventory, pace, clock)
+
+    @abstractmethod
+    def start(self, state):
+        """Show the intro. Returns (state, outputs)."""
+        raise NotImplementedError
+
     @abstractmethod
-    def enter(self, ctx) -> bool:
-        """Run the room. Return True if escaped, else False."""
+    def step(self, state, text: str):
+        """Handle one line of input. Returns (state, outputs, done)."""
         raise NotImplementedError
+
+    def begin(self, state, out: Output, intro: str, prompt: str):
+        """Stagger the intro and start the answer clock once it has been shown."""
+        out.stagger(intro, 3.0 * state.pace)
+        state.prompt = prompt
+        state.started = state.clock.after(out.pending())
+        return state, out
+
+    def observe(self, state, text: str, correct: bool, near_miss: bool = False):
+        """Feed the mood engine and log a mood_tick."""
+        me = state.mood_engine
+        if me is None:
+            return
+        score = me.observe(
+            text=text,
+            seconds=state.clock.now() - state.started,
+            correct=correct,
+            wrong_attempts=state.wrong_attempts,
+            near_miss=near_miss
+        )
+        if state.telemetry:
+            state.telemetry.log(room=self.id, event="mood_tick",
+                                mood_score=score, mood_state=me.mood_state())
+
+    def log_answer(self, state, match):
+        """The answer event; near misses and known wrong answers carry what they matched."""
+        if METRICS.enabled and not match.correct:
+            METRICS.count("wrong_answer")
+        if match.near is not None:
+            self.log(state, "answer", input=match.normalized, correct=match.correct, near=match.near)
+        elif match.known is not None:
+            self.log(state, "answer", input=match.normalized, correct=match.correct, known=match.known)
+        else:
+            self.log(state, "answer", input=match.normalized, correct=match.correct)
+
+    def guide_miss(self, out, match, known_lines=None):
+        """Targeted guidance for a near miss or a known wrong answer. True if a line was shown."""
+        if match.near is not None:
+            out.say("So close! Check the spelling.")
+            return True
+        line = (known_lines or {}).get(match.known) if match.known is not None else None
+        if line:
+            out.say(line)
+            return True
+        return False
+
+    def log(self, state, event: str, **fields):
+        if METRICS.enabled:
+            METRICS.count(event)
+        if state.telemetry:
+            state.telemetry.log(room=self.id, event=event, **fields)
+
+    def enter(self, state, console=None) -> bool:
+        """Run the room on a console. Return True if escaped, else False."""
+        return drive(self, state, console)
+
+def drive(machine, state, console=None) -> bool:
+    """Blocking driver for anything with the start/step shape (rooms, the game)."""
+    console = console or Console()
+    scheduler = Scheduler(console, state.clock)
+    state, outputs = machine.start(state)
+    scheduler.deliver(outputs)
+    done = False
+    while not done:
+        state, outputs, done = machine.step(state, console.ask(state.prompt))
+        scheduler.deliver(outputs)
+    return state.escaped
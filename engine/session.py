@@ -0,0 +1,105 @@
+"""
+Compact records for idle sessions.
+
+A live session is a GameState plus its RoomState, a MoodEngine (a deque of
+float objects and an aggregator), an Inventory and a Telemetry. A session
+waiting at a prompt needs far less than that to continue, so a host
+holding many idle players can park each one as a SessionRecord:
+
+    record = park(state)                # after a step, while the player thinks
+    ...
+    state = unpark(game, record, MoodEngine(), telemetry, clock)
+    state, outputs, done = game.step(state, text)
+
+A record is one __slots__ object: small ints for the room and wrong
+attempts, the inventory as a bitmask over the shared item registry
+(engine.inventory.ITEMS), mood scores in a fixed-size array("d") ring
+buffer, and the answer clock as elapsed seconds. The prompt is the room's
+own string, shared rather than copied. Resuming is what a mid-room
+snapshot resume does (engine.snapshot), without the JSON.
+
+Telemetry stays with the caller, journal included: the record keeps only
+where a streaming sink's file ended (path, offset). Pass the same
+Telemetry to unpark(), or one on a new stream file, which then continues
+the parked one (CsvStreamSink.resume). The mood engine passed to unpark()
+must use the same kind of aggregator.
+"""
+from array import array
+from time import perf_counter_ns
+from engine import snapshot
+from engine.inventory import Inventory
+
+class SessionRecord:
+    __slots__ = ("room", "wrong", "items", "scores", "head", "count", "agg",
+                 "elapsed", "prompt", "pace", "player", "slot", "stream")
+
+    def __init__(self, history_size: int = 6):
+        self.room = 0
+        self.wrong = 0
+        self.items = 0                  # Inventory.mask
+        self.scores = array("d", bytes(8 * history_size))
+        self.head = 0                   # next slot to write
+        self.count = 0
+        self.agg = None                 # MoodEngine.aggregator.dump()
+        self.elapsed = 0.0
+        self.prompt = ""
+        self.pace = 1.0
+        self.player = "local"
+        self.slot = "slot1"
+        self.stream = None              # Telemetry.stream_position()
+
+    def push(self, score: float):
+        scores = self.scores
+        scores[self.head] = score
+        self.head = (self.head + 1) % len(scores)
+        if self.count < len(scores):
+            self.count += 1
+
+    def score_list(self) -> list:
+        """Scores oldest first, like MoodEngine.scores."""
+        if self.count < len(self.scores):
+            return self.scores[:self.count].tolist()
+        return (self.scores[self.head:] + self.scores[:self.head]).tolist()
+
+def park(state) -> SessionRecord:
+    """Compact a GameState that is waiting for an answer inside a room."""
+    if state.phase != "room":
+        raise ValueError(f"only a session waiting in a room can be parked (phase {state.phase!r})")
+    me = state.mood_engine
+    rec = SessionRecord(me.scores.maxlen if me is not None else 0)
+    if me is not None:
+        for s in me.scores:
+            rec.push(s)
+        rec.agg = me.aggregator.dump()
+    rs = state.room_state
+    rec.room = state.room_idx
+    rec.wrong = rs.wrong_attempts
+    rec.items = state.inventory.mask
+    rec.elapsed = rs.clock.now() - rs.started
+    rec.prompt = rs.prompt
+    rec.pace = state.pace
+    rec.player = state.player
+    rec.slot = state.slot
+    rec.stream = state.telemetry.stream_position()
+    return rec
+
+def unpark(game, record, mood_engine, telemetry, clock=None):
+    """A live GameState continuing the parked session: same room, attempts, answer clock, mood and items."""
+    inventory = Inventory()
+    inventory.mask = record.items
+    state = game.new_state(mood_engine, inventory, telemetry, record.pace, clock)
+    if mood_engine is not None:
+        mood_engine.restore_scores(record.score_list(), len(record.scores), record.agg)
+    if record.stream is not None:
+        telemetry.resume_stream(*record.stream)
+    state.player = record.player
+    state.slot = record.slot
+    state.saved = {}
+    state.room_idx = record.room
+    state.room_state = snapshot.resume_room(
+        game.rooms[record.room], state,
+        {"wrong": record.wrong, "prompt": record.prompt, "elapsed": record.elapsed})
+    state.prompt = record.prompt
+    state.phase = "room"
+    state.trace_prompt = perf_counter_ns()
+    return state
@@ -0,0 +1,156 @@
+"""
+Sharding connection-per-session servers across worker processes (POSIX).
+
+The supervisor owns the listening socket. It numbers every accepted
+connection (the session id) and hands the socket itself to worker
+sid % n over a Unix SEQPACKET pair, so the whole session runs in one
+worker's event loop. Routing is sticky by construction: a connection,
+and the session on it, never moves.
+
+    sup = Supervisor(4, worker_main, options, preload=warm_up)
+    sup.start()                     # preload(), then fork the workers
+    sup.serve(listener)             # accept + route until interrupted
+    sup.close()
+
+    # in each worker
+    await accept_routed(channel, handle)    # handle(reader, writer, sid)
+
+Shared read-only data: preload() runs in the supervisor before the
+workers fork (the compiled room catalog, every room decoded, the
+compiled sentiment lexicon). gc.freeze() then moves all of it out of the
+collector's generations, so workers read the parent's pages instead of
+loading copies of their own. The catalog records themselves stay in the
+one mmap'd cache file (engine.catalog). Where fork is not available,
+workers start fresh and load their own copies.
+
+If a worker dies, sessions it owned are lost and new ones for its shard
+go to the next live worker. Routing follows the connection, not the
+player: a player who reconnects may land on another worker, which sees
+that player's save once the first worker's AutosaveBatcher has written it
+(within its interval, 0.5 s by default).
+"""
+import asyncio, gc, multiprocessing, os, socket
+
+def shard_of(sid: int, n: int) -> int:
+    return sid % n
+
+class Supervisor:
+    def __init__(self, workers: int, target, options: dict, preload=None):
+        """target(channel, options) is a worker's main; it must be a module-level function."""
+        self.n = workers
+        self.target = target
+        self.options = options
+        self.preload = preload
+        self.procs = []
+        self.channels = []
+        self.routed = [0] * workers
+
+    def start(self):
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        forked = ctx.get_start_method() == "fork"
+        options = dict(self.options)
+        if self.preload is not None and forked:
+            options.update(self.preload() or {})
+            gc.freeze()
+        for i in range(self.n):
+            ours, theirs = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+            # a forked worker inherits our ends of the earlier workers' channels; it closes
+            # them, or a worker would never see EOF when the supervisor goes away
+            inherited = [ch.fileno() for ch in self.channels + [ours]] if forked else []
+            p = ctx.Process(target=_worker_entry, args=(self.target, theirs, dict(options, worker=i), inherited),
+                            name=f"shard-{i}", daemon=True)
+            p.start()
+            theirs.close()
+            self.procs.append(p)
+            self.channels.append(ours)
+        if forked:
+            gc.unfreeze()
+
+    def route(self, sid: int, conn: socket.socket) -> int:
+        """Hand `conn` to its worker; returns the worker index (-1 if none is alive)."""
+        first = shard_of(sid, self.n)
+        for k in range(self.n):
+            i = (first + k) % self.n
+            if self.channels[i] is None:
+                continue
+            try:
+                socket.send_fds(self.channels[i], [sid.to_bytes(8, "little")], [conn.fileno()])
+            except OSError:
+                self.channels[i].close()
+                self.channels[i] = None         # that worker is gone
+                continue
+            self.routed[i] += 1
+            return i
+        return -1
+
+    def serve(self, listener: socket.socket):
+        """Accept connections forever, numbering sessions from 1."""
+        sid = 0
+        while True:
+            conn, _ = listener.accept()
+            sid += 1
+            try:
+                self.route(sid, conn)
+            finally:
+                conn.close()            # the worker has its own copy of the socket
+
+    def close(self, timeout: float = 5.0):
+        # a closed channel tells the worker to stop taking sessions
+        for ch in self.channels:
+            if ch is not None:
+                ch.close()
+        for p in self.procs:
+            p.join(timeout)
+            if p.is_alive():
+                p.terminate()
+                p.join()
+
+def _worker_entry(target, channel, options, inherited):
+    for fd in inherited:
+        os.close(fd)
+    target(channel, options)
+
+async def accept_routed(channel: socket.socket, handle):
+    """
+    In a worker: run handle(reader, writer, sid) for every connection the
+    supervisor routes here, until the supervisor closes the channel.
+    Sessions still running then are cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    channel.setblocking(False)
+    closed = loop.create_future()
+    sessions = set()
+
+    def on_routed():
+        try:
+            msg, fds, _, _ = socket.recv_fds(channel, 64, 4)
+        except BlockingIOError:
+            return
+        except OSError:
+            msg, fds = b"", []
+        if not msg:
+            loop.remove_reader(channel.fileno())
+            if not closed.done():
+                closed.set_result(None)
+            return
+        sid = int.from_bytes(msg, "little")
+        for fd in fds[1:]:
+            os.close(fd)
+        task = loop.create_task(_serve_routed(socket.socket(fileno=fds[0]), sid, handle))
+        sessions.add(task)
+        task.add_done_callback(sessions.discard)
+
+    loop.add_reader(channel.fileno(), on_routed)
+    try:
+        await closed
+    finally:
+        for task in list(sessions):
+            task.cancel()
+        if sessions:
+            await asyncio.gather(*sessions, return_exceptions=True)
+        channel.close()
+
+async def _serve_routed(sock, sid, handle):
+    reader, writer = await asyncio.open_connection(sock=sock)
+    await handle(reader, writer, sid)
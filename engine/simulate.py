@@ -0,0 +1,297 @@
+"""
+Monte Carlo player populations through the real game.
+
+Every simulated player steps the actual Game (rooms, MoodEngine, the
+mood-based hint strengths and guidance lines) on a SimClock, with
+telemetry off and no console, so think times and intro pauses cost no
+wall time. A Population describes the players:
+
+    think_median, think_sigma   log-normal seconds per answer (times a per-player speed)
+    speed_sigma                 spread of the per-player speed factor
+    skill_a, skill_b            Beta distribution of the per-attempt chance to be right
+    difficulty                  {room id: multiplier on that chance}
+    learn                       chance gained per wrong answer
+    hint_boost                  chance gained per hint, by hint strength
+    hint_rate                   chance to ask for a hint before an attempt
+    hint_nudge                  extra chance after guidance that suggests 'hint'
+    quit_rate, quit_stress      chance to give up after a wrong answer (times quit_stress when stressed)
+    max_attempts                answers per room before a player gives up regardless
+    vent_rate, typo_rate        share of wrong answers that vent ("idk", "I'M STUCK!!!") or are typos
+    shout_rate                  share of answers typed in capitals
+
+Rooms cannot be failed, so "game over" here is a player abandoning the
+maze; the report says in which room. Sessions run in fixed-size chunks,
+each seeded from (seed, chunk), so results do not depend on --jobs:
+
+    python -m engine.simulate --sessions 1000000 --jobs 8 --seed 1
+    python -m engine.simulate --population my_players.json --json reports/sim.json
+"""
+import argparse, json, math, os, random, time
+from engine.clock import SimClock
+from engine.game import Game
+from engine.histogram import Histogram
+from engine.inventory import Inventory
+from engine.telemetry import Telemetry
+from mood import MoodEngine
+
+STATES = ("stressed", "focused", "neutral", "calm", "excited")
+STRENGTHS = ("soft", "normal", "strong")
+VENTS = ("idk", "no idea", "this is so hard", "I'M STUCK!!!", "help me", "ugh", "I hate this", "boring")
+DECOYS = ("door", "key", "light", "1234", "open", "sun", "wind", "0000", "exit", "voice")
+CHUNK = 1000
+
+class Population:
+    DEFAULTS = {
+        "think_median": 12.0, "think_sigma": 0.8, "speed_sigma": 0.4,
+        "skill_a": 2.0, "skill_b": 3.0, "difficulty": {"room2": 0.6, "room3": 0.8},
+        "learn": 0.05, "hint_boost": {"soft": 0.1, "normal": 0.2, "strong": 0.35},
+        "hint_rate": 0.1, "hint_nudge": 0.3,
+        "quit_rate": 0.03, "quit_stress": 3.0, "max_attempts": 30,
+        "vent_rate": 0.15, "typo_rate": 0.4, "shout_rate": 0.05,
+    }
+
+    def __init__(self, **params):
+        unknown = set(params) - set(self.DEFAULTS)
+        if unknown:
+            raise ValueError(f"unknown population parameter(s): {', '.join(sorted(unknown))}")
+        for name, default in self.DEFAULTS.items():
+            value = params.get(name, default)
+            setattr(self, name, dict(default, **value) if isinstance(default, dict) else value)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.DEFAULTS}
+
+def accepted_answers(room) -> list:
+    """What a room accepts, for players who know the answer."""
+    return sorted(room.matcher.accepted)
+
+def typo(rng, word):
+    if len(word) < 2:
+        return word + word
+    i = rng.randrange(len(word) - 1)
+    if rng.random() < 0.5:
+        return word[:i] + word[i + 1:]                          # dropped letter
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]      # swapped letters
+
+class RoomStats:
+    def __init__(self):
+        self.entered = 0
+        self.solved = 0
+        self.abandoned = 0
+        self.hints = 0
+        self.solve_time = Histogram(unit=0.01, highest=7200.0)
+        self.wrong_before = {}          # wrong answers before success -> sessions
+        self.hint_states = {}           # mood_state when a hint was asked for
+        self.hint_strengths = {}
+        self.guidance = {}              # mood_state behind the line shown after a wrong answer
+
+    def merge(self, other):
+        self.entered += other.entered
+        self.solved += other.solved
+        self.abandoned += other.abandoned
+        self.hints += other.hints
+        self.solve_time.merge(other.solve_time)
+        for mine, theirs in ((self.wrong_before, other.wrong_before), (self.hint_states, other.hint_states),
+                             (self.hint_strengths, other.hint_strengths), (self.guidance, other.guidance)):
+            for k, v in theirs.items():
+                mine[k] = mine.get(k, 0) + v
+
+class SimStats:
+    def __init__(self):
+        self.sessions = 0
+        self.escaped = 0
+        self.rooms = {}                 # room id -> RoomStats, in play order
+        self.duration = Histogram(unit=0.01, highest=36000.0)
+
+    def room(self, room_id) -> RoomStats:
+        rs = self.rooms.get(room_id)
+        if rs is None:
+            rs = self.rooms[room_id] = RoomStats()
+        return rs
+
+    def merge(self, other):
+        self.sessions += other.sessions
+        self.escaped += other.escaped
+        for room_id, rs in other.rooms.items():
+            self.room(room_id).merge(rs)
+        self.duration.merge(other.duration)
+        return self
+
+def _bump(d, key):
+    d[key] = d.get(key, 0) + 1
+
+def play_session(game, pop, rng, stats):
+    """One simulated player through the whole maze."""
+    clock = SimClock()
+    me = MoodEngine()
+    state = game.new_state(me, Inventory(), Telemetry(enabled=False), 1.0, clock)
+    state.saved = {}
+    state, out = game.start(state)
+    clock.sleep(out.pending())
+
+    skill = rng.betavariate(pop.skill_a, pop.skill_b)
+    speed = rng.lognormvariate(0.0, pop.speed_sigma)
+    think_mu = math.log(pop.think_median)
+    stats.sessions += 1
+
+    while state.phase == "room":
+        idx = state.room_idx
+        room = game.rooms[idx]
+        rs = stats.room(room.id)
+        rs.entered += 1
+        answers = accepted_answers(room)
+        chance = skill * pop.difficulty.get(room.id, 1.0)
+        hint_rate = pop.hint_rate
+        nudged = False
+        wrong = 0
+        started = state.room_state.started
+        while state.phase == "room" and state.room_idx == idx:
+            if rng.random() < hint_rate + (pop.hint_nudge if nudged else 0.0):
+                mood = me.mood_state()
+                _, strength = me.hint_policy()
+                clock.advance(rng.uniform(1.0, 5.0) * speed)
+                state, out, _ = game.step(state, "hint")
+                clock.sleep(out.pending())
+                rs.hints += 1
+                _bump(rs.hint_states, mood)
+                _bump(rs.hint_strengths, strength)
+                chance += pop.hint_boost.get(strength, 0.0)
+                hint_rate *= 0.5
+                nudged = False
+                continue
+
+            if rng.random() < chance:
+                text = rng.choice(answers)
+            elif rng.random() < pop.vent_rate:
+                text = rng.choice(VENTS)
+            elif rng.random() < pop.typo_rate:
+                text = typo(rng, rng.choice(answers))
+            else:
+                text = rng.choice(DECOYS)
+            if rng.random() < pop.shout_rate:
+                text = text.upper()
+            clock.advance(rng.lognormvariate(think_mu, pop.think_sigma) * speed)
+            solved_at = clock.now() - started
+            state, out, _ = game.step(state, text)
+            clock.sleep(out.pending())
+            if state.room_idx != idx or state.phase != "room":
+                rs.solved += 1
+                rs.solve_time.record(solved_at)
+                _bump(rs.wrong_before, wrong)
+                break
+
+            wrong += 1
+            chance += pop.learn
+            mood = me.mood_state()
+            _bump(rs.guidance, mood)
+            nudged = any("'hint'" in line for line, _ in out)
+            quit_p = pop.quit_rate * (pop.quit_stress if mood == "stressed" else 1.0)
+            if wrong >= pop.max_attempts or rng.random() < quit_p:
+                rs.abandoned += 1
+                stats.duration.record(clock.now())
+                return False
+    stats.escaped += state.escaped
+    stats.duration.record(clock.now())
+    return state.escaped
+
+_rooms = None
+
+def _run_chunk(job):
+    global _rooms
+    seed, chunk, n, pop, catalog_path = job
+    if _rooms is None:
+        from main import build_rooms
+        _rooms = build_rooms(catalog_path)
+    game = Game(_rooms, save_path=None, csv_path=None, plot_path=None)
+    population = Population(**pop)
+    rng = random.Random(f"{seed}:{chunk}")
+    stats = SimStats()
+    for _ in range(n):
+        play_session(game, population, rng, stats)
+    return stats
+
+def simulate(sessions, population=None, seed=1, jobs=None, catalog_path=os.path.join("data", "rooms.json")):
+    """Merged SimStats of `sessions` players, run in chunks across `jobs` processes."""
+    pop = (population or Population()).to_dict()
+    work = [(seed, c, min(CHUNK, sessions - c * CHUNK), pop, catalog_path)
+            for c in range((sessions + CHUNK - 1) // CHUNK)]
+    total = SimStats()
+    if (jobs or 1) > 1 and len(work) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(jobs) as pool:
+            for stats in pool.map(_run_chunk, work):
+                total.merge(stats)
+    else:
+        for job in work:
+            total.merge(_run_chunk(job))
+    return total
+
+def _shares(counts, keys):
+    n = sum(counts.values()) or 1
+    return " ".join(f"{k[:4]} {100.0 * counts.get(k, 0) / n:3.0f}%" for k in keys)
+
+def report(stats) -> str:
+    n = stats.sessions or 1
+    d = stats.duration.summary()
+    lines = [f"sessions {stats.sessions}: escaped {100.0 * stats.escaped / n:.1f}%, "
+             f"abandoned {100.0 * (stats.sessions - stats.escaped) / n:.1f}%; "
+             f"session length p50 {d['p50'] / 60:.1f} min, p95 {d['p95'] / 60:.1f} min",
+             f"{'room':<14} {'entered':>8} {'solved%':>8} {'quit%':>6} {'p50 s':>7} {'p90 s':>7} {'p99 s':>7} "
+             f"{'wrong':>6} {'hints/1k':>9}  hint strength / guidance mood"]
+    for room_id, rs in stats.rooms.items():
+        e = rs.entered or 1
+        solved = rs.solved or 1
+        wrong = sum(k * v for k, v in rs.wrong_before.items()) / solved
+        st = rs.solve_time
+        lines.append(f"{room_id:<14} {rs.entered:>8} {100.0 * rs.solved / e:>8.1f} {100.0 * rs.abandoned / e:>6.1f} "
+                     f"{st.percentile(50):>7.1f} {st.percentile(90):>7.1f} {st.percentile(99):>7.1f} "
+                     f"{wrong:>6.2f} {1000.0 * rs.hints / e:>9.0f}  "
+                     f"{_shares(rs.hint_strengths, STRENGTHS)} | {_shares(rs.guidance, STATES)}")
+    return "\n".join(lines)
+
+def to_json(stats) -> dict:
+    return {
+        "sessions": stats.sessions, "escaped": stats.escaped,
+        "duration": stats.duration.summary(),
+        "rooms": {room_id: {
+            "entered": rs.entered, "solved": rs.solved, "abandoned": rs.abandoned, "hints": rs.hints,
+            "solve_time": rs.solve_time.summary((50, 90, 95, 99)),
+            "wrong_before_success": {str(k): v for k, v in sorted(rs.wrong_before.items())},
+            "hint_mood_states": rs.hint_states, "hint_strengths": rs.hint_strengths,
+            "guidance_mood_states": rs.guidance,
+        } for room_id, rs in stats.rooms.items()},
+    }
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Simulate player populations through the real rooms and MoodEngine.")
+    ap.add_argument("--sessions", type=int, default=100000)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--jobs", type=int, default=None, help="processes (default: all cores)")
+    ap.add_argument("--population", help="JSON file overriding Population.DEFAULTS")
+    ap.add_argument("--rooms", default=os.path.join("data", "rooms.json"))
+    ap.add_argument("--json", help="also write the results here")
+    args = ap.parse_args(argv)
+
+    try:
+        pop = Population.load(args.population) if args.population else Population()
+    except (OSError, ValueError) as e:
+        ap.error(str(e))
+    jobs = args.jobs or os.cpu_count()
+    t0 = time.perf_counter()
+    stats = simulate(args.sessions, pop, args.seed, jobs, args.rooms)
+    elapsed = time.perf_counter() - t0
+    print(report(stats))
+    print(f"{stats.sessions} sessions in {elapsed:.1f}s ({stats.sessions / elapsed:.0f} sessions/s, {jobs} jobs)")
+    if args.json:
+        if os.path.dirname(args.json):
+            os.makedirs(os.path.dirname(args.json), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"population": pop.to_dict(), "seed": args.seed, **to_json(stats)}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Versioned session snapshots.
+
+A snapshot is a small JSON-ready dict with everything needed to continue a
+session exactly where it stopped, even in the middle of a room:
+
+    v        SNAPSHOT_VERSION
+    room     index of the current room
+    entry    True at a room boundary (the room's intro has not been shown yet)
+    wrong    wrong_attempts in the current room
+    elapsed  seconds on the room's answer clock
+    prompt   the prompt the player was answering
+    scores   MoodEngine.scores (and `history`, its maxlen)
+    agg      the mood aggregator's own state (EWMA / time-decay), if any
+    items    inventory
+    stream   with a streaming telemetry sink: {"path", "offset"}, where its
+             timeline file ended; a resume continues that file
+    offset   otherwise: wall-clock offset of the stamps in `events`
+    events   otherwise: the telemetry journal so far, as (monotonic ns, fields)
+
+Game takes one after every answer and stores it in the save under "snapshot";
+restore() rebuilds the session from it without replaying anything.
+"""
+from engine.telemetry import EPOCH_OFFSET_NS
+
+SNAPSHOT_VERSION = 1
+
+def take(state, entry: bool = False, room_idx=None) -> dict:
+    """Snapshot a GameState. entry=True records the start of room `room_idx` instead of the current room."""
+    me = state.mood_engine
+    telemetry = state.telemetry
+    snap = {
+        "v": SNAPSHOT_VERSION,
+        "room": state.room_idx if room_idx is None else room_idx,
+        "entry": entry,
+        "scores": list(me.scores) if me is not None else [],
+        "history": me.scores.maxlen if me is not None else None,
+        "agg": me.aggregator.dump() if me is not None else None,
+        "items": state.inventory.list(),
+    }
+    stream = telemetry.stream_position()
+    if stream is not None:
+        snap["stream"] = {"path": stream[0], "offset": stream[1]}
+    else:
+        journal = telemetry.journal
+        snap["offset"] = EPOCH_OFFSET_NS
+        snap["events"] = journal[:] if journal is not None else []
+    if not entry:
+        rs = state.room_state
+        snap["wrong"] = rs.wrong_attempts
+        snap["elapsed"] = rs.clock.now() - rs.started
+        snap["prompt"] = rs.prompt
+    return snap
+
+def usable(snap) -> bool:
+    return isinstance(snap, dict) and snap.get("v") == SNAPSHOT_VERSION
+
+def restore(state, snap):
+    """
+    Put mood history, inventory and telemetry from `snap` back into a fresh
+    GameState. The caller enters the room (at entry) or calls resume_room().
+    """
+    me = state.mood_engine
+    if me is not None:
+        me.restore_scores(snap["scores"], snap.get("history"), snap.get("agg"))
+    for item in snap["items"]:
+        state.inventory.add(item)
+    stream = snap.get("stream")
+    if stream is not None:
+        state.telemetry.resume_stream(stream["path"], stream["offset"])
+    else:
+        state.telemetry.restore(snap["events"], snap["offset"])
+
+def resume_room(room, state, snap):
+    """A room state continuing mid-room: same wrong attempts, prompt and answer clock."""
+    rs = room.new_state(state.mood_engine, state.telemetry, state.inventory, state.pace, state.clock)
+    rs.wrong_attempts = snap["wrong"]
+    rs.prompt = snap["prompt"]
+    rs.started = rs.clock.now() - snap["elapsed"]
+    return rs
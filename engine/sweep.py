@@ -0,0 +1,206 @@
+"""
+MoodEngine parameter sweep over recorded session timelines.
+
+Every timeline is turned back into what the mood engine saw (answers with
+their recovered seconds, correctness and wrong attempts, plus hint
+requests) the same way engine.replay does. Each parameter set then
+re-scores the whole corpus at once with NumPy, spread over a process pool,
+and the sweep reports per setting how the mood states and hint-policy
+decisions come out:
+
+    python -m engine.sweep reports/sessions --set history_size=4,6,8 \\
+        --set wrong_weight=-0.6,-0.8,-1.0 --set thresholds=-1.2/-0.2/0.2/1.2,-1.0/-0.3/0.3/1.0
+
+Parameters: history_size plus MoodEngine.PARAMS (time_cap, time_weight,
+wrong_cap, wrong_weight, correct_bonus, near_miss_bonus, thresholds). The lexicon part of
+the score does not depend on them and is computed once per answer.
+"""
+import argparse, csv, glob, itertools, json, os, time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from engine.batch_mood import STATES, STRENGTHS, NEUTRAL, _STRENGTH_OF, classify
+from engine.replay import load_recording
+from mood import MoodEngine
+
+PARAM_NAMES = ("history_size",) + MoodEngine.PARAMS
+DEFAULTS = {"history_size": 6, **{p: getattr(MoodEngine, p.upper()) for p in MoodEngine.PARAMS}}
+
+# ---- corpus ------------------------------------------------------------------
+
+def _read_chunk(paths):
+    from main import build_rooms
+    rooms = build_rooms()
+    lexicon = {}
+    me = MoodEngine()
+    out = []
+    for p in paths:
+        rec = load_recording(p, rooms)
+        lex, seconds, correct, wrong, near, hints = [], [], [], [], [], []
+        for turn in rec.turns:
+            if turn[0] == "hint":
+                hints.append(len(lex) - 1)      # state after the last answer (-1: none yet)
+                continue
+            _, text, at, ok, wa, nm = turn
+            v = lexicon.get(text)
+            if v is None:
+                v = lexicon[text] = me._lexicon_score(text)
+            lex.append(v)
+            seconds.append(at)
+            correct.append(ok)
+            wrong.append(wa)
+            near.append(nm)
+        recorded = [STATES.index(s) for s in rec.states] if len(rec.states) == len(lex) else None
+        out.append((lex, seconds, correct, wrong, near, hints, recorded))
+    return out
+
+class Corpus:
+    """Every answer of every session as flat arrays (sessions back to back)."""
+    def __init__(self, sessions):
+        self.n_sessions = len(sessions)
+        lens = [len(s[0]) for s in sessions]
+        self.lex = np.array([v for s in sessions for v in s[0]], dtype=float)
+        self.seconds = np.array([v for s in sessions for v in s[1]], dtype=float)
+        self.correct = np.array([v for s in sessions for v in s[2]], dtype=bool)
+        self.wrong = np.array([v for s in sessions for v in s[3]], dtype=np.int64)
+        self.near = np.array([v for s in sessions for v in s[4]], dtype=bool)
+        starts = np.concatenate([[0], np.cumsum(lens)[:-1]]).astype(np.int64) if lens else np.zeros(0, np.int64)
+        self.pos = np.arange(len(self.lex)) - np.repeat(starts, lens)      # answer index within its session
+        # hint requests: index (into the flat arrays) of the answer whose state they see, -1 = none
+        self.hint_at = np.array([start + h if h >= 0 else -1 for start, s in zip(starts, sessions) for h in s[5]],
+                                dtype=np.int64)
+        recorded = [r if r is not None else [-1] * n for (*_, r), n in zip(sessions, lens)]
+        self.recorded = np.array([c for r in recorded for c in r], dtype=np.int64)
+
+def load_corpus(paths, jobs=None, chunk=256):
+    chunks = [paths[i:i + chunk] for i in range(0, len(paths), chunk)]
+    if (jobs or 1) > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(jobs) as pool:
+            sessions = [s for part in pool.map(_read_chunk, chunks) for s in part]
+    else:
+        sessions = [s for c in chunks for s in _read_chunk(c)]
+    return Corpus(sessions)
+
+# ---- scoring ---------------------------------------------------------------------
+
+def rescore(corpus, setting):
+    """Mood-state code of every answer in the corpus under `setting`."""
+    me = MoodEngine(params={k: v for k, v in setting.items() if k != "history_size"})
+    t = np.clip(corpus.seconds, 0.0, me.TIME_CAP)
+    raw = (me.TIME_WEIGHT * (t / 30.0) + me.WRONG_WEIGHT * np.clip(corpus.wrong, 0, me.WRONG_CAP)
+           + np.where(corpus.correct, me.CORRECT_BONUS, 0.0)
+           + np.where(corpus.near & ~corpus.correct, me.NEAR_MISS_BONUS, 0.0) + corpus.lex)
+    raw = np.clip(raw, -me.SCORE_CAP, me.SCORE_CAP)
+    h = int(setting.get("history_size", DEFAULTS["history_size"]))
+    n = len(raw)
+    total = np.zeros(n)
+    idx = np.arange(n)
+    # window mean per session, oldest score first like sum(MoodEngine.scores)
+    for k in reversed(range(h)):
+        np.add(total, raw[np.maximum(idx - k, 0)], out=total, where=corpus.pos >= k)
+    avg = total / np.minimum(corpus.pos + 1, h)
+    return classify(avg, me.THRESHOLDS)
+
+def summarize(corpus, states, baseline=None) -> dict:
+    n = max(1, len(states))
+    out = {f"{s}%": 100.0 * np.count_nonzero(states == i) / n for i, s in enumerate(STATES)}
+    # rooms offer a strong hint (and "Breathe..." guidance) when the state is stressed
+    out["hint_offer%"] = out["stressed%"]
+    at = corpus.hint_at
+    hint_states = np.where(at >= 0, states[np.maximum(at, 0)], NEUTRAL) if len(states) else np.full(len(at), NEUTRAL)
+    strengths = _STRENGTH_OF[hint_states.astype(np.int64)]
+    m = max(1, len(at))
+    for i, s in enumerate(STRENGTHS):
+        out[f"hint_{s}%"] = 100.0 * np.count_nonzero(strengths == i) / m
+    if baseline is not None:
+        out["changed%"] = 100.0 * np.count_nonzero(states != baseline) / n
+    return out
+
+_corpus = _baseline = None
+
+def _init(corpus, baseline):
+    global _corpus, _baseline
+    _corpus, _baseline = corpus, baseline
+
+def _evaluate(setting):
+    return summarize(_corpus, rescore(_corpus, setting), _baseline)
+
+def sweep(corpus, settings, jobs=None):
+    """[(setting, summary)] for every setting, scored across `jobs` processes."""
+    baseline = rescore(corpus, DEFAULTS)
+    if (jobs or 1) > 1 and len(settings) > 1:
+        with ProcessPoolExecutor(jobs, initializer=_init, initargs=(corpus, baseline)) as pool:
+            results = list(pool.map(_evaluate, settings, chunksize=max(1, len(settings) // (4 * jobs))))
+    else:
+        _init(corpus, baseline)
+        results = [_evaluate(s) for s in settings]
+    return list(zip(settings, results))
+
+# ---- grid ------------------------------------------------------------------------
+
+def parse_value(name, text):
+    if name == "thresholds":
+        return tuple(float(v) for v in text.split("/"))
+    if name in ("history_size", "wrong_cap"):
+        return int(text)
+    return float(text)
+
+def make_grid(specs, grid_file=None):
+    """Cartesian product of --set name=v1,v2 specs (and/or a JSON {name: [values]} file)."""
+    axes = {}
+    if grid_file:
+        with open(grid_file, "r", encoding="utf-8") as f:
+            for name, values in json.load(f).items():
+                axes[name] = [tuple(v) if name == "thresholds" else v for v in values]
+    for spec in specs or ():
+        name, _, values = spec.partition("=")
+        axes[name] = [parse_value(name, v) for v in values.split(",")]
+    unknown = set(axes) - set(PARAM_NAMES)
+    if unknown:
+        raise ValueError(f"unknown parameter(s): {', '.join(sorted(unknown))}; choose from {', '.join(PARAM_NAMES)}")
+    names = list(axes)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(axes[n] for n in names))] or [{}]
+
+def describe(setting):
+    parts = []
+    for k, v in setting.items():
+        parts.append(f"{k}={'/'.join(f'{x:g}' for x in v) if k == 'thresholds' else f'{v:g}'}")
+    return " ".join(parts) or "defaults"
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Re-score recorded sessions under a grid of MoodEngine parameters.")
+    ap.add_argument("source", help="directory of *.csv session timelines")
+    ap.add_argument("--set", action="append", metavar="NAME=V1,V2", help="parameter axis (thresholds as a/b/c/d)")
+    ap.add_argument("--grid", help="JSON file {name: [values]}")
+    ap.add_argument("--jobs", type=int, default=None, help="processes (default: all cores)")
+    ap.add_argument("--csv", help="also write the results table here")
+    args = ap.parse_args(argv)
+
+    jobs = args.jobs or os.cpu_count()
+    try:
+        settings = make_grid(args.set, args.grid)
+    except ValueError as e:
+        ap.error(str(e))
+    t0 = time.perf_counter()
+    corpus = load_corpus(sorted(glob.glob(os.path.join(args.source, "*.csv"))), jobs)
+    t1 = time.perf_counter()
+    results = sweep(corpus, settings, jobs)
+    t2 = time.perf_counter()
+
+    known = corpus.recorded >= 0
+    agree = np.mean(rescore(corpus, DEFAULTS)[known] == corpus.recorded[known]) * 100 if known.any() else float("nan")
+    print(f"{corpus.n_sessions} sessions, {len(corpus.lex)} answers, {len(corpus.hint_at)} hint requests "
+          f"(loaded in {t1 - t0:.1f}s); defaults reproduce {agree:.2f}% of recorded mood states")
+    cols = [f"{s}%" for s in STATES] + ["hint_offer%"] + [f"hint_{s}%" for s in STRENGTHS] + ["changed%"]
+    print(f"{'setting':<48} " + " ".join(f"{c:>11}" for c in cols))
+    for setting, res in results:
+        print(f"{describe(setting):<48} " + " ".join(f"{res[c]:>11.1f}" for c in cols))
+    print(f"{len(settings)} settings in {t2 - t1:.2f}s")
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["setting"] + cols)
+            for setting, res in results:
+                w.writerow([describe(setting)] + [f"{res[c]:.3f}" for c in cols])
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,216 @@
-"""Collects gameplay events and can export CSV and a simple mood plot."""
+"""
+Collects gameplay events and can export CSV and a simple mood plot.
+
+Events are stamped with time.monotonic_ns() and only turned into ISO
+wall-clock strings when they are exported.
+"""
 from datetime import datetime
-import csv, os
+from time import monotonic_ns
+import csv, json, os, time
+
+# wall-clock ns = monotonic ns + this offset (fixed when the process starts)
+EPOCH_OFFSET_NS = time.time_ns() - monotonic_ns()
+
+# Fixed column order for streamed timelines; unknown log fields go to "extra" as JSON.
+FIELDS = ("ts", "room", "event", "input", "correct", "mood_score", "mood_state",
+          "item", "next_room", "items", "at", "extra")
+
+class CsvStreamSink:
+    """
+    Append-only CSV timeline with the fixed FIELDS schema. Rows are buffered
+    and written once `flush_every` rows are pending or a write comes
+    `flush_interval` seconds after the last flush. Game also flushes after
+    every start/step, so nothing waits in the buffer while the player thinks;
+    a crash loses at most the turn in progress.
+    """
+    def __init__(self, path, flush_every: int = 64, flush_interval: float = 1.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._f = open(path, "w", newline="", encoding="utf-8")
+        self._w = csv.writer(self._f)
+        self._w.writerow(FIELDS)
+        self._buf = []
+        self.flush()
+
+    def write(self, ts: int, fields: dict):
+        self._buf.append((ts, fields))
+        if len(self._buf) >= self.flush_every or time.monotonic() - self._last >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self._buf:
+            self._w.writerows(to_row(ts, fields) for ts, fields in self._buf)
+            self._buf.clear()
+        self._f.flush()
+        self._last = time.monotonic()
+
+    def close(self):
+        if not self._f.closed:
+            self.flush()
+            self._f.close()
+
+    def position(self):
+        """(absolute path, byte offset) of the end of the stream so far, for a snapshot."""
+        self.flush()
+        return os.path.abspath(self.path), self._f.tell()
+
+    def resume(self, path, offset: int) -> bool:
+        """
+        Continue the timeline a snapshot recorded: the first `offset` bytes of
+        `path` (its header and rows up to the snapshot) go in front of the rows
+        written here so far, later rows append, and `path` is removed, so the
+        resumed session stays one file. False (and nothing changes) if `path`
+        is gone or shorter than `offset`.
+        """
+        if os.path.abspath(path) == os.path.abspath(self.path):
+            return True
+        try:
+            with open(path, "rb") as f:
+                head = f.read(offset)
+        except OSError:
+            return False
+        if len(head) < offset:
+            return False
+        self.flush()
+        self._f.close()
+        with open(self.path, "rb") as f:
+            f.readline()                    # our own header; `head` starts with one
+            ours = f.read()
+        with open(self.path, "wb") as f:
+            f.write(head)
+            f.write(ours)
+        os.remove(path)
+        self._f = open(self.path, "a", newline="", encoding="utf-8")
+        self._w = csv.writer(self._f)
+        self._last = time.monotonic()
+        return True
+
+    def rows(self):
+        """Read the stream back as dicts (all values are strings)."""
+        if not self._f.closed:
+            self.flush()
+        with open(self.path, "r", newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+def format_ts(ts: int, offset_ns: int = None) -> str:
+    """ISO wall-clock time (ms) for a monotonic_ns() stamp."""
+    wall_ns = ts + (EPOCH_OFFSET_NS if offset_ns is None else offset_ns)
+    return datetime.fromtimestamp(wall_ns / 1e9).isoformat(timespec="milliseconds")
+
+def to_row(ts: int, fields: dict) -> list:
+    """One FIELDS-ordered CSV row; consumes `fields`."""
+    row = [format_ts(ts)]
+    row.extend(fields.pop(k, "") for k in FIELDS[1:-1])
+    row.append(json.dumps(fields, ensure_ascii=False) if fields else "")
+    return row
+
+def _off(**kwargs):
+    pass
 
 class Telemetry:
-    def __init__(self):
+    def __init__(self, sink=None, enabled: bool = True, sample=None):
+        """
+        Keeps events in memory as dicts, or hands them to `sink` instead
+        (CsvStreamSink, ColumnarStore): anything with write(ts, fields),
+        rows(), flush() and close().
+
+        sample maps event names to "keep 1 in N" (0 drops that event type),
+        e.g. {"mood_tick": 10}. A disabled Telemetry is falsy, so the
+        `if telemetry:` guards in the rooms skip all work, and log() is a no-op.
+
+        Set `journal` to a list to also keep a copy of every logged event as
+        (ts, fields); session snapshots carry it so a resume keeps the timeline.
+        A streaming sink (one with position() / resume()) needs no journal:
+        snapshots record where the stream file ends and a resume appends to it.
+        """
         self.events = []
+        self.sink = sink
+        self.enabled = enabled
+        self.sample = dict(sample or {})
+        self.seen = {}          # per sampled event type: how many were logged
+        self.journal = None
+        if not enabled:
+            self.log = _off
+
+    def __bool__(self):
+        return self.enabled
 
     def log(self, **kwargs):
-        rec = {"ts": datetime.now().isoformat(timespec="seconds")}
-        rec.update(kwargs)
-        self.events.append(rec)
+        ts = monotonic_ns()
+        if self.sample:
+            event = kwargs.get("event")
+            n = self.sample.get(event, 1)
+            if n != 1:
+                if n <= 0:
+                    return
+                c = self.seen.get(event, 0)
+                self.seen[event] = c + 1
+                if c % n:
+                    return
+        self._write(ts, kwargs)
+
+    def _write(self, ts, fields):
+        if self.journal is not None:
+            self.journal.append((ts, dict(fields)))
+        if self.sink is not None:
+            self.sink.write(ts, fields)
+            return
+        fields["ts"] = ts
+        self.events.append(fields)
+
+    @property
+    def streaming(self) -> bool:
+        """True if the sink keeps the timeline in a file a snapshot can point into."""
+        return self.enabled and hasattr(self.sink, "position")
+
+    def stream_position(self):
+        """(path, byte offset) of a streaming sink, or None."""
+        return self.sink.position() if self.streaming else None
+
+    def resume_stream(self, path, offset: int) -> bool:
+        """Continue the stream file a snapshot recorded (see CsvStreamSink.resume)."""
+        return self.sink.resume(path, offset) if self.streaming else False
+
+    def restore(self, entries, offset_ns: int):
+        """Re-log journal entries taken in a process with `offset_ns`, keeping their wall-clock time."""
+        if not self.enabled:
+            return
+        shift = offset_ns - EPOCH_OFFSET_NS
+        for ts, fields in entries:
+            self._write(ts + shift, dict(fields))
+
+    def flush(self):
+        """Write out whatever the sink buffers (a no-op in memory)."""
+        if self.sink is not None:
+            self.sink.flush()
+
+    def iter_events(self):
+        return self.sink.rows() if self.sink is not None else iter(self.events)
+
+    def close(self):
+        if self.sink is not None:
+            self.sink.close()
 
     def export_csv(self, path="reports/session_timeline.csv"):
         os.makedirs(os.path.dirname(path), exist_ok=True)
+        if self.sink is not None:
+            self.sink.flush()
+            src = getattr(self.sink, "path", None)
+            if src is None:
+                with open(path, "w", newline="", encoding="utf-8") as f:
+                    w = csv.writer(f)
+                    w.writerow(FIELDS)
+                    for r in self.sink.rows():
+                        extra = {k: v for k, v in r.items() if k not in FIELDS}
+                        w.writerow([r.get(k, "") for k in FIELDS[:-1]] + [json.dumps(extra, ensure_ascii=False) if extra else ""])
+            elif os.path.abspath(path) != os.path.abspath(src):
+                # the stream already is the timeline
+                import shutil
+                shutil.copyfile(src, path)
+            return
         if not self.events:
             return
 
@@ -33,29 +231,16 @@ class Telemetry:
             w = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
             w.writeheader()
             for e in self.events:
-                w.writerow({k: e.get(k, "") for k in fieldnames})
+                row = {k: e.get(k, "") for k in fieldnames}
+                row["ts"] = format_ts(e["ts"])
+                w.writerow(row)
     def export_mood_plot(self, path="reports/mood_timeline.png"):
-        """Save a simple line plot of mood_score over event index."""
-        os.makedirs(os.path.dirname(path), exist_ok=True)
+        """Render the mood plot in this process (blocking; the game uses engine.plots.PlotQueue instead)."""
+        from engine.plots import render_series
 
         xs, ys = [], []
-        for i, e in enumerate(self.events):
-            if "mood_score" in e:
+        for i, e in enumerate(self.iter_events()):
+            if e.get("mood_score") not in (None, ""):
                 xs.append(i)
                 ys.append(float(e["mood_score"]))
-        if not ys:
-            return  # nichts zu plotten
-
-        # Headless-Backend und Plot
-        import matplotlib
-        matplotlib.use("Agg")
-        import matplotlib.pyplot as plt
-
-        plt.figure()
-        plt.plot(xs, ys, marker="o")
-        plt.title("Mood score over time")
-        plt.xlabel("Event #")
-        plt.ylabel("Mood score")
-        plt.grid(True, alpha=0.3)
-        plt.savefig(path, bbox_inches="tight")
-        plt.close()
+        render_series(xs, ys, path)
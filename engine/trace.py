@@ -0,0 +1,148 @@
+"""
+Session tracing to Chrome / Perfetto trace-event JSON, off by default.
+
+    from engine.trace import TRACER
+    TRACER.enable()
+    ...play...
+    TRACER.write("reports/trace.json")     # open in ui.perfetto.dev or chrome://tracing
+
+Each session is one track (a "thread" in the viewer). The game records
+nested spans on it:
+
+    session
+      resume                  loading a save / snapshot (before the first room)
+      <room id>               from entering the room until it is solved or lost
+        prompt                waiting for the player: output shown, then typing
+        answer                the room handling one line of input
+          mood.observe
+        checkpoint            mid-room save (handed to the save store)
+      autosave                between rooms
+      export                  game over / escape
+        export.csv, export.plot
+
+Spans go into fixed arrays allocated by enable(): a name id, a track, and
+start and end times in perf_counter_ns, so recording a span keeps no
+objects alive and never grows a list. When the buffer is full, later spans
+are counted in `dropped` instead of recorded. Spans still open when the
+trace is written end at the write and are marked unfinished.
+"""
+import json
+from array import array
+from functools import wraps
+from time import perf_counter_ns
+
+CAPACITY = 1 << 17      # spans; 22 bytes each
+
+# span names every session uses, interned first so the game can use them as constants
+SESSION, RESUME, PROMPT, ANSWER, MOOD_OBSERVE, CHECKPOINT, AUTOSAVE, EXPORT, EXPORT_CSV, EXPORT_PLOT = range(10)
+_BUILTIN = (("session", "session"), ("resume", "save"), ("prompt", "player"), ("answer", "room"),
+            ("mood.observe", "mood"), ("checkpoint", "save"), ("autosave", "save"),
+            ("export", "export"), ("export.csv", "export"), ("export.plot", "export"))
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.reset(0)
+
+    def enable(self, capacity: int = CAPACITY):
+        self.reset(capacity)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self, capacity: int = CAPACITY):
+        self.capacity = capacity
+        self.names = list(_BUILTIN)         # name id -> (name, category)
+        self.name_ids = {name: i for i, (name, _) in enumerate(_BUILTIN)}
+        self.tracks = []                    # track id -> label
+        self.kind = array("H", bytes(2 * capacity))
+        self.track = array("I", bytes(4 * capacity))
+        self.start = array("q", bytes(8 * capacity))
+        self.end = array("q", bytes(8 * capacity))
+        self.n = 0
+        self.dropped = 0
+        self.origin = perf_counter_ns()
+
+    def name(self, name: str, category: str = "room") -> int:
+        """Id for a span name (room ids, say); the category is fixed by the first call."""
+        i = self.name_ids.get(name)
+        if i is None:
+            i = self.name_ids[name] = len(self.names)
+            self.names.append((name, category))
+        return i
+
+    def new_track(self, label: str) -> int:
+        self.tracks.append(label)
+        return len(self.tracks) - 1
+
+    def begin(self, track: int, name: int) -> int:
+        """Open a span now; returns its slot for end() (-1 once the buffer is full)."""
+        i = self.n
+        if i >= self.capacity:
+            self.dropped += 1
+            return -1
+        self.n = i + 1
+        self.kind[i] = name
+        self.track[i] = track
+        self.start[i] = perf_counter_ns()
+        self.end[i] = 0
+        return i
+
+    def end_span(self, slot: int):
+        if slot >= 0:
+            self.end[slot] = perf_counter_ns()
+
+    def span(self, track: int, name: int, start_ns: int, end_ns: int = 0):
+        """A span whose start is already known; ends now unless end_ns is given."""
+        i = self.n
+        if i >= self.capacity:
+            self.dropped += 1
+            return
+        self.n = i + 1
+        self.kind[i] = name
+        self.track[i] = track
+        self.start[i] = start_ns
+        self.end[i] = end_ns or perf_counter_ns()
+
+    def wrap(self, track: int, name: int, fn):
+        """fn recorded as a span on `track` on every call (bind onto an instance)."""
+        span = self.span
+
+        @wraps(fn)
+        def traced(*args, **kwargs):
+            t0 = perf_counter_ns()
+            result = fn(*args, **kwargs)
+            span(track, name, t0)
+            return result
+        return traced
+
+    def events(self) -> list:
+        """The recorded spans as trace-event dicts (complete "X" events, times in us)."""
+        now = perf_counter_ns()
+        origin = self.origin
+        out = [{"name": "process_name", "ph": "M", "pid": 1, "tid": 0, "args": {"name": "MindMaze"}}]
+        for tid, label in enumerate(self.tracks):
+            out.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": label}})
+            out.append({"name": "thread_sort_index", "ph": "M", "pid": 1, "tid": tid, "args": {"sort_index": tid}})
+        for i in range(self.n):
+            name, cat = self.names[self.kind[i]]
+            start, end = self.start[i], self.end[i]
+            ev = {"name": name, "cat": cat, "ph": "X", "pid": 1, "tid": self.track[i],
+                  "ts": (start - origin) / 1e3, "dur": ((end or now) - start) / 1e3}
+            if not end:
+                ev["args"] = {"unfinished": True}
+            out.append(ev)
+        return out
+
+    def write(self, path: str):
+        """Write the trace as Chrome trace-event JSON (loads in Perfetto and chrome://tracing)."""
+        import os
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events(), "displayTimeUnit": "ms",
+                       "otherData": {"spans": self.n, "dropped": self.dropped, "capacity": self.capacity}}, f)
+
+TRACER = Tracer()
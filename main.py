@@ -1,80 +1,105 @@
 # main.py
-from room1 import enter_room1
-from room2 import enter_room2
-from room3 import enter_room3
 from mood import MoodEngine
 from engine.inventory import Inventory
-from engine.telemetry import Telemetry
-from engine.persistence import save_state, load_state
-import json, os
-from engine.config_room import run_config_room
+from engine.telemetry import Telemetry, CsvStreamSink
+from engine.game import Game
+from engine.room_base import drive
+from engine.clock import make_clock
+from engine.plots import PlotQueue
+from engine.persistence import JsonSaveStore, SqliteSaveStore, AutosaveBatcher
+from engine.metrics import METRICS
+from engine.trace import TRACER
+import argparse, os, time
+from engine.catalog import CatalogWatcher, RoomList, load_catalog
 
-def start_game():
-    print("Welcome to MindMaze!")
-    mood_engine = MoodEngine()
-    inventory = Inventory()
-    telemetry = Telemetry()
-
-    telemetry.log(room="meta", event="game_start")
-
-    start_idx = 0
-    state = load_state("saves/slot1.json")
-    if state.get("next_room") is not None:
-        ans = input("Found a save. Continue? (y/n): ").strip().lower()
-        if ans.startswith("y"):
-            try:
-                start_idx = int(state.get("next_room", 0))
-            except Exception:
-                start_idx = 0
-            for item in state.get("inventory", []):
-                inventory.add(item)
-            print(f"Loaded save. Resuming at Room {start_idx+1} with items: {', '.join(inventory.list()) or 'none'}")
-            telemetry.log(room="meta", event="load", next_room=start_idx+1, items=";".join(inventory.list()))
-
-    rooms = [enter_room1, enter_room2, enter_room3]
+# rooms 1-3 by module; each is imported when a session first reaches it
+FIXED_ROOMS = ("room1", "room2", "room3")
 
+def build_rooms(catalog_path=os.path.join("data", "rooms.json"), on_error=print):
+    """
+    Return the rooms in play order: rooms 1-3, then the config rooms. The
+    config rooms come from the compiled catalog cache and are only loaded
+    when a session reaches them.
+    """
+    catalog = ()
     try:
-        with open(os.path.join("data", "rooms.json"), "r", encoding="utf-8") as f:
-            cfg = json.load(f)
-        cfg_rooms = cfg.get("rooms", [])
-        if cfg_rooms:
-            for rcfg in cfg_rooms:
-                def make_runner(c=rcfg):
-                    return lambda me, telemetry=None, inventory=None: run_config_room(
-                        c, mood_engine=me, telemetry=telemetry, inventory=inventory
-                    )
-                rooms.append(make_runner())
+        catalog = load_catalog(catalog_path, on_error)
     except FileNotFoundError:
         pass
     except Exception as e:
-        print(f"(Config rooms skipped: {e})")
+        on_error(f"(Config rooms skipped: {e})")
+    return RoomList(FIXED_ROOMS, catalog)
+
+def watch_rooms(catalog_path=os.path.join("data", "rooms.json"), interval=1.0, on_error=print, on_reload=print):
+    """Like build_rooms, but current() picks up edits to the catalog (for long-running hosts)."""
+    return CatalogWatcher(catalog_path, FIXED_ROOMS, interval, on_error, on_reload)
 
-    for i in range(start_idx, len(rooms)):
-        ok = rooms[i](mood_engine, telemetry=telemetry, inventory=inventory)
-        if not ok:
-            telemetry.log(room="meta", event="game_over", at=f"room{i+1}")
-            telemetry.export_csv("reports/session_timeline.csv")
-            telemetry.export_mood_plot("reports/mood_timeline.png")
-            print("Saved: reports/session_timeline.csv")
-            print("Saved: reports/mood_timeline.png")
-            print("Game Over.")
-            return
+def play(mood_engine, inventory, telemetry, console=None, rooms=None, pace=1.0, clock=None,
+         save_path="saves/slot1.json",
+         csv_path="reports/session_timeline.csv",
+         plot_path="reports/mood_timeline.png", plots=None, saves=None):
+    """Run one full session on a console. Returns True if the player escaped."""
+    game = Game(rooms if rooms is not None else build_rooms(), save_path, csv_path, plot_path, plots, saves)
+    return drive(game, game.new_state(mood_engine, inventory, telemetry, pace, clock), console)
 
-        # autosave progress to next room
-        next_room = i + 1
-        save_state(
-            {"next_room": next_room, "inventory": inventory.list()},
-            path="saves/slot1.json",
-        )
-        telemetry.log(room="meta", event="autosave", next_room=next_room, items=";".join(inventory.list()))
+def open_saves(backend="json"):
+    """The save store for `backend`: 'json' (saves/slot1.json) or 'sqlite' (saves/saves.db)."""
+    if backend == "sqlite":
+        return SqliteSaveStore(os.path.join("saves", "saves.db"))
+    return JsonSaveStore(os.path.join("saves", "{slot}.json"))
 
-    # escaped!
-    telemetry.log(room="meta", event="escaped")
-    telemetry.export_csv("reports/session_timeline.csv")
-    telemetry.export_mood_plot("reports/mood_timeline.png")
-    print("Saved: reports/session_timeline.csv")
-    print("Saved: reports/mood_timeline.png")
-    print("Congratulations! You've escaped MindMaze!")
+def session_csv_path(reports_dir="reports"):
+    """A timeline file of its own for this session, under reports/sessions."""
+    return os.path.join(reports_dir, "sessions", f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.csv")
+
+def write_metrics(reports_dir="reports"):
+    """Text dump and JSON snapshot of METRICS in reports/; returns the text."""
+    import json
+    os.makedirs(reports_dir, exist_ok=True)
+    text = METRICS.dump()
+    with open(os.path.join(reports_dir, "metrics.txt"), "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+    with open(os.path.join(reports_dir, "metrics.json"), "w", encoding="utf-8") as f:
+        json.dump(METRICS.snapshot(), f, indent=2)
+    return text
+
+def start_game(clock=None, console=None, saves="json", metrics=False, trace_path=None):
+    say = console.say if console else print
+    say("Welcome to MindMaze!")
+    if metrics:
+        METRICS.enable()
+    if trace_path:
+        TRACER.enable()
+    # stream the timeline as it happens so a crash still leaves the session on disk;
+    # reports/session_timeline.csv becomes a copy of the latest finished session
+    telemetry = Telemetry(sink=CsvStreamSink(session_csv_path()))
+    plots = PlotQueue()
+    # autosaves are coalesced and written off the game loop
+    store = AutosaveBatcher(open_saves(saves))
+    try:
+        play(MoodEngine(), Inventory(), telemetry, console=console, clock=clock, plots=plots, saves=store)
+    finally:
+        try:
+            store.close()           # raises if the last save could not be written
+        finally:
+            telemetry.close()
+            # the player has already seen the ending; just let the plot finish
+            plots.close(wait=True)
+            if metrics:
+                say(write_metrics())
+            if trace_path:
+                TRACER.write(trace_path)
+                say(f"Trace: {trace_path}")
 
 if __name__ == "__main__":
-    start_game()
+    ap = argparse.ArgumentParser(description="Play MindMaze in the terminal.")
+    ap.add_argument("--clock", choices=["real", "instant"], default="real",
+                    help="'instant' skips the staggered intro pauses")
+    ap.add_argument("--saves", choices=["json", "sqlite"], default="json",
+                    help="save backend: saves/slot1.json or saves/saves.db")
+    ap.add_argument("--metrics", action="store_true",
+                    help="time hot paths; print p50/p95/p99 on exit (also reports/metrics.txt and .json)")
+    ap.add_argument("--trace", nargs="?", const=os.path.join("reports", "trace.json"), default=None, metavar="PATH",
+                    help="record session spans as Chrome/Perfetto trace JSON (default reports/trace.json)")
+    args = ap.parse_args()
+    start_game(make_clock(args.clock), saves=args.saves, metrics=args.metrics, trace_path=args.trace)
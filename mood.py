@@ -1,7 +1,107 @@
 # mood.py
-import math
-import re
+import time
 from collections import deque
+from engine.lexicon import Lexicon
+
+# str.translate tables that delete ASCII letters / uppercase ASCII letters
+_DROP_LETTERS = dict.fromkeys(range(ord("A"), ord("Z") + 1)) | dict.fromkeys(range(ord("a"), ord("z") + 1))
+_DROP_UPPER = dict.fromkeys(range(ord("A"), ord("Z") + 1))
+
+# ---- aggregators: how recent scores are combined into the value mood_state() classifies
+# add(score, evicted, scores) is called once per observe; evicted is the score that just
+# fell out of MoodEngine.scores (or None). value(scores) is O(1); value(scores, exact=True) may
+# recompute. reset(scores, data) rebuilds from history plus what dump() returned.
+
+class WindowAggregator:
+    """Mean of MoodEngine.scores (the last history_size scores) kept as a running sum."""
+    def __init__(self):
+        self.total = 0.0
+        self.since_exact = 0
+
+    def add(self, score, evicted, scores):
+        self.total += score
+        if evicted is not None:
+            self.total -= evicted
+        self.since_exact += 1
+        if self.since_exact >= (scores.maxlen or 1):
+            # re-anchor once per window (amortized O(1)) so rounding never piles up
+            self.total = sum(scores)
+            self.since_exact = 0
+
+    def value(self, scores, exact=False):
+        if not scores:
+            return None
+        return (sum(scores) if exact else self.total) / len(scores)
+
+    def reset(self, scores, data=None):
+        self.total = sum(scores)
+        self.since_exact = 0
+
+    def dump(self):
+        return None
+
+class EwmaAggregator:
+    """Exponentially weighted moving average: alpha = weight of the newest score."""
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = alpha
+        self.avg = None
+
+    def add(self, score, evicted, scores):
+        self.avg = score if self.avg is None else self.alpha * score + (1.0 - self.alpha) * self.avg
+
+    def value(self, scores, exact=False):
+        return self.avg
+
+    def reset(self, scores, data=None):
+        self.avg = None
+        if data:
+            self.avg = data[0]
+        else:
+            for s in scores:
+                self.add(s, None, scores)
+
+    def dump(self):
+        return [self.avg]
+
+class DecayAggregator:
+    """
+    Time-decayed mean: a score's weight halves every `half_life` seconds of
+    `now()`. A MoodEngine in a Game reads the session's clock instead (use_clock).
+    """
+    def __init__(self, half_life: float = 60.0, now=time.monotonic):
+        self.half_life = half_life
+        self.now = now
+        self.weighted = 0.0
+        self.weight = 0.0
+        self.last = None
+
+    def _decay(self):
+        t = self.now()
+        if self.last is not None and t > self.last:
+            f = 0.5 ** ((t - self.last) / self.half_life)
+            self.weighted *= f
+            self.weight *= f
+        self.last = t
+
+    def add(self, score, evicted, scores):
+        self._decay()
+        self.weighted += score
+        self.weight += 1.0
+
+    def value(self, scores, exact=False):
+        return self.weighted / self.weight if self.weight else None
+
+    def reset(self, scores, data=None):
+        self.weighted, self.weight, self.last = 0.0, 0.0, None
+        if data:
+            self.weighted, self.weight = data
+            self.last = self.now()
+        else:
+            for s in scores:
+                self.add(s, None, scores)
+
+    def dump(self):
+        return [self.weighted, self.weight]
 
 class MoodEngine:
     """
@@ -20,77 +120,145 @@ class MoodEngine:
         "stuck", "hard", "dumb", "annoying", "hate", "bad", "stressed", "help", "idk", "not sure", "no idea", "frustrating", "angry", "mad", "bored"
     }
 
-    def __init__(self, history_size: int =6):
+    # Tunable weights (override per engine with params={"wrong_weight": -0.6, ...})
+    TIME_CAP = 45.0         # seconds counted at most
+    TIME_WEIGHT = -1.5      # penalty per 30 s
+    WRONG_CAP = 3           # wrong attempts counted at most
+    WRONG_WEIGHT = -0.8     # penalty per wrong attempt
+    CORRECT_BONUS = 1.0
+    NEAR_MISS_BONUS = 0.4   # a wrong answer one typo away reads as "almost", not as floundering
+    SCORE_CAP = 2.5         # scores are squashed into [-SCORE_CAP, +SCORE_CAP]
+    EXCLAIM_WEIGHT = -0.2   # per "!", at most EXCLAIM_CAP of them
+    EXCLAIM_CAP = 5
+    CAPS_WEIGHT = -0.8      # times the share of capitals, once a text reads as yelling:
+    CAPS_MIN_LETTERS = 6    # at least this many ASCII letters
+    CAPS_MIN_RATIO = 0.6    # and more capitals than this share
+    # mood_state() boundaries on the aggregated score: stressed, focused | calm, excited
+    THRESHOLDS = (-1.2, -0.2, 0.2, 1.2)
+    PARAMS = ("time_cap", "time_weight", "wrong_cap", "wrong_weight", "correct_bonus", "near_miss_bonus", "thresholds")
+
+    def __init__(self, history_size: int =6, lexicon=None, aggregator=None, params=None):
         #Keep a rolling window of recent scores
        self.scores = deque (maxlen=history_size)
+       for name, value in (params or {}).items():
+           if name not in self.PARAMS:
+               raise ValueError(f"unknown mood parameter: {name!r}")
+           setattr(self, name.upper(), tuple(value) if name == "thresholds" else value)
+       # compiled once per class (or loaded via engine.lexicon.load_lexicon) and shared by all engines
+       self.lexicon = lexicon if lexicon is not None else type(self).default_lexicon()
+       # default: mean of the window above, same states as recomputing it every call
+       self.aggregator = aggregator if aggregator is not None else WindowAggregator()
+       self._state = None       # cached mood_state() until the next observe
+
+    @classmethod
+    def default_lexicon(cls) -> Lexicon:
+        """POSITIVE_WORDS (+1) and NEGATIVE_WORDS (-1) as a compiled Lexicon."""
+        lex = cls.__dict__.get("_lexicon")
+        if lex is None:
+            lex = Lexicon.from_words(cls.POSITIVE_WORDS, cls.NEGATIVE_WORDS)
+            cls._lexicon = lex
+        return lex
 
     def _lexicon_score(self, text: str) -> float:
         t = text.lower()
-        pos = sum(1 for w in self.POSITIVE_WORDS if w in t)
-        neg = sum(1 for w in self.NEGATIVE_WORDS if w in t)
-        base = (pos - neg)
+        base = self.lexicon.score(t)    # weighted count of distinct terms in t
 
         #Heuristics: exclamations and ALL CAPS amplify negativity/urgency
         exclaims = t.count("!")
         caps_ratio = self._caps_ratio(text)
 
         #scale: exclaims push negative if many and content is negative
-        exclaim_effect = -0.2 * min(exclaims, 5)
-        caps_effect = -0.8 * caps_ratio # mostly signals tension/urgency
+        exclaim_effect = self.EXCLAIM_WEIGHT * min(exclaims, self.EXCLAIM_CAP)
+        caps_effect = self.CAPS_WEIGHT * caps_ratio # mostly signals tension/urgency
 
         return base + exclaim_effect + caps_effect
 
-    @staticmethod
-    def _caps_ratio(text: str) -> float:
-        letters = re.findall(r"[A-Za-z]", text)
+    def _caps_ratio(self, text: str) -> float:
+        # count ASCII letters and capitals without building a list of them
+        letters = len(text) - len(text.translate(_DROP_LETTERS))
         if not letters:
             return 0.0
-        caps = sum(1 for ch in letters if ch.isupper())
-        ratio = caps / len(letters)
+        caps = len(text) - len(text.translate(_DROP_UPPER))
+        ratio = caps / letters
         #Only count if yelling (threshold)
-        return ratio if (len(letters) >= 6 and ratio > 0.6) else 0.0
+        return ratio if (letters >= self.CAPS_MIN_LETTERS and ratio > self.CAPS_MIN_RATIO) else 0.0
 
-    def observe(self, *, text: str, seconds: float, correct: bool, wrong_attempts: int):
+    def observe(self, *, text: str, seconds: float, correct: bool, wrong_attempts: int, near_miss: bool = False):
         """
         Combine multiple signals into a single mood score.
         Positive score ~ calm&positive; negative score ~ stressed/frustrated.
         """
         # 1) Time pressure: long time without success tend to be negative.
         # Normalize: 0..30s -> 0..-1.5  (cap at 45s)
-        t = max(0.0, min(seconds, 45.0))
-        time_penalty = -1.5 * (t / 30.0)
+        t = max(0.0, min(seconds, self.TIME_CAP))
+        time_penalty = self.TIME_WEIGHT * (t / 30.0)
 
         # 2) Wrong attempts penalty (cap at 3)
-        wa = max(0, min(wrong_attempts, 3))
-        wrong_penalty = -0.8 * wa
+        wa = max(0, min(wrong_attempts, self.WRONG_CAP))
+        wrong_penalty = self.WRONG_WEIGHT * wa
 
         # 3) Correctness bonus
-        correct_bonus = 1.0 if correct else 0.0
+        correct_bonus = self.CORRECT_BONUS if correct else 0.0
+        # ...or nearly there (engine.answers found an accepted answer a typo away)
+        near_bonus = self.NEAR_MISS_BONUS if near_miss and not correct else 0.0
 
         # 4) Text sentiment/urgency
         lex = self._lexicon_score(text)
 
         # Sum and squash into [-2.5, +2.5]
-        raw = time_penalty + wrong_penalty + correct_bonus + lex
-        raw= max(-2.5, min(raw, 2.5))
+        raw = time_penalty + wrong_penalty + correct_bonus + near_bonus + lex
+        raw= max(-self.SCORE_CAP, min(raw, self.SCORE_CAP))
 
-        self.scores.append(raw)
+        scores = self.scores
+        evicted = scores[0] if len(scores) == scores.maxlen else None
+        scores.append(raw)
+        self.aggregator.add(raw, evicted, scores)
+        self._state = None
         return raw
 
+    def use_clock(self, clock):
+        """Time-based aggregators read `clock` (the session's), so a SimClock run is reproducible."""
+        if hasattr(self.aggregator, "now"):
+            self.aggregator.now = clock.now
+
+    def restore_scores(self, scores, history_size=None, aggregator_data=None):
+        """Replace the score history (e.g. from a snapshot) and rebuild the aggregate."""
+        if history_size is not None and history_size != self.scores.maxlen:
+            self.scores = deque(maxlen=history_size)
+        self.scores.clear()
+        self.scores.extend(scores)
+        self.aggregator.reset(self.scores, aggregator_data)
+        self._state = None
+
     def mood_state(self) -> str:
         """
         Map averaged score to discrete mood states.
+        Cached until the next observe().
         """
+        state = self._state
+        if state is None:
+            state = self._state = self._classify()
+        return state
+
+    def _classify(self) -> str:
         if not self.scores:
             return "neutral"
-        avg = sum(self.scores) / len(self.scores)
-        if avg <= -1.2:
+        avg = self.aggregator.value(self.scores)
+        if avg is None:
+            return "neutral"
+        for t in self.THRESHOLDS:
+            if -1e-9 < avg - t < 1e-9:
+                # the running value could round to the other side of a boundary
+                avg = self.aggregator.value(self.scores, exact=True)
+                break
+        stressed, focused, calm, excited = self.THRESHOLDS
+        if avg <= stressed:
             return "stressed"
-        if avg <= -0.2:
+        if avg <= focused:
             return "focused"  # slightly tense but productive
-        if avg >= 1.2:
+        if avg >= excited:
             return "excited"
-        if avg >= 0.2:
+        if avg >= calm:
             return "calm"
         return "neutral"
 
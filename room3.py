@@ -1,85 +1,83 @@
 # room3.py
-import time
+from engine.answers import AnswerMatcher
+from engine.room_base import Room, Output
 
-def print_staggered(block: str, line_delay: float = 3.0):
-    for line in block.splitlines():
-        print(line)
-        time.sleep(line_delay)
+INTRO = (
+    "Still excited by your successful escape from the second room you are walking into the third room. You see a big riveted door."
+    "A rusted wheel above the lock shows the numbers: 5 3 4 8.\n"
+    "Under it there is a sentence scratched into the door.'\n"
+    "The word that these six letters form will help you escape:T O P L R A\n"
+    "Type in the 6 letter password:"
+)
 
-def enter_room3(mood_engine=None, telemetry=None, inventory=None):
-    """Runs Room 3: a Caesar-cipher door. Returns True if the player escapes, else False"""
-    print("\n[ Room 3 ]")
-    print_staggered(
-        "Still excited by your successful escape from the second room you are walking into the third room. You see a big riveted door."
-        "A rusted wheel above the lock shows the numbers: 5 3 4 8.\n"
-        "Under it there is a sentence scratched into the door.'\n"
-        "The word that these six letters form will help you escape:T O P L R A\n"
-        "Type in the 6 letter password:"
-    )
+class Room3(Room):
+    """Room 3: a Caesar-cipher door."""
+    id = "room3"
+
+    matcher = AnswerMatcher({"portal"}, ("strip", "lower"))     # plaintext after shifting back by 6
 
-    answer = {"portal"}      # plaintext after shifting back by 6
-    wrong_attempts = 0
-    started = time.time()
+    def start(self, state):
+        out = Output()
+        out.say("\n[ Room 3 ]")
+        return self.begin(state, out, INTRO, "\nEnter the password (or type 'hint'): ")
 
-    def give_hint(strength: str):
+    def give_hint(self, out, strength: str):
         if strength == "strong":
-            print("HINT (strong): P is the first letter")
+            out.say("HINT (strong): P is the first letter")
         elif strength == "soft":
-            print("HINT (soft): The word describes a type of entrance or exit.")
+            out.say("HINT (soft): The word describes a type of entrance or exit.")
         else:
-            print("HINT: The last three letters are T A L")
+            out.say("HINT: The last three letters are T A L")
 
-    while True:
-        user_input = input("\nEnter the password (or type 'hint'): ").strip().lower()
+    def step(self, state, text):
+        out = Output()
+        m = self.matcher.match(text)
+        user_input = m.normalized
 
         if user_input == "hint":
-            if telemetry:
-                telemetry.log(room="room3", event="hint")
-            if mood_engine:
-                _, strength = mood_engine.hint_policy()
-                give_hint(strength)
+            self.log(state, "hint")
+            if state.mood_engine:
+                _, strength = state.mood_engine.hint_policy()
+                self.give_hint(out, strength)
             else:
                 # progressive hints without mood
-                if wrong_attempts >= 3:
-                    give_hint("strong")
-                elif wrong_attempts == 2:
-                    give_hint("normal")
+                if state.wrong_attempts >= 3:
+                    self.give_hint(out, "strong")
+                elif state.wrong_attempts == 2:
+                    self.give_hint(out, "normal")
                 else:
-                    give_hint("soft")
-            continue
-
-        is_correct = user_input in answer
-
-        if mood_engine:
-            elapsed = time.time() - started
-            score = mood_engine.observe(
-               text=user_input,
-               seconds=elapsed,
-               correct=is_correct,
-               wrong_attempts=wrong_attempts
-            )
-            if telemetry:
-                telemetry.log(room="room3", event="mood_tick",
-                              mood_score=score, mood_state=mood_engine.mood_state())
+                    self.give_hint(out, "soft")
+            return state, out, False
 
+        is_correct = m.correct
+        self.observe(state, user_input, is_correct, m.near is not None)
         # log the answer event
-        if telemetry:
-            telemetry.log(room="room3", event="answer", input=user_input, correct=is_correct)
+        self.log_answer(state, m)
 
         if is_correct:
-            print("The door opens...you made it! You've escaped MindMaze! You step out of the cave and find yourself on an empty beach. Where are you? You start walking and after some time you hear voices. Is this a rescue team searching for you? Or is the real escape just starting? ")
-            return True
+            out.say("The door opens...you made it! You've escaped MindMaze! You step out of the cave and find yourself on an empty beach. Where are you? You start walking and after some time you hear voices. Is this a rescue team searching for you? Or is the real escape just starting? ")
+            state.escaped = True
+            return state, out, True
 
-        wrong_attempts += 1
-        print("The lock stays cold. That's not the password.")
-        if mood_engine:
-            state = mood_engine.mood_state()
-            if state == "stressed":
-                print("Breathe. Type 'hint' for a stronger clue")
-            elif state == "focused":
-                print("Use the vault's first two digits to set your shift. Type 'hint' if you need another clue.")
-            elif state in ("calm", "excited"):
-                print("Method: sum -> shift -> shift letters backward. Try again.")
+        state.wrong_attempts += 1
+        out.say("The lock stays cold. That's not the password.")
+        if self.guide_miss(out, m):
+            return state, out, False
+        if state.mood_engine:
+            mood = state.mood_engine.mood_state()
+            if mood == "stressed":
+                out.say("Breathe. Type 'hint' for a stronger clue")
+            elif mood == "focused":
+                out.say("Use the vault's first two digits to set your shift. Type 'hint' if you need another clue.")
+            elif mood in ("calm", "excited"):
+                out.say("Method: sum -> shift -> shift letters backward. Try again.")
         else:
-            if wrong_attempts == 1:
-                print("Tip: You can type 'hint' for help.")
+            if state.wrong_attempts == 1:
+                out.say("Tip: You can type 'hint' for help.")
+        return state, out, False
+
+ROOM = Room3()
+
+def enter_room3(mood_engine=None, telemetry=None, inventory=None, console=None):
+    """Runs Room 3: a Caesar-cipher door. Returns True if the player escapes, else False"""
+    return ROOM.enter(ROOM.new_state(mood_engine, telemetry, inventory), console)
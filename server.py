@@ -0,0 +1,211 @@
+# server.py
+"""
+Host many MindMaze sessions in one process over a local TCP line protocol.
+
+Every message the server sends is one line. A line starting with "? " is a
+prompt and the server waits for one line of input. Each connection gets its
+own MoodEngine, Inventory and Telemetry and is advanced with Game.step, so
+sessions never block each other: intro pauses are asyncio sleeps on the
+session's own task.
+
+Edits to data/rooms.json are picked up without a restart: every new
+connection plays the current catalog version, running sessions keep theirs.
+
+With --saves the server keeps progress in one SQLite file shared by every
+session (pooled connections, batched autosaves) and asks each connection for
+a player name first.
+
+With --workers N a supervisor accepts the connections and shards the
+sessions across N worker processes by session id (engine.shards). Every
+worker runs the same sessions loop on its own core and reads the room
+catalog and lexicon the supervisor loaded before forking them.
+"""
+import argparse, asyncio, itertools, os, signal, socket, time
+from engine.clock import make_clock
+from engine.game import Game
+from engine.inventory import Inventory
+from engine.persistence import SqliteSaveStore, AutosaveBatcher
+from engine.plots import PlotQueue
+from engine.telemetry import Telemetry, CsvStreamSink
+from engine.metrics import METRICS
+from engine.trace import TRACER
+from engine import shards
+from main import watch_rooms, write_metrics
+from mood import MoodEngine
+
+async def send(writer, outputs, clock):
+    for text, pause in outputs:
+        writer.write((text + "\n").encode("utf-8"))
+        if pause:
+            await writer.drain()
+            await clock.wait(pause)
+    await writer.drain()
+
+def prompt_line(prompt: str) -> bytes:
+    head, nl, prompt = prompt.rpartition("\n")
+    return (head + nl + "? " + prompt + "\n").encode("utf-8")
+
+async def read_line(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    return line.decode("utf-8", errors="replace").rstrip("\r\n")
+
+async def run_session(game, state, reader, writer):
+    await send(writer, [("Welcome to MindMaze!", 0.0)], state.clock)
+    if game.saves is not None:
+        writer.write(prompt_line("Player name: "))
+        await writer.drain()
+        name = await read_line(reader)
+        if name is None:
+            return None
+        state.player = name.strip() or state.player
+    state, outputs = game.start(state)
+    await send(writer, outputs, state.clock)
+    while True:
+        writer.write(prompt_line(state.prompt))
+        await writer.drain()
+        text = await read_line(reader)
+        if text is None:
+            return None
+        state, outputs, done = game.step(state, text)
+        await send(writer, outputs, state.clock)
+        if done:
+            return state.escaped
+
+def session_host(catalog, reports_dir=None, pace=1.0, clock_mode="real", plots=None, saves=None, run=None):
+    """handle(reader, writer, sid): one connection's whole session, for serve() and shard workers."""
+    run = run or time.strftime("%Y%m%d-%H%M%S")     # keeps session files of earlier server runs
+
+    async def handle(reader, writer, sid):
+        csv_path = os.path.join(reports_dir, f"session_{run}_{sid}.csv") if reports_dir else None
+        plot_path = csv_path[:-4] + ".png" if plots is not None else None
+        game = Game(catalog.current(), save_path=None, csv_path=csv_path, plot_path=plot_path, plots=plots, saves=saves)
+        telemetry = Telemetry(sink=CsvStreamSink(csv_path)) if csv_path else Telemetry()
+        state = game.new_state(MoodEngine(), Inventory(), telemetry, pace, make_clock(clock_mode))
+        state.player = f"guest{sid}"
+        try:
+            await run_session(game, state, reader, writer)
+        except ConnectionError:
+            pass
+        finally:
+            telemetry.close()
+            writer.close()
+    return handle
+
+async def serve(host="127.0.0.1", port=7777, pace=1.0, reports_dir=None, ready=None, clock_mode="real", plot_workers=0,
+                saves_path=None, pool_size=4, reload_interval=1.0):
+    catalog = watch_rooms(interval=reload_interval)
+    plots = PlotQueue(plot_workers) if reports_dir and plot_workers > 0 else None
+    saves = AutosaveBatcher(SqliteSaveStore(saves_path, pool_size=pool_size)) if saves_path else None
+    handle = session_host(catalog, reports_dir, pace, clock_mode, plots, saves)
+    ids = itertools.count(1)
+
+    server = await asyncio.start_server(lambda reader, writer: handle(reader, writer, next(ids)), host, port)
+    print(f"MindMaze server listening on {host}:{port}", flush=True)
+    if ready is not None:
+        ready.set()
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if plots is not None:
+            plots.close(wait=False)
+        try:
+            if saves is not None:
+                saves.close()       # raises if the last saves could not be written
+        finally:
+            if METRICS.enabled:
+                print(write_metrics(reports_dir or "reports"), flush=True)
+
+# ---- sharded: supervisor + worker processes ---------------------------------
+
+def preload_shared(reload_interval=1.0):
+    """Everything workers only read, loaded once in the supervisor before they fork."""
+    catalog = watch_rooms(interval=reload_interval)
+    rooms = catalog.current()
+    for i in range(len(rooms)):
+        rooms[i]                # import rooms 1-3, decode every config room
+    MoodEngine.default_lexicon()
+    return {"catalog": catalog}
+
+def shard_worker(channel, options):
+    """Main of one worker process: plays the sessions the supervisor routes to it."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)        # the supervisor handles Ctrl+C
+    asyncio.run(_shard_main(channel, options))
+
+async def _shard_main(channel, o):
+    catalog = o.get("catalog") or watch_rooms(interval=o["reload_interval"])
+    plots = PlotQueue(o["plot_workers"]) if o["reports"] and o["plot_workers"] > 0 else None
+    saves = AutosaveBatcher(SqliteSaveStore(o["saves"], pool_size=o["pool_size"])) if o["saves"] else None
+    handle = session_host(catalog, o["reports"], o["pace"], o["clock"], plots, saves, o["run"])
+    try:
+        await shards.accept_routed(channel, handle)
+    finally:
+        if plots is not None:
+            plots.close(wait=False)
+        if saves is not None:
+            saves.close()
+
+def serve_sharded(workers, host="127.0.0.1", port=7777, pace=1.0, reports_dir=None, clock_mode="real",
+                  plot_workers=0, saves_path=None, pool_size=4, reload_interval=1.0):
+    options = {"pace": pace, "reports": reports_dir, "clock": clock_mode, "plot_workers": plot_workers,
+               "saves": saves_path, "pool_size": pool_size, "reload_interval": reload_interval,
+               "run": time.strftime("%Y%m%d-%H%M%S")}
+    sup = shards.Supervisor(workers, shard_worker, options, preload=lambda: preload_shared(reload_interval))
+    sup.start()
+    listener = socket.create_server((host, port), backlog=1024)
+    print(f"MindMaze server listening on {host}:{port} ({workers} workers)", flush=True)
+    try:
+        sup.serve(listener)
+    finally:
+        listener.close()
+        sup.close()
+        print("sessions per worker: " + ", ".join(map(str, sup.routed)), flush=True)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run MindMaze as a TCP line server.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=7777)
+    ap.add_argument("--pace", type=float, default=1.0, help="scale intro pauses (0 disables them)")
+    ap.add_argument("--clock", choices=["real", "instant"], default="real",
+                    help="'instant' skips intro pauses but keeps real answer timing")
+    ap.add_argument("--reports", default=None, help="directory for per-session CSV timelines")
+    ap.add_argument("--plot-workers", type=int, default=0,
+                    help="background processes rendering a mood plot per finished session (needs --reports)")
+    ap.add_argument("--saves", default=None, help="SQLite file for per-player saves (e.g. saves/saves.db)")
+    ap.add_argument("--pool-size", type=int, default=4, help="SQLite connections shared by all sessions")
+    ap.add_argument("--reload-interval", type=float, default=1.0,
+                    help="seconds between checks of data/rooms.json for changes")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="worker processes to shard sessions across (sticky by session id; POSIX only)")
+    ap.add_argument("--metrics", action="store_true", help="time hot paths; dump p50/p95/p99 on shutdown")
+    ap.add_argument("--trace", default=None, metavar="PATH",
+                    help="record every session's spans; Chrome/Perfetto trace JSON written on shutdown")
+    args = ap.parse_args(argv)
+    if args.workers > 1:
+        if args.metrics or args.trace:
+            ap.error("--metrics and --trace record one process; run them without --workers")
+        try:
+            serve_sharded(args.workers, args.host, args.port, args.pace, args.reports, args.clock,
+                          args.plot_workers, args.saves, args.pool_size, args.reload_interval)
+        except KeyboardInterrupt:
+            pass
+        return
+    if args.metrics:
+        METRICS.enable()
+    if args.trace:
+        TRACER.enable()
+    try:
+        asyncio.run(serve(args.host, args.port, args.pace, args.reports, clock_mode=args.clock,
+                          plot_workers=args.plot_workers, saves_path=args.saves, pool_size=args.pool_size,
+                          reload_interval=args.reload_interval))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.trace:
+            TRACER.write(args.trace)
+            print(f"Trace: {args.trace} ({TRACER.n} spans, {TRACER.dropped} dropped)", flush=True)
+
+if __name__ == "__main__":
+    main()
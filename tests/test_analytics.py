@@ -0,0 +1,53 @@
+import os
+
+from engine import analytics
+from engine.telemetry import FIELDS
+
+HEADER = ",".join(FIELDS) + "\r\n"
+
+
+def timeline(path, *events, mtime=None):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        f.write(HEADER)
+        for i, (room, event, correct) in enumerate(events):
+            f.write(f"2026-10-18T12:00:{i:02d}.000,{room},{event},,{correct},,,,,,,\r\n")
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+    return str(path)
+
+
+START = ("meta", "game_start", "")
+WRONG = ("room1", "answer", "False")
+SOLVED = ("room1", "answer", "True")
+HOUR_AGO = 1_760_000_000 * 10**9
+
+
+def test_a_session_still_being_played_is_left_out(tmp_path):
+    done = timeline(tmp_path / "done.csv", START, SOLVED, ("meta", "escaped", ""), mtime=HOUR_AGO)
+    live = timeline(tmp_path / "live.csv", START, WRONG)
+    agg, read = analytics.update([done, live])
+    assert read == 2
+    assert agg.total().sessions == 1
+    assert live not in agg.files and live not in agg.parts
+
+    os.utime(live, ns=(HOUR_AGO, HOUR_AGO))       # the player never came back
+    agg, read = analytics.update([done, live], agg)
+    assert read == 1
+    assert agg.total().outcomes == {"escaped": 1, "abandoned": 1}
+
+
+def test_only_a_continued_abandoned_file_is_read_again(tmp_path):
+    done = timeline(tmp_path / "done.csv", START, SOLVED, ("meta", "escaped", ""), mtime=HOUR_AGO)
+    left = timeline(tmp_path / "left.csv", START, WRONG, mtime=HOUR_AGO)
+    agg, _ = analytics.update([done, left])
+    assert agg.total().outcomes == {"escaped": 1, "abandoned": 1}
+
+    # resumed: the same file now goes on to a game over
+    timeline(left, START, WRONG, ("meta", "game_start", ""), ("meta", "restore", ""), WRONG,
+             ("meta", "game_over", ""), mtime=HOUR_AGO + 10**9)
+    agg, read = analytics.update([done, left], agg)
+    assert read == 1
+    total = agg.total()
+    assert total.outcomes == {"escaped": 1, "abandoned": 1, "game_over": 1}
+    assert total.rooms["room1"].resumed == 1
+    assert left in agg.files and not agg.parts
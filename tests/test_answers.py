@@ -0,0 +1,69 @@
+import itertools
+import random
+
+from engine.answers import SCAN_LIMIT, AnswerMatcher, edit_distance, max_distance_for
+from room1 import Room1
+from room2 import Room2
+
+
+def osa(a, b):
+    """Textbook optimal-string-alignment distance, no band and no cutoff."""
+    d = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i, j in itertools.product(range(1, len(a) + 1), range(1, len(b) + 1)):
+        d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+        if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+            d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[len(a)][len(b)]
+
+
+def word(rng, lo, hi):
+    return "".join(rng.choice("abcd") for _ in range(rng.randint(lo, hi)))
+
+
+def near_by_brute_force(matcher, text):
+    """What match() should report for a wrong answer, by checking every term."""
+    s = matcher.normalize(text)
+    if s in matcher.accepted or s in matcher.wrong or len(s) < matcher.min_length:
+        return None
+    hits = [(osa(s, t), t not in matcher.accepted, t) for t in matcher.terms
+            if osa(s, t) <= min(max_distance_for(len(s)), max_distance_for(len(t)))]
+    return min(hits, default=None)
+
+
+def test_edit_distance_matches_the_textbook_recurrence():
+    rng = random.Random(21)
+    for _ in range(3000):
+        a, b = word(rng, 0, 9), word(rng, 0, 9)
+        limit = rng.randint(0, 3)
+        want = osa(a, b)
+        assert edit_distance(a, b, limit) == (want if want <= limit else limit + 1), (a, b, limit)
+
+
+def test_index_and_scan_find_the_same_near_miss_as_brute_force():
+    rng = random.Random(8)
+    for n_terms in (3, SCAN_LIMIT + 1, 30):
+        for _ in range(20):
+            accepted = {word(rng, 4, 10) for _ in range(n_terms)}
+            wrong = {word(rng, 4, 10): "no" for _ in range(n_terms // 2)}
+            matcher = AnswerMatcher(accepted, ("strip",), wrong, min_length=4)
+            assert (matcher.index is None) == (len(matcher.terms) <= SCAN_LIMIT)
+            for _ in range(40):
+                text = word(rng, 3, 11)
+                m = matcher.match(text)
+                want = near_by_brute_force(matcher, text)
+                if want is None:
+                    assert m.near is None and (m.known is None or m.known == m.normalized), text
+                    continue
+                dist, is_wrong, term = want
+                assert (m.distance, m.known if is_wrong else m.near) == (dist, term), text
+
+
+def test_room1_catches_near_misses_of_echo():
+    for guess in ("ecoh", "ehco", "Echp", "'ech'o"):
+        assert Room1.matcher.match(guess).near == "echo", guess
+    assert Room1.matcher.match("eco").near is None
+
+
+def test_room2_code_guesses_are_never_near_misses():
+    assert Room2.matcher.min_length == 5
+    assert Room2.matcher.match("5349").near is None
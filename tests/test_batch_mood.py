@@ -0,0 +1,22 @@
+import numpy as np
+
+from engine.batch_mood import text_scores
+from engine.lexicon import Lexicon
+from mood import MoodEngine
+
+TEXTS = ["", "ok", "OKEY!!", "I'M STUCK!!!", "no idea", "this is HARD and annoying!!!!!!!", "Σίσυφος ΟΔΟΣ",
+         "café good", "nice\x01", "a" * 50, "GOOD GOOD good", "not sure, help"]
+
+
+def test_text_scores_match_the_scalar_engine():
+    lexicon = Lexicon({"ok": 0.1, "okey": 0.7, "stuck": -0.3, "no idea": -1.1, "hard": -0.45, "good": 0.2,
+                       "help": -0.9, "οδος": 0.33, "café": 0.05})
+    me = MoodEngine(lexicon=lexicon)
+    assert text_scores(me, TEXTS).tolist() == [me._lexicon_score(t) for t in TEXTS]
+
+
+def test_text_scores_fall_back_when_lowercasing_changes_lengths():
+    me = MoodEngine()
+    texts = ["İSTANBUL GOOD!", "ok"]          # "İ".lower() is two characters
+    assert text_scores(me, texts).tolist() == [me._lexicon_score(t) for t in texts]
+    assert isinstance(text_scores(me, texts), np.ndarray)
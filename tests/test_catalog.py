@@ -0,0 +1,65 @@
+import json
+import os
+
+from engine.catalog import cache_path, load_catalog
+
+ROOMS = {"rooms": [
+    {"id": "piano", "prompt": "What has keys? ", "answers": ["piano", "A Piano"]},
+    {"id": "echo", "prompt": "What answers back? ", "answers": ["echo"], "wrong_answers": {"parrot": "Close."}},
+]}
+
+
+def write_catalog(tmp_path):
+    source = tmp_path / "rooms.json"
+    source.write_text(json.dumps(ROOMS), encoding="utf-8")
+    return str(source)
+
+
+def test_cached_rooms_round_trip(tmp_path):
+    source = write_catalog(tmp_path)
+    fresh = [r.compiled for r in load_catalog(source)]
+    cached = [r.compiled for r in load_catalog(source)]
+    assert cached == fresh
+    assert isinstance(cached[0]["answers"], frozenset) and isinstance(cached[0]["normalize"], tuple)
+
+
+def test_a_damaged_header_is_rebuilt(tmp_path):
+    source = write_catalog(tmp_path)
+    load_catalog(source)
+    with open(cache_path(source), "r+b") as f:
+        f.truncate(os.path.getsize(cache_path(source)) - 3)
+    assert [r.id for r in load_catalog(source)] == ["piano", "echo"]
+
+
+def test_a_damaged_record_is_rebuilt_on_first_use(tmp_path):
+    source = write_catalog(tmp_path)
+    load_catalog(source)
+    path = cache_path(source)
+    data = open(path, "rb").read()
+    at = data.index(b'"id":"echo"')
+    with open(path, "r+b") as f:
+        f.seek(at)
+        f.write(b"\xff\x00garbage")
+    catalog = load_catalog(source)
+    assert catalog[1].id == "echo" and catalog[0].id == "piano"
+    assert b'"id":"echo"' in open(path, "rb").read()        # and the cache is whole again
+
+
+def test_rooms_stay_in_memory_when_the_cache_cannot_be_written(tmp_path):
+    source = write_catalog(tmp_path)
+    (tmp_path / ".cache").write_text("not a directory", encoding="utf-8")
+    errors = []
+    catalog = load_catalog(source, errors.append)
+    assert [r.id for r in catalog] == ["piano", "echo"]
+    assert len(errors) == 1 and "not written" in errors[0]
+
+
+def test_build_rooms_keeps_config_rooms_without_a_cache(tmp_path):
+    from main import FIXED_ROOMS, build_rooms
+
+    source = write_catalog(tmp_path)
+    (tmp_path / ".cache").write_text("not a directory", encoding="utf-8")
+    errors = []
+    rooms = build_rooms(source, on_error=errors.append)
+    assert len(rooms) == len(FIXED_ROOMS) + 2 and rooms[len(FIXED_ROOMS) + 1].id == "echo"
+    assert not any("skipped" in e for e in errors)
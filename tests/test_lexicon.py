@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from engine.lexicon import SCAN_LIMIT, Lexicon
+
+ALPHABET = "abcde é"
+
+
+def naive_score(weights, t):
+    return sum(w for term, w in weights.items() if term in t)
+
+
+def random_lexicon(rng, n):
+    weights = {}
+    while len(weights) < n:
+        term = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 6))).strip()
+        if term:
+            weights[term] = round(rng.uniform(-2.0, 2.0), 2)
+    return weights
+
+
+def random_texts(rng, count):
+    return ["".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 40))) for _ in range(count)]
+
+
+@pytest.mark.parametrize("size", [0, 5, SCAN_LIMIT, SCAN_LIMIT + 1, 400])
+def test_score_matches_the_substring_scan(size):
+    rng = random.Random(size)
+    for _ in range(10):
+        weights = random_lexicon(rng, size)
+        lex = Lexicon(weights)
+        for t in random_texts(rng, 50):
+            assert lex.matches(t) == {term for term in weights if term in t}, t
+            assert lex.score(t) == pytest.approx(naive_score(weights, t), abs=1e-9), t
+
+
+@pytest.mark.parametrize("size", [5, SCAN_LIMIT + 1, 400])
+def test_score_many_gives_the_same_floats_as_score(size):
+    rng = random.Random(size)
+    lex = Lexicon(random_lexicon(rng, size))
+    texts = random_texts(rng, 200)
+    joined = "\0".join(texts) + "\0"
+    starts, at = [], 0
+    for t in texts:
+        starts.append(at)
+        at += len(t) + 1
+    assert lex.score_many(joined, starts) == [lex.score(t) for t in texts]
+
+
+def test_overlapping_terms_each_count_once():
+    lex = Lexicon({"ok": 0.5, "okey": 1.0, "OK": 0.25, "no idea": -1.0})
+    assert lex.score("okey okey") == 1.75
+    assert lex.score("i have no idea") == -1.0
+    assert lex.score("") == 0
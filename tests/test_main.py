@@ -0,0 +1,38 @@
+import pytest
+
+import main
+from engine.clock import SimClock
+from engine.replay import ScriptedConsole
+
+
+class BrokenStore:
+    def load(self, player, slot):
+        return {}
+
+    def save(self, player, slot, state):
+        raise OSError("disk full")
+
+    def close(self):
+        pass
+
+
+class RecordingPlots:
+    closed = []
+
+    def submit(self, csv_path, png_path):
+        pass
+
+    def close(self, wait=True):
+        RecordingPlots.closed.append(wait)
+        return []
+
+
+def test_a_failed_last_save_still_closes_everything_else(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, "open_saves", lambda kind: BrokenStore())
+    monkeypatch.setattr(main, "PlotQueue", RecordingPlots)
+    clock = SimClock()
+    console = ScriptedConsole([("echo", 1.0)], clock)
+    with pytest.raises(OSError, match="disk full"):
+        main.start_game(clock=clock, console=console)
+    assert RecordingPlots.closed == [True]
@@ -0,0 +1,34 @@
+from engine.clock import SimClock
+from engine.game import Game
+from engine.inventory import Inventory
+from engine.telemetry import Telemetry
+from main import build_rooms
+from mood import DecayAggregator, MoodEngine
+
+
+def decay_session(answers):
+    clock = SimClock()
+    me = MoodEngine(aggregator=DecayAggregator(half_life=10.0))
+    game = Game(build_rooms(), save_path=None, csv_path=None, plot_path=None)
+    state = game.new_state(me, Inventory(), Telemetry(enabled=False), 0.0, clock)
+    state.saved = {}
+    state, out = game.start(state)
+    states = []
+    for think, text in answers:
+        clock.advance(think)
+        state, out, done = game.step(state, text)
+        states.append((me.aggregator.value(me.scores), me.mood_state()))
+    return me, clock, states
+
+
+def test_decay_follows_the_session_clock():
+    me, clock, _ = decay_session([])
+    first = me.observe(text="ok", seconds=1.0, correct=True, wrong_attempts=0)
+    clock.advance(10.0)             # one half-life of simulated time, no real time at all
+    second = me.observe(text="stuck", seconds=40.0, correct=False, wrong_attempts=3)
+    assert me.aggregator.value(me.scores) == (0.5 * first + second) / 1.5
+
+
+def test_simclock_runs_are_reproducible():
+    answers = [(4.0, "echo"), (30.0, "1234"), (2.0, "help"), (90.0, "4321"), (1.0, "nice")]
+    assert decay_session(answers)[2] == decay_session(answers)[2]
@@ -0,0 +1,24 @@
+import os
+
+from engine.mood_views import render_aggregate
+from engine.telemetry import FIELDS
+
+
+def test_only_views_rendered_now_are_reported(tmp_path):
+    out = tmp_path / "aggregate"
+    out.mkdir()
+    (out / "mood_bands.png").write_bytes(b"left over from an earlier run")
+    empty = tmp_path / "empty.csv"
+    empty.write_text(",".join(FIELDS) + "\r\n", encoding="utf-8")
+    table, written = render_aggregate([str(empty)], str(out), jobs=1)
+    assert table.n_sessions == 1 and written == []
+
+
+def test_rendered_views_are_returned(tmp_path):
+    timeline = tmp_path / "session.csv"
+    rows = [",".join(FIELDS)] + [f"2026-10-18T12:00:0{i}.000,room1,mood_tick,,,{0.5 - i},calm,,,,," for i in range(3)]
+    timeline.write_text("\r\n".join(rows) + "\r\n", encoding="utf-8")
+    out = tmp_path / "aggregate"
+    _, written = render_aggregate([str(timeline)], str(out), jobs=1)
+    assert [os.path.basename(p) for p in written] == ["mood_bands.png", "mood_state_heatmap.png"]
+    assert all(os.path.getsize(p) > 0 for p in written)
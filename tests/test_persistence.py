@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pytest
+
+from engine.persistence import AutosaveBatcher
+
+
+class FlakyStore:
+    def __init__(self, failures=1):
+        self.failures = failures
+        self.saved = {}
+        self.closed = False
+
+    def load(self, player, slot):
+        return self.saved.get((player, slot), {})
+
+    def save_many(self, items):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        for p, s, st in items:
+            self.saved[(p, s)] = st
+
+    def close(self):
+        self.closed = True
+
+
+def test_a_failed_batch_is_retried_on_the_next_tick():
+    errors = []
+    store = FlakyStore(failures=1)
+    batcher = AutosaveBatcher(store, interval=0.01, on_error=errors.append)
+    batcher.save("ann", "slot1", {"next_room": 1})
+    time.sleep(0.2)                 # a few ticks
+    assert store.saved == {("ann", "slot1"): {"next_room": 1}}
+    assert batcher.failures == 1 and len(errors) == 1 and "disk full" in errors[0]
+    batcher.close()
+    assert store.closed
+
+
+def test_newer_saves_win_over_a_failed_batch():
+    store = FlakyStore(failures=1)
+    batcher = AutosaveBatcher(store, interval=3600)
+    batcher.save("ann", "slot1", {"next_room": 1})
+    with pytest.raises(OSError):
+        batcher.flush()
+    batcher.save("ann", "slot1", {"next_room": 2})
+    assert batcher.load("ann", "slot1") == {"next_room": 2}
+    batcher.close()
+    assert store.saved == {("ann", "slot1"): {"next_room": 2}}
+
+
+def test_close_reports_a_final_write_that_fails():
+    store = FlakyStore(failures=5)
+    batcher = AutosaveBatcher(store, interval=3600)
+    batcher.save("ann", "slot1", {"next_room": 1})
+    with pytest.raises(OSError):
+        batcher.close()
+    assert store.closed
+
+
+def test_load_sees_a_batch_while_it_is_being_written():
+    writing, release = threading.Event(), threading.Event()
+
+    class SlowStore(FlakyStore):
+        def save_many(self, items):
+            writing.set()
+            release.wait(5)
+            super().save_many(items)
+
+    store = SlowStore(failures=0)
+    batcher = AutosaveBatcher(store, interval=3600)
+    batcher.save("ann", "slot1", {"next_room": 2})
+    flusher = threading.Thread(target=batcher.flush)
+    flusher.start()
+    assert writing.wait(5)
+    assert batcher.load("ann", "slot1") == {"next_room": 2}     # not yet in the store
+    release.set()
+    flusher.join()
+    assert store.saved == {("ann", "slot1"): {"next_room": 2}}
+    batcher.close()
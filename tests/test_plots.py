@@ -0,0 +1,28 @@
+from engine.plots import PlotQueue
+from engine.telemetry import FIELDS
+
+
+def test_a_failing_render_is_reported(tmp_path):
+    errors = []
+    queue = PlotQueue(on_error=errors.append)
+    png = str(tmp_path / "plot.png")
+    queue.submit(str(tmp_path / "missing.csv"), png)
+    failed = queue.close(wait=True)
+    assert [(path, type(e)) for path, e in failed] == [(png, FileNotFoundError)]
+    assert len(errors) == 1 and png in errors[0]
+
+
+def test_one_bad_timeline_does_not_stop_the_others(tmp_path, capsys):
+    from engine.plots import main
+
+    header = ",".join(FIELDS)
+    for name in ("a", "b"):
+        (tmp_path / f"{name}.csv").write_text(
+            f"{header}\r\n2026-10-18T12:00:00.000,room1,mood_tick,,,0.5,calm,,,,,\r\n", encoding="utf-8")
+    (tmp_path / "bad.csv").write_text(
+        f"{header}\r\n2026-10-18T12:00:00.000,room1,mood_tick,,,not a number,calm,,,,,\r\n", encoding="utf-8")
+    assert main([str(tmp_path), "--jobs", "2"]) == 1
+    out = capsys.readouterr().out
+    assert "rendered 2 of 3 timelines" in out and "1 failed" in out
+    assert str(tmp_path / "bad.csv") in out
+    assert (tmp_path / "a.png").exists() and (tmp_path / "b.png").exists()
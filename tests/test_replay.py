@@ -0,0 +1,11 @@
+import pytest
+
+from engine.replay import recover_seconds
+from mood import MoodEngine
+
+
+@pytest.mark.parametrize("params", [None, {"time_weight": -3.0, "time_cap": 90.0, "wrong_weight": -0.5}])
+def test_recover_seconds_inverts_observe_under_the_engine_settings(params):
+    me = MoodEngine(params=params)
+    score = me.observe(text="hmm", seconds=12.0, correct=False, wrong_attempts=2)
+    assert recover_seconds("hmm", score, 2, False, 0.0, mood_engine=me) == pytest.approx(12.0)
@@ -0,0 +1,35 @@
+import csv
+
+from engine.clock import SimClock
+from engine.game import Game
+from engine.inventory import Inventory
+from engine.telemetry import CsvStreamSink, Telemetry
+from main import build_rooms
+from mood import MoodEngine
+
+
+def rows_on_disk(path):
+    # what another process (or a crash) would see: the file, not the sink's buffer
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_answer_is_on_disk_while_the_player_is_idle(tmp_path):
+    path = tmp_path / "session.csv"
+    # thresholds the session never reaches: only Game's own flush can write the rows
+    sink = CsvStreamSink(str(path), flush_every=10_000, flush_interval=3600.0)
+    telemetry = Telemetry(sink=sink)
+    clock = SimClock()
+    game = Game(build_rooms(), save_path=None, csv_path=None, plot_path=None)
+    state = game.new_state(MoodEngine(), Inventory(), telemetry, 0.0, clock)
+    state.saved = {}
+
+    state, out = game.start(state)
+    assert [r["event"] for r in rows_on_disk(path)] == ["game_start"]
+
+    clock.advance(5.0)
+    state, out, done = game.step(state, "wrong guess")
+    clock.advance(600.0)            # the player walks away; nothing else is logged
+    answers = [r for r in rows_on_disk(path) if r["event"] == "answer"]
+    assert [(r["input"], r["correct"]) for r in answers] == [("wrong guess", "False")]
+    telemetry.close()